@@ -0,0 +1,55 @@
+"""
+Microbenchmark of the JSON backends on representative response bodies
+
+    $ python -m benchmarks.decoder
+"""
+import json
+import timeit
+import typing as t
+
+from oasbuilder.decoder import BACKENDS, get_decoder
+
+
+def user(i: int) -> t.Dict[str, t.Any]:
+    return {
+        "id": i,
+        "name": f"user {i}",
+        "email": f"user{i}@example.com",
+        "active": i % 2 == 0,
+        "score": i * 0.5,
+        "tags": ["a", "b", "c"],
+        "profile": {"bio": "lorem ipsum " * 4, "followers": i * 3},
+    }
+
+
+BODIES = {
+    "object(small)": json.dumps(user(1)),
+    "list(100 items)": json.dumps([user(i) for i in range(100)]),
+    "list(10k items)": json.dumps(
+        {
+            "items": [user(i) for i in range(10_000)],
+            "pagination": {"page": 1, "per_page": 10_000, "total": 10_000},
+        }
+    ),
+}
+
+
+def main():
+    backends = []
+    for name in BACKENDS:
+        try:
+            backends.append(get_decoder(name))
+        except ImportError:
+            print(f"skip {name}: not installed")
+    for body_name, body in BODIES.items():
+        number = max(1, 2_000_000 // len(body))
+        print(f"{body_name} ({len(body):,} bytes, {number} loops)")
+        for backend in backends:
+            elapsed = min(
+                timeit.repeat(lambda: backend.loads(body), number=number, repeat=3)
+            )
+            print(f"  {backend.name:>8}: {elapsed / number * 1e6:10.1f} µs/loop")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,170 +1,477 @@
-import json
+import argparse
+import functools
+import importlib.util
 import logging
 import os
 import pathlib
 import subprocess
+import sys
 import typing as t
-from collections import defaultdict
-from urllib.parse import parse_qs, urlparse
 
-import yaml
 from dotenv import load_dotenv
-from elasticsearch import Elasticsearch
+from oasbuilder import decoder
 from oasbuilder.constants import OAS_REF, TEMPLATE_OAS_REF
 from oasbuilder.logging import setup_logger
-from oasbuilder.models import HTTPMethod
-from oasbuilder.utils import parameterized_endpoint_path
+from oasbuilder.parser import OASParser, ParseBudget, SchemaCache
+from oasbuilder.pipeline import (
+    BuildCache,
+    Debouncer,
+    EndpointIndex,
+    Sample,
+    SampleDeduper,
+    SampleMerger,
+    file_digest,
+    poll_and_emit,
+    render_samples,
+    scan_slices,
+    write_patterns,
+    write_sample,
+)
+from oasbuilder.source import (
+    ElasticsearchSource,
+    HARSource,
+    Hit,
+    JSONLSource,
+    MitmproxySource,
+    TrafficSource,
+    fetch_high_water_mark,
+    time_range_query,
+)
 from oasbuilder.writer import (
-    OASEndpointMethodPatternWriter,
-    OASEndpointMethodWriter,
-    OASEndpointPatternWriter,
+    BUNDLE_EXTENSIONS,
+    BUNDLE_FORMATS,
+    OASBundleWriter,
     OASIndexWriter,
-    OASRequestBodySchemaWriter,
-    OASResponseContentWriter,
-    OASResponsePatternWriter,
-    OASResponseSchemaWriter,
     OASSchemaIndexWriter,
+    OASSpec,
 )
 
 load_dotenv()
-ELASTICSEARCH_HOST = os.getenv("ELASTICSEARCH_HOST", "http://localhost:9200")
-ELASTICSEARCH_INDEX = os.environ["ELASTICSEARCH_INDEX"]
 DEST_DIR = pathlib.Path(".build")
-OAS_YAML_DEST = DEST_DIR / "bundle.yml"
 OAS_HTML_DEST = DEST_DIR / "index.html"
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
-def write_schemas(
-    dest_root: pathlib.Path,
-    endpoint_path: str,
-    method: HTTPMethod,
-    query: t.Optional[t.Dict[str, t.Any]],
-    request_content: t.Optional[t.Dict[str, t.Any]],
-    status_code: int,
-    response_content: t.Optional[t.Dict[str, t.Any]],
-):
-    if request_content:
-        OASRequestBodySchemaWriter(
-            dest_root,
-            endpoint_path,
-            method,
-            request_content=request_content,
-        ).write()
-
-    if response_content and (
-        type(response_content) is dict or type(response_content) is list
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--source",
+        choices=["elasticsearch", "jsonl", "mitmproxy", "har"],
+        default="elasticsearch",
+        help="where the captured traffic is read from",
+    )
+    parser.add_argument(
+        "--input",
+        type=pathlib.Path,
+        help="dump file of the captured traffic (file sources only)",
+    )
+    parser.add_argument(
+        "--fetch-mode",
+        choices=ElasticsearchSource.FETCH_MODES,
+        default="search",
+        help=(
+            "search: one query per endpoint path, "
+            "aggregation: one representative hit per (path, method, status_code), "
+            "scan: a single pass over the whole index"
+        ),
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=1_000,
+        help="number of request paths fetched per composite aggregation page",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1_000,
+        help="number of hits fetched per search_after request",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="max number of in-flight Elasticsearch requests in search mode",
+    )
+    parser.add_argument(
+        "--slices",
+        type=int,
+        default=1,
+        help=(
+            "number of slices of the scan processed on separate worker processes "
+            "(scan mode only)"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "number of worker processes the schemas of the endpoints "
+            "are inferred and rendered on"
+        ),
+    )
+    parser.add_argument(
+        "--write-concurrency",
+        type=int,
+        default=16,
+        help="number of threads the files of the tree are written by",
+    )
+    parser.add_argument(
+        "--json-backend",
+        choices=list(decoder.BACKENDS.keys()),
+        default=None,
+        help="JSON decoder of the bodies (default: the fastest one installed)",
+    )
+    parser.add_argument(
+        "--merge-samples",
+        action="store_true",
+        help=(
+            "merge the schemas of every sample per (path, method, status_code) "
+            "instead of keeping only the first one"
+        ),
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=None,
+        help="nesting level below which body schemas are not inspected",
+    )
+    parser.add_argument(
+        "--max-properties",
+        type=int,
+        default=None,
+        help="number of properties inspected per object of a body",
+    )
+    parser.add_argument(
+        "--max-items",
+        type=int,
+        default=None,
+        help=(
+            "number of items inspected per array of a body "
+            "(default: 1, or every item with --merge-samples)"
+        ),
+    )
+    parser.add_argument(
+        "--stream-threshold",
+        type=int,
+        default=None,
+        help=(
+            "size in bytes from which a response body is not decoded, "
+            "but its schema is inferred from the token stream"
+        ),
+    )
+    parser.add_argument(
+        "--extract-components",
+        action="store_true",
+        help=(
+            "hoist object sub-schemas repeated across endpoints "
+            "into shared components referenced with $ref"
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        choices=("tree", "bundle"),
+        default="tree",
+        help=(
+            "tree: writes the multi-file tree and bundles it(see --bundler), "
+            "bundle: writes the bundle only"
+        ),
+    )
+    parser.add_argument(
+        "--bundler",
+        choices=("native", "swagger-cli"),
+        default="native",
+        help="bundler of the tree in --output tree",
+    )
+    parser.add_argument(
+        "--format",
+        choices=BUNDLE_FORMATS,
+        default="yaml",
+        help="format of the bundle",
+    )
+    parser.add_argument(
+        "--schema-cache-size",
+        type=int,
+        default=4096,
+        help="number of inferred sub-schemas memoized by shape(0 to disable)",
+    )
+    parser.add_argument(
+        "--build-cache",
+        type=pathlib.Path,
+        default=None,
+        help=(
+            "JSON manifest of the last build, from which unchanged endpoints "
+            "are restored instead of rendered, and unchanged files are not "
+            "rewritten (eg. .oasbuilder-cache.json)"
+        ),
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help=(
+            "fetch only the documents captured since the last build "
+            "of --build-cache, merged into its schemas (requires --merge-samples)"
+        ),
+    )
+    parser.add_argument(
+        "--reset-build-cache",
+        action="store_true",
+        help="start --build-cache over, eg. to fetch every document again",
+    )
+    parser.add_argument(
+        "--timestamp-field",
+        default="timestamp",
+        help="capture timestamp field of the traffic index, which --delta filters",
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "keep running, polling the traffic index for new documents "
+            "every SECONDS and re-emitting the output when the spec changes "
+            "(requires --merge-samples)"
+        ),
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=60,
+        metavar="SECONDS",
+        help="quiet period after the last change before --watch re-emits",
+    )
+    args = parser.parse_args()
+    if args.source != "elasticsearch" and not args.input:
+        parser.error(f"--input is required for --source {args.source}")
+    if args.slices > 1 and (
+        args.source != "elasticsearch" or args.fetch_mode != "scan"
     ):
-        OASResponseSchemaWriter(
-            dest_root,
-            endpoint_path,
-            method,
-            status_code,
-            response_content,
-        ).write()
+        parser.error("--slices is only supported with --fetch-mode scan")
+    if args.slices > 1 and args.merge_samples:
+        parser.error("--slices is not supported with --merge-samples")
+    if args.bundler != "native" and args.output != "tree":
+        parser.error("--bundler is only supported with --output tree")
+    if args.stream_threshold is not None and args.merge_samples:
+        parser.error("--stream-threshold is not supported with --merge-samples")
+    if args.stream_threshold is not None and not importlib.util.find_spec("ijson"):
+        parser.error("--stream-threshold requires ijson($ pip install ijson)")
+    if (args.delta or args.reset_build_cache) and not args.build_cache:
+        parser.error("--delta and --reset-build-cache require --build-cache")
+    if args.delta and args.source != "elasticsearch":
+        parser.error("--delta is only supported with --source elasticsearch")
+    if args.watch is not None and args.source != "elasticsearch":
+        parser.error("--watch is only supported with --source elasticsearch")
+    # the new documents alone would replace the schemas of the last build
+    if (args.delta or args.watch is not None) and not args.merge_samples:
+        parser.error("--delta and --watch require --merge-samples")
+    return args
 
 
-def main():
-    setup_logger()
-    es = Elasticsearch(ELASTICSEARCH_HOST)
+def elasticsearch_factory(**kwargs: t.Any) -> t.Callable[[], t.Any]:
+    from elasticsearch import Elasticsearch
 
-    result = es.search(
-        index=ELASTICSEARCH_INDEX,
-        aggs=dict(
-            requestpaths=dict(terms=dict(field="request.path.keyword", size=10_000))
-        ),
-        _source=[
-            "request.path",
-        ],
+    return functools.partial(
+        Elasticsearch,
+        os.getenv("ELASTICSEARCH_HOST", "http://localhost:9200"),
+        **kwargs,
     )
-    path_query_map = defaultdict(list)
-    for bucket in result["aggregations"]["requestpaths"]["buckets"]:
-        path = bucket["key"]
-        parsed = urlparse(path)
-        parameterized_path = parameterized_endpoint_path(parsed.path)
-        path_query_map[parameterized_path].append(parse_qs(parsed.query))
-    dest_root = pathlib.Path(DEST_DIR)
-    pattern_set = set()
-    for path in list(path_query_map.keys()):
-        logger.info(f"path:{path}")
-        result = es.search(
-            index=ELASTICSEARCH_INDEX,
-            query=dict(term={"request.path.keyword": path}),
-            _source=[
-                "request.method",
-                "request.query",
-                "request.content",
-                "response.status_code",
-                "response.content",
-            ],
+
+
+def build_elasticsearch(args: argparse.Namespace) -> t.Any:
+    return elasticsearch_factory(connections_per_node=args.concurrency)()
+
+
+def build_source(
+    args: argparse.Namespace,
+    query: t.Optional[t.Dict[str, t.Any]] = None,
+    es: t.Any = None,
+) -> TrafficSource:
+    if args.source == "jsonl":
+        return JSONLSource(args.input)
+    if args.source == "mitmproxy":
+        return MitmproxySource(args.input)
+    if args.source == "har":
+        return HARSource(args.input)
+    if es is None:
+        es = build_elasticsearch(args)
+    return ElasticsearchSource(
+        es,
+        os.environ["ELASTICSEARCH_INDEX"],
+        fetch_mode=args.fetch_mode,
+        page_size=args.page_size,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        query=query,
+    )
+
+
+def configure(args: argparse.Namespace) -> None:
+    decoder.set_backend(args.json_backend)
+    OASParser.budget = ParseBudget(
+        max_depth=args.max_depth,
+        max_properties=args.max_properties,
+        max_items=args.max_items if args.max_items is not None else 1,
+    )
+    if args.schema_cache_size > 0:
+        OASParser.cache = SchemaCache(args.schema_cache_size)
+
+
+def merge_budget(args: argparse.Namespace) -> ParseBudget:
+    """
+    Budget of the samples folded by `SampleMerger`, which inspects every item
+    of an array unless `--max-items` is given, to cover heterogeneous items
+    """
+    return ParseBudget(
+        max_depth=args.max_depth,
+        max_properties=args.max_properties,
+        max_items=args.max_items if args.max_items is not None else sys.maxsize,
+    )
+
+
+def build_cache_from_args(args: argparse.Namespace) -> BuildCache:
+    build_cache = BuildCache(args.build_cache)
+    if args.reset_build_cache:
+        build_cache.reset()
+    return build_cache
+
+
+def time_range(
+    args: argparse.Namespace,
+    build_cache: t.Optional[BuildCache],
+    delta: bool,
+    es: t.Any = None,
+) -> t.Tuple[t.Optional[t.Dict[str, t.Any]], t.Optional[int]]:
+    """
+    Filters the documents captured since the watermark of the last build
+    if `delta`, up to the latest one
+
+    Returns the filter and the new watermark, which the caller records
+    into the `build_cache` once the documents have been fetched
+    """
+    if build_cache is None or args.source != "elasticsearch":
+        return None, None
+    since = build_cache.watermark if delta else None
+    watermark = fetch_high_water_mark(
+        es if es is not None else elasticsearch_factory()(),
+        os.environ["ELASTICSEARCH_INDEX"],
+        args.timestamp_field,
+    )
+    if watermark is None:
+        watermark = since
+    # fetches up to the watermark, leaving the documents indexed meanwhile
+    # to the next build
+    query = time_range_query(args.timestamp_field, since, watermark)
+    logger.info(f"⏱ fetching the documents captured in ({since}, {watermark}]")
+    return query, watermark
+
+
+def iter_new_samples(
+    args: argparse.Namespace,
+    collector: t.Union[SampleDeduper, SampleMerger],
+    query: t.Optional[t.Dict[str, t.Any]] = None,
+    es: t.Any = None,
+) -> t.Iterable[t.Union[Sample, Hit]]:
+    """
+    The new samples of the traffic, left as raw hits for the workers
+    to decode with `--workers`, unless they are merged
+    """
+    if args.slices > 1:
+        es_factory = elasticsearch_factory()
+        return scan_slices(
+            es if es is not None else es_factory(),
+            es_factory,
+            os.environ["ELASTICSEARCH_INDEX"],
+            args.slices,
+            batch_size=args.batch_size,
+            json_backend=args.json_backend,
+            parse_budget=OASParser.budget,
+            schema_cache_size=max(args.schema_cache_size, 0),
+            stream_threshold=args.stream_threshold,
+            query=query,
         )
-        if not (result["hits"] and result["hits"]["hits"]):
-            continue
-        hits = result["hits"]["hits"]
-        for hit in hits:
-            info = hit["_source"]
-            method = HTTPMethod[info["request"]["method"]]
-            query = json.loads(info["request"]["query"])
-            request_content_raw = info["request"]["content"]
-            status_code = info["response"]["status_code"]
-            request_content = (
-                json.loads(request_content_raw) if request_content_raw else None
-            )
-            response_content_raw = info["response"]["content"]
-            try:
-                response_content = (
-                    json.loads(response_content_raw) if response_content_raw else None
-                )
-            except json.decoder.JSONDecodeError:
-                response_content = None
-
-            pattern = (
-                path,
-                method.value,
-                status_code,
-            )
-            if pattern in pattern_set:
-                continue
-
-            pattern_set.add(pattern)
-
-            write_schemas(
-                dest_root,
-                path,
-                method,
-                query,
-                request_content,
-                status_code,
-                response_content,
-            )
-
-            OASResponseContentWriter(
-                dest_root,
-                path,
-                method,
-                status_code,
-                response_content,
-            ).write()
-
-            OASResponsePatternWriter(
-                dest_root,
-                path,
-                method,
-            ).write()
-
-            OASEndpointMethodWriter(
-                dest_root,
-                path,
-                method,
-                query=query,
-                request_content=request_content,
-            ).write()
-        OASEndpointMethodPatternWriter(dest_root, path).write()
-    OASEndpointPatternWriter(dest_root).write()
-
-    schema_index_writer = OASSchemaIndexWriter(dest_root)
+    source = build_source(args, query, es)
+    if args.workers > 1 and isinstance(collector, SampleDeduper):
+        return collector.iter_hits(source)
+    return collector.iter_samples(source)
+
+
+def render(
+    args: argparse.Namespace,
+    samples: t.Iterable[t.Union[Sample, Hit]],
+    spec: OASSpec,
+    index: EndpointIndex,
+    build_cache: t.Optional[BuildCache],
+    collector: t.Union[SampleDeduper, SampleMerger],
+    retain: bool = False,
+) -> bool:
+    """
+    Renders the samples into the `spec`, and returns whether any document
+    was rendered(rather than restored unchanged from the `build_cache`)
+
+    With `--workers`, the samples may be raw hits, which the workers decode
+
+    With `retain`, the entries of the last build with no new sample
+    are carried over
+    """
+    changed = False
+    if args.workers > 1:
+        for pattern, rendered in render_samples(
+            samples,
+            spec.dest_root,
+            args.workers,
+            parse_budget=OASParser.budget,
+            schema_cache_size=max(args.schema_cache_size, 0),
+            json_backend=args.json_backend,
+            stream_threshold=args.stream_threshold,
+            yaml=args.output == "tree",
+        ):
+            index.add_pattern(pattern)
+            if build_cache is not None:
+                changed |= build_cache.write_rendered(pattern, spec, rendered)
+            else:
+                spec.update(rendered["documents"], rendered.get("yaml"))
+                changed = True
+    else:
+        for sample in t.cast(t.Iterable[Sample], samples):
+            index.add(sample)
+            if build_cache is not None:
+                changed |= build_cache.write_sample(spec.dest_root, sample, spec)
+            else:
+                write_sample(spec.dest_root, sample, spec)
+                changed = True
+    if build_cache is not None and retain:
+        build_cache.retain(spec.dest_root, spec, index)
+    if build_cache is not None and isinstance(collector, SampleMerger):
+        build_cache.merger = collector.dump_state()
+    if args.slices <= 1:
+        logger.info(f"📊 samples {collector.report()}")
+    if build_cache is not None:
+        logger.info(f"📊 build cache {build_cache.report()}")
+    if OASParser.cache is not None and args.slices <= 1 and args.workers <= 1:
+        logger.info(f"📊 schema cache {OASParser.cache.report()}")
+    return changed
+
+
+def emit(
+    args: argparse.Namespace,
+    spec: OASSpec,
+    index: EndpointIndex,
+    build_cache: t.Optional[BuildCache],
+) -> bool:
+    """
+    Writes the tree, the bundle and the HTML from the `spec`,
+    and returns False if the bundle is unchanged since the last build
+    """
+    dest_root = spec.dest_root
+    write_patterns(dest_root, index, spec)
+
+    schema_index_writer = OASSchemaIndexWriter(
+        dest_root, extract_components=args.extract_components, spec=spec
+    )
     schema_index_writer.write()
 
     index_writer = OASIndexWriter(
@@ -174,30 +481,50 @@ def main():
         title=os.environ["OAS_TITLE"],
         description=os.environ["OAS_DESCRIPTION"],
         server_urls=os.environ["OAS_SERVER_URLS"].split(","),
-        components={"schemas": yaml.safe_load(schema_index_writer.dest.read_text())},
+        components={"schemas": spec.get(schema_index_writer.dest)},
+        spec=spec,
     )
     index_writer.write()
 
-    subprocess.run(
-        [
-            "./node_modules/.bin/swagger-cli",
-            "bundle",
-            str(index_writer.dest),
-            "--outfile",
-            str(OAS_YAML_DEST),
-            "--type",
-            "yaml",
-        ],
-        check=True,
-    )
-    raw_oas_yaml = OAS_YAML_DEST.read_text()
-    ref_enabled = raw_oas_yaml.replace(TEMPLATE_OAS_REF, OAS_REF)
-    OAS_YAML_DEST.write_text(ref_enabled)
+    if args.output == "tree":
+        spec.flush(
+            build_cache.digests if build_cache is not None else None,
+            concurrency=args.write_concurrency,
+        )
+    if args.bundler == "native":
+        bundle_writer = OASBundleWriter(dest_root, spec, format=args.format)
+        bundle_writer.write()
+        bundle_dest = bundle_writer.dest
+    else:
+        bundle_dest = DEST_DIR / f"bundle.{BUNDLE_EXTENSIONS[args.format]}"
+        subprocess.run(
+            [
+                "./node_modules/.bin/swagger-cli",
+                "bundle",
+                str(index_writer.dest),
+                "--outfile",
+                str(bundle_dest),
+                "--type",
+                args.format,
+            ],
+            check=True,
+        )
+        raw_oas_yaml = bundle_dest.read_text()
+        ref_enabled = raw_oas_yaml.replace(TEMPLATE_OAS_REF, OAS_REF)
+        bundle_dest.write_text(ref_enabled)
+    logger.info(f"📦 bundled into {bundle_dest}")
+    if build_cache is not None:
+        bundle_digest = file_digest(bundle_dest)
+        unchanged = build_cache.bundle == bundle_digest and OAS_HTML_DEST.is_file()
+        # the digest of the bundle is kept only once it is linted and rendered
+        build_cache.save(bundle_digest if unchanged else None)
+        if unchanged:
+            return False
     subprocess.run(
         [
             "./node_modules/.bin/spectral",
             "lint",
-            str(OAS_YAML_DEST),
+            str(bundle_dest),
         ],
         check=True,
     )
@@ -205,13 +532,97 @@ def main():
         [
             "node_modules/.bin/redoc-cli",
             "bundle",
-            str(OAS_YAML_DEST),
+            str(bundle_dest),
             "--output",
             OAS_HTML_DEST,
             "--options.onlyRequiredInSamples",
         ],
         check=True,
     )
+    if build_cache is not None:
+        build_cache.save(bundle_digest)
+    return True
+
+
+def watch_traffic(args: argparse.Namespace) -> None:
+    """
+    Keeps the spec up to date with the traffic, polling it for the documents
+    captured since the last poll every `--watch` seconds
+
+    The spec, the build cache and the schema cache stay in memory between
+    the polls, and the output is emitted once no change has come
+    for `--debounce` seconds
+    """
+    build_cache = build_cache_from_args(args)
+    # a single client for every poll, whose connections stay open
+    es = build_elasticsearch(args)
+    spec = OASSpec(pathlib.Path(DEST_DIR))
+    index = EndpointIndex()
+    merger = SampleMerger(merge_budget(args))
+    if args.delta and build_cache.merger:
+        merger.load_state(build_cache.merger)
+    polls = 0
+
+    def poll() -> bool:
+        nonlocal polls
+        # the first poll fetches as a build does, the next ones the new documents
+        delta = args.delta or polls > 0
+        query, watermark = time_range(args, build_cache, delta, es)
+        changed = render(
+            args,
+            iter_new_samples(args, merger, query, es),
+            spec,
+            index,
+            build_cache,
+            merger,
+            retain=args.delta and polls == 0,
+        )
+        # a failed poll fetches the same documents again on the next one
+        build_cache.watermark = watermark
+        polls += 1
+        # the first poll always emits
+        return changed or polls == 1
+
+    def emit_changes() -> None:
+        if emit(args, spec, index, build_cache):
+            logger.info(f"👉 re-emitted {pathlib.Path(OAS_HTML_DEST).resolve()}")
+
+    logger.info(f"👀 polling every {args.watch}s")
+    poll_and_emit(poll, emit_changes, args.watch, Debouncer(args.debounce))
+
+
+def main():
+    args = parse_args()
+    setup_logger()
+    configure(args)
+    if args.watch is not None:
+        watch_traffic(args)
+        return
+    build_cache = build_cache_from_args(args) if args.build_cache else None
+    query, watermark = time_range(args, build_cache, args.delta)
+    collector: t.Union[SampleDeduper, SampleMerger]
+    if args.merge_samples:
+        collector = SampleMerger(merge_budget(args))
+        if args.delta and build_cache is not None and build_cache.merger:
+            collector.load_state(build_cache.merger)
+    else:
+        collector = SampleDeduper(stream_threshold=args.stream_threshold)
+    spec = OASSpec(pathlib.Path(DEST_DIR))
+    index = EndpointIndex()
+    render(
+        args,
+        iter_new_samples(args, collector, query),
+        spec,
+        index,
+        build_cache,
+        collector,
+        retain=args.delta,
+    )
+    if build_cache is not None:
+        build_cache.watermark = watermark
+    if not emit(args, spec, index, build_cache):
+        print("✨Unchanged since the last build")
+        return
     print(f"👉Check the output:{pathlib.Path(OAS_HTML_DEST).resolve()}")
     print("✨Done")
 
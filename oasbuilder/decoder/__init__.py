@@ -0,0 +1,101 @@
+import json
+import logging
+import typing as t
+
+logger = logging.getLogger(__name__)
+
+Raw = t.Union[str, bytes]
+
+
+class JSONDecoder:
+    """
+    Wraps a JSON backend so that the callers only see `loads` and stdlib's
+    `json.JSONDecodeError`
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loads: t.Callable[[Raw], t.Any],
+        errors: t.Tuple[t.Type[Exception], ...],
+    ) -> None:
+        self.name = name
+        self._loads = loads
+        self.errors = errors
+
+    def loads(self, raw: Raw) -> t.Any:
+        try:
+            return self._loads(raw)
+        except self.errors:
+            if self._loads is json.loads:
+                raise
+            # backends rejecting what stdlib accepts (eg. big ints, NaN)
+            # fall back to stdlib, which raises `json.JSONDecodeError`
+            return json.loads(raw)
+
+
+def _orjson() -> JSONDecoder:
+    import orjson
+
+    return JSONDecoder("orjson", orjson.loads, (orjson.JSONDecodeError,))
+
+
+def _simdjson() -> JSONDecoder:
+    import simdjson
+
+    return JSONDecoder("simdjson", simdjson.loads, (ValueError,))
+
+
+def _json() -> JSONDecoder:
+    return JSONDecoder("json", json.loads, (json.JSONDecodeError,))
+
+
+BACKENDS: t.Dict[str, t.Callable[[], JSONDecoder]] = {
+    "orjson": _orjson,
+    "simdjson": _simdjson,
+    "json": _json,
+}
+
+
+def get_decoder(name: t.Optional[str] = None) -> JSONDecoder:
+    """
+    Returns the decoder of `name`, or the fastest one installed if omitted
+    """
+    if name:
+        return BACKENDS[name]()
+    for backend in BACKENDS.values():
+        try:
+            return backend()
+        except ImportError:
+            continue
+    return _json()
+
+
+_decoder = get_decoder()
+
+
+def set_backend(name: t.Optional[str]) -> JSONDecoder:
+    global _decoder
+    _decoder = get_decoder(name)
+    logger.info(f"json backend:{_decoder.name}")
+    return _decoder
+
+
+def backend() -> str:
+    return _decoder.name
+
+
+def loads(raw: Raw) -> t.Any:
+    return _decoder.loads(raw)
+
+
+def loads_or_none(raw: t.Optional[Raw]) -> t.Any:
+    """
+    Decodes `raw` or returns None for an empty or non-JSON content
+    """
+    if not raw:
+        return None
+    try:
+        return _decoder.loads(raw)
+    except json.JSONDecodeError:
+        return None
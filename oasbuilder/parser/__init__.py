@@ -1,10 +1,56 @@
 import logging
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import TRUNCATED_OBJECT, SchemaCache, fingerprint  # noqa
+from .merge import SchemaAccumulator, merge_samples  # noqa
 
 logger = logging.getLogger(__name__)
 
+# a path to a node as a linked tuple of (parent path, key or index)
+NodePath = Optional[Tuple[Any, Any]]
+
+
+def format_node_path(path: NodePath) -> str:
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return "$" + "".join(reversed(keys))
+
+
+@dataclass
+class ParseBudget:
+    """
+    Bounds the work of parsing a body
+
+    max_depth: nesting level below which objects/arrays are not inspected
+    max_properties: number of properties inspected per object
+    max_items: number of items inspected per array
+    """
+
+    max_depth: Optional[int] = None
+    max_properties: Optional[int] = None
+    max_items: int = 1
+
+
+@dataclass
+class Truncation:
+    path: str
+    reason: str
+
+
+@dataclass
+class ParseResult:
+    schema: Optional[Dict[str, Any]]
+    truncations: List[Truncation] = field(default_factory=list)
+
 
 class OASParser:
+    budget = ParseBudget()
+    cache: Optional[SchemaCache] = None
+
     @staticmethod
     def gettype(type):
         if type == "float":
@@ -15,29 +61,133 @@ class OASParser:
         return None
 
     @staticmethod
-    def parse(json_data):
+    def parse(json_data, budget: Optional[ParseBudget] = None):
+        result = OASParser.parse_bounded(json_data, budget)
+        for truncation in result.truncations:
+            logger.warning(
+                f"✂ schema truncated at {truncation.path}: {truncation.reason}"
+            )
+        return result.schema
+
+    @staticmethod
+    def parse_bounded(json_data, budget: Optional[ParseBudget] = None) -> ParseResult:
+        """
+        Parses with an explicit stack instead of recursion,
+        reporting every subtree left out by the budget
+        """
+        if budget is None:
+            budget = OASParser.budget
+        cache = OASParser.cache
+        shapes = fingerprint(json_data, budget) if cache is not None else {}
+        truncations: List[Truncation] = []
+        root: Dict[str, Any] = {}
+        # (value, depth, path, parent schema, key in parent, is property)
+        stack: List[Tuple[Any, int, NodePath, Any, Any, bool]] = [
+            (json_data, 0, None, root, "schema", False)
+        ]
+        # arrays whose inspected items are merged after all of them are parsed
+        multi_items: List[Dict[str, Any]] = []
+        while stack:
+            value, depth, path, parent, key, is_property = stack.pop()
+            # the root is left unshared, as the writers complete it (eg. required)
+            shape = shapes.get(id(value)) if depth and type(value) is dict else None
+            if shape == TRUNCATED_OBJECT:
+                shape = None
+            if shape is not None:
+                cached = cache.get(shape)  # type: ignore
+                if cached is not None:
+                    parent[key] = cached
+                    continue
+            d = OASParser._parse_node(value)
+            if not d:
+                if is_property:
+                    logger.warning(f"🚨 parsing type failed for key:{key}")
+                else:
+                    parent[key] = d
+                continue
+            parent[key] = d
+            if shape is not None:
+                # the subtree is complete before any other node is popped
+                cache.put(shape, d)  # type: ignore
+            if d["type"] != "object" and d["type"] != "array":
+                continue
+            if budget.max_depth is not None and depth >= budget.max_depth:
+                truncations.append(
+                    Truncation(
+                        format_node_path(path),
+                        f"depth exceeds max_depth:{budget.max_depth}",
+                    )
+                )
+                if d["type"] == "array":
+                    d["items"] = {}
+                continue
+            if d["type"] == "object":
+                keys = list(islice(value, budget.max_properties))
+                if len(keys) < len(value):
+                    truncations.append(
+                        Truncation(
+                            format_node_path(path),
+                            f"{len(value) - len(keys)} properties exceed"
+                            f" max_properties:{budget.max_properties}",
+                        )
+                    )
+                for k in reversed(keys):
+                    stack.append(
+                        (value[k], depth + 1, (path, k), d["properties"], k, True)
+                    )
+            elif budget.max_items <= 1:
+                stack.append((value[0], depth + 1, (path, 0), d, "items", False))
+            else:
+                items = value[: budget.max_items]
+                d["items"] = [None] * len(items)
+                multi_items.append(d)
+                for i in reversed(range(len(items))):
+                    stack.append((items[i], depth + 1, (path, i), d["items"], i, False))
+        for d in reversed(multi_items):
+            d["items"] = OASParser._merge_items(d["items"])
+        return ParseResult(root["schema"], truncations)
+
+    @staticmethod
+    def _parse_node(value) -> Optional[Dict[str, Any]]:
+        """
+        Parses a node without its children
+        """
         d: Dict[str, Any] = {}
-        if type(json_data) is dict:
+        if type(value) is dict:
             d["type"] = "object"
             d["properties"] = {}
-            for k in json_data:
-                c = OASParser.parse(json_data[k])
-                if not c:
-                    logger.warning(f"🚨 parsing type failed for key:{k}")
-                    continue
-                d["properties"][k] = c
             return d
-        elif type(json_data) is list:
-            if not json_data:
+        elif type(value) is list:
+            if not value:
                 return None
             d["type"] = "array"
-            d["items"] = OASParser.parse(json_data[0])
             return d
         else:
-            t = OASParser.gettype(type(json_data).__name__)
+            t = OASParser.gettype(type(value).__name__)
             if not t:
                 return None
             d["type"] = t
             if d["type"] == "number":
                 d["format"] = "float"
             return d
+
+    @staticmethod
+    def _merge_items(items: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        Takes the first parsed item, completing the properties of an object
+        with the ones only the other items have
+        """
+        schemas = [x for x in items if x]
+        if not schemas:
+            return None
+        merged = schemas[0]
+        if merged["type"] != "object":
+            return merged
+        # copied, as it may be shared by the cache
+        merged = dict(merged, properties=dict(merged["properties"]))
+        for schema in schemas[1:]:
+            if schema["type"] != "object":
+                continue
+            for k, v in schema["properties"].items():
+                merged["properties"].setdefault(k, v)
+        return merged
@@ -0,0 +1,108 @@
+import typing as t
+from collections import OrderedDict
+
+if t.TYPE_CHECKING:
+    from oasbuilder.parser import ParseBudget
+
+SCALAR_SHAPES = {
+    type(None): hash("null"),
+    str: hash("string"),
+    bool: hash("boolean"),
+    int: hash("integer"),
+    float: hash("number"),
+}
+TRUNCATED_OBJECT = hash("object...")
+TRUNCATED_ARRAY = hash("array...")
+
+
+class SchemaCache:
+    """
+    LRU cache of inferred object schemas keyed by their shape fingerprint
+
+    The cached schemas are shared by reference, so they must not be mutated
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._schemas: "OrderedDict[int, t.Dict[str, t.Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+    def get(self, shape: int) -> t.Optional[t.Dict[str, t.Any]]:
+        schema = self._schemas.get(shape)
+        if schema is None:
+            self.misses += 1
+            return None
+        self._schemas.move_to_end(shape)
+        self.hits += 1
+        return schema
+
+    def put(self, shape: int, schema: t.Dict[str, t.Any]) -> None:
+        self._schemas[shape] = schema
+        if len(self._schemas) > self.maxsize:
+            self._schemas.popitem(last=False)
+
+    def report(self) -> str:
+        return f"hits:{self.hits} misses:{self.misses} size:{len(self)}"
+
+
+def fingerprint(json_data: t.Any, budget: "ParseBudget") -> t.Dict[int, int]:
+    """
+    Hashes the shape of every object/array within the budget bottom-up,
+    from the key set of objects, the first items of arrays and the leaf types
+
+    eg.
+        {"id": 1, "name": "foo"} and {"name": "bar", "id": 2} have the same shape
+
+    Returns the shapes by `id()` of the objects/arrays
+    """
+    shapes: t.Dict[int, int] = {}
+    stack: t.List[t.Tuple[t.Any, int, bool]] = [(json_data, 0, False)]
+    while stack:
+        value, depth, visited = stack.pop()
+        if type(value) is dict:
+            truncated = budget.max_depth is not None and depth >= budget.max_depth
+            if truncated:
+                shapes[id(value)] = TRUNCATED_OBJECT
+                continue
+            keys = (
+                value.keys()
+                if budget.max_properties is None
+                else list(value)[: budget.max_properties]
+            )
+            if visited:
+                shapes[id(value)] = hash(
+                    ("object", frozenset((k, _shape(value[k], shapes)) for k in keys))
+                )
+                continue
+            stack.append((value, depth, True))
+            for k in keys:
+                v = value[k]
+                if type(v) is dict or type(v) is list:
+                    stack.append((v, depth + 1, False))
+        elif type(value) is list:
+            # an empty array is left out rather than truncated
+            truncated = budget.max_depth is not None and depth >= budget.max_depth
+            if truncated and value:
+                shapes[id(value)] = TRUNCATED_ARRAY
+                continue
+            items = value[: max(budget.max_items, 1)]
+            if visited:
+                shapes[id(value)] = hash(
+                    ("array", tuple(_shape(v, shapes) for v in items))
+                )
+                continue
+            stack.append((value, depth, True))
+            for v in items:
+                if type(v) is dict or type(v) is list:
+                    stack.append((v, depth + 1, False))
+    return shapes
+
+
+def _shape(value: t.Any, shapes: t.Dict[int, int]) -> int:
+    if type(value) is dict or type(value) is list:
+        return shapes[id(value)]
+    return SCALAR_SHAPES.get(type(value), 0)
@@ -0,0 +1,218 @@
+import logging
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from oasbuilder.constants import TEMPLATE_OAS_REF
+
+logger = logging.getLogger(__name__)
+
+MIN_OCCURRENCES = 2
+MIN_PROPERTIES = 2
+COMPONENT_REF_PREFIX = "#/components/schemas/"
+
+Signature = int
+
+
+class _Interner:
+    """
+    Numbers every distinct sub-schema structure bottom-up,
+    so that structurally identical sub-schemas share a signature
+
+    Shared dicts(eg. of `OASParser.cache`) are numbered once by `id()`
+    """
+
+    def __init__(self) -> None:
+        self.signatures: Dict[Tuple[Any, ...], Signature] = {}
+        self.nodes: List[Any] = []
+        self._seen: Dict[int, Signature] = {}
+        # keeps the nodes numbered by `id()` alive
+        self._alive: List[Any] = []
+
+    def intern(self, root: Any) -> Signature:
+        stack: List[Tuple[Any, bool]] = [(root, False)]
+        while stack:
+            node, visited = stack.pop()
+            if id(node) in self._seen:
+                continue
+            children = node.values() if type(node) is dict else node
+            if not visited:
+                stack.append((node, True))
+                for child in children:
+                    if type(child) is dict or type(child) is list:
+                        stack.append((child, False))
+                continue
+            if type(node) is dict:
+                key: Tuple[Any, ...] = (
+                    "object",
+                    tuple(sorted((k, self._child(v)) for k, v in node.items())),
+                )
+            else:
+                key = ("array", tuple(self._child(v) for v in node))
+            signature = self.signatures.get(key)
+            if signature is None:
+                signature = self.signatures[key] = len(self.nodes)
+                self.nodes.append(node)
+            self._seen[id(node)] = signature
+            self._alive.append(node)
+        return self._seen[id(root)]
+
+    def _child(self, value: Any) -> Any:
+        if type(value) is dict or type(value) is list:
+            return self._seen[id(value)]
+        # eg. True and 1 must not be the same
+        return (type(value).__name__, value)
+
+    def signature(self, node: Any) -> Signature:
+        return self._seen[id(node)]
+
+
+def component_name(key: str, is_item: bool = False) -> str:
+    """
+    eg.
+        in: author
+        out: Author
+        in: user_profile
+        out: UserProfile
+        in: comments(is_item)
+        out: Comment
+    """
+    if is_item and len(key) > 1 and key.endswith("s"):
+        key = key[:-1]
+    words = [w for w in re.split(r"[^0-9A-Za-z]+", key) if w]
+    name = "".join(w[0].upper() + w[1:] for w in words)
+    if not name or not name[0].isalpha():
+        name = "Schema" + name
+    return name
+
+
+def _is_candidate(node: Dict[str, Any]) -> bool:
+    return (
+        node.get("type") == "object"
+        and len(node.get("properties") or {}) >= MIN_PROPERTIES
+    )
+
+
+def extract_components(schemas: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Hoists object sub-schemas which appear structurally identical at least
+    `MIN_OCCURRENCES` times across the `schemas` into named components,
+    referenced with `$$ref`
+
+    eg.
+        in:
+          GetPostResponse: {properties: {author: User, editor: User}}
+        out:
+          Author: User
+          GetPostResponse:
+            properties:
+              author: {$$ref: "#/components/schemas/Author"}
+              editor: {$$ref: "#/components/schemas/Author"}
+
+    The `schemas` are left untouched; the result is built from new dicts
+    """
+    interner = _Interner()
+    roots = {schema_id: interner.intern(schemas[schema_id]) for schema_id in schemas}
+
+    # counts the occurrences of every object sub-schema below the roots
+    counts: Counter = Counter()
+    names: Dict[Signature, Counter] = {}
+    order: List[Signature] = []
+    stack: List[Tuple[Any, Optional[str], bool]] = [
+        (schemas[schema_id], None, False) for schema_id in reversed(sorted(schemas))
+    ]
+    while stack:
+        node, key, is_item = stack.pop()
+        if type(node) is not dict:
+            continue
+        if key is not None and _is_candidate(node):
+            signature = interner.signature(node)
+            if signature not in counts:
+                order.append(signature)
+                names[signature] = Counter()
+            counts[signature] += 1
+            names[signature][component_name(key, is_item)] += 1
+        properties = node.get("properties")
+        if type(properties) is dict:
+            for k in reversed(list(properties)):
+                stack.append((properties[k], k, False))
+        items = node.get("items")
+        if type(items) is dict:
+            stack.append((items, key, True))
+        for combinator in ("oneOf", "anyOf", "allOf"):
+            for child in reversed(node.get(combinator) or []):
+                stack.append((child, key, is_item))
+
+    hoisted: Dict[Signature, str] = {}
+    taken: Set[str] = set(schemas)
+    for signature in order:
+        if counts[signature] < MIN_OCCURRENCES:
+            continue
+        # the most common name, the first seen on a tie
+        base = names[signature].most_common(1)[0][0]
+        name, n = base, 1
+        while name in taken:
+            n += 1
+            name = f"{base}{n}"
+        taken.add(name)
+        hoisted[signature] = name
+    if not hoisted:
+        return dict(schemas)
+
+    # drops the components referenced once, eg. only from another component
+    refs = _count_refs(interner, roots, hoisted)
+    hoisted = {s: name for s, name in hoisted.items() if refs[s] >= MIN_OCCURRENCES}
+
+    # rebuilds every structure children first, as signatures are numbered
+    rebuilt: List[Any] = []
+    for node in interner.nodes:
+        if type(node) is dict:
+            rebuilt.append(
+                {k: _rebuild(v, interner, rebuilt, hoisted) for k, v in node.items()}
+            )
+        else:
+            rebuilt.append([_rebuild(v, interner, rebuilt, hoisted) for v in node])
+    result = {name: rebuilt[signature] for signature, name in hoisted.items()}
+    for schema_id, signature in roots.items():
+        result[schema_id] = rebuilt[signature]
+    logger.info(f"🧩 extracted {len(hoisted)} components")
+    return dict(sorted(result.items()))
+
+
+def _rebuild(
+    value: Any,
+    interner: _Interner,
+    rebuilt: List[Any],
+    hoisted: Dict[Signature, str],
+) -> Any:
+    if type(value) is not dict and type(value) is not list:
+        return value
+    signature = interner.signature(value)
+    name = hoisted.get(signature)
+    if name is not None:
+        return {TEMPLATE_OAS_REF: f"{COMPONENT_REF_PREFIX}{name}"}
+    return rebuilt[signature]
+
+
+def _count_refs(
+    interner: _Interner,
+    roots: Dict[str, Signature],
+    hoisted: Dict[Signature, str],
+) -> Counter:
+    """
+    Counts the references to each hoisted signature in the output,
+    where every root and component is written out once
+    """
+    refs: Counter = Counter()
+    stack = [interner.nodes[s] for s in (*roots.values(), *hoisted)]
+    while stack:
+        node = stack.pop()
+        for child in node.values() if type(node) is dict else node:
+            if type(child) is not dict and type(child) is not list:
+                continue
+            signature = interner.signature(child)
+            if signature in hoisted:
+                refs[signature] += 1
+            else:
+                stack.append(child)
+    return refs
@@ -0,0 +1,263 @@
+import logging
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from . import ParseBudget
+
+logger = logging.getLogger(__name__)
+
+NULL = "null"
+TYPES = {
+    type(None): NULL,
+    dict: "object",
+    list: "array",
+    str: "string",
+    bool: "boolean",
+    int: "integer",
+    float: "number",
+}
+
+
+class SchemaAccumulator:
+    """
+    Folds JSON samples one by one into a running schema,
+    in O(size of sample) per sample without keeping the samples around
+
+    - types observed across samples are unioned (`oneOf`),
+      widened (integer + number -> number) or made `nullable`
+    - property presence is counted per object, so that `required` lists
+      only the properties present in every sample
+    - every array item is folded into a single `items` schema
+
+    Every method walks the tree with an explicit stack instead of recursion,
+    as `OASParser.parse_bounded` does, so that no nesting level overflows it
+    """
+
+    __slots__ = (
+        "count",
+        "types",
+        "objects",
+        "properties",
+        "presence",
+        "items",
+        "truncated",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.types: Dict[str, int] = {}
+        self.objects = 0
+        self.properties: Dict[str, "SchemaAccumulator"] = {}
+        self.presence: Dict[str, int] = {}
+        self.items: Optional["SchemaAccumulator"] = None
+        # whether the children were left out by `ParseBudget.max_depth`
+        self.truncated = False
+
+    def add(self, value: Any, budget: Optional["ParseBudget"] = None) -> int:
+        """
+        Folds a sample in, inspecting as much of it as the `budget` allows
+        (every node without it)
+
+        Returns the number of objects/arrays truncated by the `budget`,
+        as `OASParser.parse_bounded` reports them
+        """
+        truncations = 0
+        # (accumulator, value, depth), popped in the order the values appear
+        stack: List[Tuple["SchemaAccumulator", Any, int]] = [(self, value, 0)]
+        while stack:
+            accumulator, value, depth = stack.pop()
+            accumulator.count += 1
+            type_ = TYPES.get(type(value))
+            if not type_:
+                continue
+            accumulator.types[type_] = accumulator.types.get(type_, 0) + 1
+            if type_ == "object":
+                accumulator.objects += 1
+            elif type_ != "array":
+                continue
+            if (
+                budget is not None
+                and budget.max_depth is not None
+                and depth >= budget.max_depth
+            ):
+                accumulator.truncated = True
+                truncations += 1
+                continue
+            children: List[Tuple["SchemaAccumulator", Any, int]] = []
+            if type_ == "object":
+                keys: Iterable[str] = value
+                if budget is not None and budget.max_properties is not None:
+                    keys = islice(value, budget.max_properties)
+                    truncations += len(value) > budget.max_properties
+                for k in keys:
+                    accumulator.presence[k] = accumulator.presence.get(k, 0) + 1
+                    child = accumulator.properties.get(k)
+                    if child is None:
+                        child = accumulator.properties[k] = SchemaAccumulator()
+                    children.append((child, value[k], depth + 1))
+            else:
+                items = value
+                if budget is not None:
+                    items = value[: max(budget.max_items, 1)]
+                if items and accumulator.items is None:
+                    accumulator.items = SchemaAccumulator()
+                children.extend((accumulator.items, v, depth + 1) for v in items)
+            stack.extend(reversed(children))
+        return truncations
+
+    def merge(self, other: "SchemaAccumulator") -> None:
+        """
+        Folds another accumulator in, eg. the one built on another worker
+        """
+        stack: List[Tuple["SchemaAccumulator", "SchemaAccumulator"]] = [(self, other)]
+        while stack:
+            accumulator, other = stack.pop()
+            accumulator.count += other.count
+            for type_, n in other.types.items():
+                accumulator.types[type_] = accumulator.types.get(type_, 0) + n
+            accumulator.objects += other.objects
+            accumulator.truncated |= other.truncated
+            for k, child in other.properties.items():
+                accumulator.presence[k] = accumulator.presence.get(
+                    k, 0
+                ) + other.presence.get(k, 0)
+                if k in accumulator.properties:
+                    stack.append((accumulator.properties[k], child))
+                else:
+                    accumulator.properties[k] = child
+            if other.items is not None:
+                if accumulator.items is None:
+                    accumulator.items = other.items
+                else:
+                    stack.append((accumulator.items, other.items))
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Dumps the running state into JSON values, eg. to be persisted
+        and carried on by the next build with `from_json()`
+        """
+        root: Dict[str, Any] = {}
+        stack: List[Tuple["SchemaAccumulator", Dict[str, Any]]] = [(self, root)]
+        while stack:
+            accumulator, d = stack.pop()
+            d["count"] = accumulator.count
+            d["types"] = accumulator.types
+            if accumulator.objects:
+                d["objects"] = accumulator.objects
+                d["properties"] = {}
+                for k, child in accumulator.properties.items():
+                    d["properties"][k] = {}
+                    stack.append((child, d["properties"][k]))
+                d["presence"] = accumulator.presence
+            if accumulator.items is not None:
+                d["items"] = {}
+                stack.append((accumulator.items, d["items"]))
+            if accumulator.truncated:
+                d["truncated"] = True
+        return root
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> "SchemaAccumulator":
+        root = cls()
+        stack: List[Tuple["SchemaAccumulator", Dict[str, Any]]] = [(root, d)]
+        while stack:
+            accumulator, d = stack.pop()
+            accumulator.count = d["count"]
+            accumulator.types = dict(d["types"])
+            accumulator.objects = d.get("objects", 0)
+            for k, c in d.get("properties", {}).items():
+                child = accumulator.properties[k] = cls()
+                stack.append((child, c))
+            accumulator.presence = dict(d.get("presence", {}))
+            if "items" in d:
+                accumulator.items = cls()
+                stack.append((accumulator.items, d["items"]))
+            accumulator.truncated = d.get("truncated", False)
+        return root
+
+    def build(self, required: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Builds the OAS schema, which is the same as `OASParser.parse`
+        for a single sample
+
+        The accumulators are built children first,
+        in the reverse order of a pre-order walk
+        """
+        walk: List["SchemaAccumulator"] = []
+        stack: List["SchemaAccumulator"] = [self]
+        while stack:
+            accumulator = stack.pop()
+            walk.append(accumulator)
+            stack.extend(accumulator.properties.values())
+            if accumulator.items is not None:
+                stack.append(accumulator.items)
+        built: Dict[int, Optional[Dict[str, Any]]] = {}
+        for accumulator in reversed(walk):
+            built[id(accumulator)] = accumulator._build_node(
+                built, required and accumulator is self
+            )
+        return built[id(self)]
+
+    def _build_node(
+        self, built: Dict[int, Optional[Dict[str, Any]]], required: bool
+    ) -> Optional[Dict[str, Any]]:
+        types = [x for x in self.types if x != NULL]
+        if "integer" in types and "number" in types:
+            types.remove("integer")
+        schemas = []
+        for type_ in types:
+            schema = self._build_type(type_, built, required)
+            if schema:
+                schemas.append(schema)
+        if not schemas:
+            return None
+        if NULL in self.types:
+            for schema in schemas:
+                schema["nullable"] = True
+        if len(schemas) == 1:
+            return schemas[0]
+        return {"oneOf": schemas}
+
+    def _build_type(
+        self,
+        type_: str,
+        built: Dict[int, Optional[Dict[str, Any]]],
+        required: bool,
+    ) -> Optional[Dict[str, Any]]:
+        d: Dict[str, Any] = {"type": type_}
+        if type_ == "object":
+            d["properties"] = {}
+            for k, child in self.properties.items():
+                c = built[id(child)]
+                if not c:
+                    logger.warning(f"🚨 parsing type failed for key:{k}")
+                    continue
+                d["properties"][k] = c
+            if required:
+                d["required"] = sorted(
+                    k for k, n in self.presence.items() if n == self.objects
+                )
+        elif type_ == "array":
+            items = built[id(self.items)] if self.items else None
+            if items:
+                d["items"] = items
+            elif self.truncated:
+                # as `OASParser` leaves the items of an array cut by max_depth
+                d["items"] = {}
+            else:
+                return None
+        elif type_ == "number":
+            d["format"] = "float"
+        return d
+
+
+def merge_samples(
+    samples: Iterable[Any],
+    required: bool = False,
+    budget: Optional["ParseBudget"] = None,
+) -> Optional[dict]:
+    accumulator = SchemaAccumulator()
+    for sample in samples:
+        accumulator.add(sample, budget)
+    return accumulator.build(required=required)
@@ -0,0 +1,236 @@
+import io
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from . import (
+    NodePath,
+    OASParser,
+    ParseBudget,
+    ParseResult,
+    Truncation,
+    format_node_path,
+)
+
+logger = logging.getLogger(__name__)
+
+Raw = Union[str, bytes]
+Event = Tuple[str, Any]
+
+SCALAR_TYPES = {
+    "string": "string",
+    "boolean": "boolean",
+}
+
+
+@dataclass
+class StreamParseResult(ParseResult):
+    # every key of the root object, if the root is an object
+    keys: Optional[List[str]] = None
+
+
+class _Frame:
+    """
+    An object/array being parsed, along with where its schema goes
+    """
+
+    __slots__ = (
+        "schema",
+        "depth",
+        "path",
+        "parent",
+        "key",
+        "count",
+        "items",
+        "truncation_at",
+    )
+
+    def __init__(
+        self,
+        schema: Optional[Dict[str, Any]],
+        depth: int,
+        path: NodePath,
+        parent: Optional["_Frame"],
+        key: Any,
+        truncation_at: int = 0,
+    ) -> None:
+        self.schema = schema
+        self.depth = depth
+        self.path = path
+        self.parent = parent
+        self.key = key
+        # properties/items seen so far
+        self.count = 0
+        # inspected items of an array, merged at its end
+        self.items: Optional[List[Optional[Dict[str, Any]]]] = None
+        self.truncation_at = truncation_at
+
+
+def parse_stream(raw: Raw, budget: Optional[ParseBudget] = None) -> StreamParseResult:
+    """
+    Infers the schema of a JSON body from its token stream, without building
+    the Python object, into the same schema as `OASParser.parse_bounded()`
+
+    Only the items of an array within `budget.max_items` are inspected,
+    so the memory taken does not grow with the length of the arrays
+
+    Raises `json.JSONDecodeError` for a non-JSON body
+    """
+    import ijson
+
+    try:
+        return parse_events(ijson.basic_parse(_reader(raw), use_float=True), budget)
+    except ijson.JSONError as e:
+        # the C backend rejects what the python one accepts (eg. big ints)
+        try:
+            events = ijson.get_backend("python").basic_parse(
+                _reader(raw), use_float=True
+            )
+            return parse_events(events, budget)
+        except ijson.JSONError:
+            raise json.JSONDecodeError(str(e), "", 0) from e
+
+
+def _reader(raw: Raw) -> io.IOBase:
+    # bytes are streamed as is, whereas a text stream keeps a wide-char copy
+    return io.BytesIO(raw.encode() if isinstance(raw, str) else raw)
+
+
+def parse_events(
+    events: Iterable[Event], budget: Optional[ParseBudget] = None
+) -> StreamParseResult:
+    """
+    Parses ijson `basic_parse` events, eg.
+        ("start_map", None), ("map_key", "id"), ("number", 1), ("end_map", None)
+    """
+    if budget is None:
+        budget = OASParser.budget
+    truncations: List[Truncation] = []
+    result = StreamParseResult(None, truncations)
+    frame: Optional[_Frame] = None
+    # nesting level of the subtree being skipped
+    skipping = 0
+    # an array whose schema depends on whether it has any item
+    pending: Optional[_Frame] = None
+    key: Any = None
+
+    def place(schema: Optional[Dict[str, Any]], parent: Optional[_Frame], key: Any):
+        if parent is None:
+            result.schema = schema
+        elif parent.schema["type"] == "object":  # type: ignore
+            if schema:
+                parent.schema["properties"][key] = schema  # type: ignore
+            else:
+                logger.warning(f"🚨 parsing type failed for key:{key}")
+        elif parent.items is not None:
+            parent.items.append(schema)
+        else:
+            parent.schema["items"] = schema  # type: ignore
+
+    for event, value in events:
+        if skipping:
+            if event == "start_map" or event == "start_array":
+                skipping += 1
+            elif event == "end_map" or event == "end_array":
+                skipping -= 1
+            elif event == "map_key" and skipping == 1 and frame is None:
+                # of the root object cut by max_depth
+                result.keys.append(value)  # type: ignore
+            continue
+        if pending is not None:
+            array, pending = pending, None
+            if event == "end_array":
+                place(None, array.parent, array.key)
+                continue
+            array.schema = {"type": "array"}
+            place(array.schema, array.parent, array.key)
+            if budget.max_depth is not None and array.depth >= budget.max_depth:
+                truncations.append(
+                    Truncation(
+                        format_node_path(array.path),
+                        f"depth exceeds max_depth:{budget.max_depth}",
+                    )
+                )
+                array.schema["items"] = {}
+                skipping = 1
+                if event == "start_map" or event == "start_array":
+                    skipping += 1
+                continue
+            if budget.max_items > 1:
+                array.items = []
+            frame = array
+        if event == "map_key":
+            frame.count += 1  # type: ignore
+            key = value
+            if frame.parent is None and frame.depth == 0:  # type: ignore
+                result.keys.append(value)  # type: ignore
+            continue
+        if event == "end_map" or event == "end_array":
+            done, frame = frame, frame.parent  # type: ignore
+            if event == "end_map":
+                inspected = done.count
+                if budget.max_properties is not None:
+                    inspected = min(done.count, budget.max_properties)
+                if inspected < done.count:
+                    truncations.insert(
+                        done.truncation_at,
+                        Truncation(
+                            format_node_path(done.path),
+                            f"{done.count - inspected} properties exceed"
+                            f" max_properties:{budget.max_properties}",
+                        ),
+                    )
+            elif done.items is not None:
+                items = OASParser._merge_items(done.items)  # type: ignore
+                done.schema["items"] = items
+            continue
+
+        # a value, either of the root, a property or an item
+        if frame is None:
+            depth, path, child_key = 0, None, None
+        elif frame.schema["type"] == "object":  # type: ignore
+            if (
+                budget.max_properties is not None
+                and frame.count > budget.max_properties
+            ):
+                if event == "start_map" or event == "start_array":
+                    skipping = 1
+                continue
+            depth, path, child_key = frame.depth + 1, (frame.path, key), key
+        else:
+            frame.count += 1
+            if frame.count > max(budget.max_items, 1):
+                if event == "start_map" or event == "start_array":
+                    skipping = 1
+                continue
+            index = frame.count - 1
+            depth, path, child_key = frame.depth + 1, (frame.path, index), index
+
+        if event == "start_map":
+            schema: Dict[str, Any] = {"type": "object", "properties": {}}
+            place(schema, frame, child_key)
+            if frame is None:
+                result.keys = []
+            if budget.max_depth is not None and depth >= budget.max_depth:
+                truncations.append(
+                    Truncation(
+                        format_node_path(path),
+                        f"depth exceeds max_depth:{budget.max_depth}",
+                    )
+                )
+                skipping = 1
+                continue
+            frame = _Frame(schema, depth, path, frame, child_key, len(truncations))
+        elif event == "start_array":
+            pending = _Frame(None, depth, path, frame, child_key)
+        elif event == "number":
+            if type(value) is int:
+                place({"type": "integer"}, frame, child_key)
+            else:
+                place({"type": "number", "format": "float"}, frame, child_key)
+        elif event in SCALAR_TYPES:
+            place({"type": SCALAR_TYPES[event]}, frame, child_key)
+        else:
+            place(None, frame, child_key)
+    return result
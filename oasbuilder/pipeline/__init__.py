@@ -0,0 +1,18 @@
+from .cache import BuildCache, file_digest, sample_fingerprint  # noqa
+from .index import EndpointIndex  # noqa
+from .merge import SampleMerger  # noqa
+from .render import dump_samples, load_samples, render_chunk, render_samples  # noqa
+from .sample import (  # noqa
+    Operation,
+    Pattern,
+    Sample,
+    SampleDeduper,
+    build_pattern,
+    decode_sample,
+    format_pattern,
+    hit_pattern,
+    parse_pattern,
+)
+from .slice import merge_slices, scan_slice, scan_slices  # noqa
+from .watch import Debouncer, poll_and_emit  # noqa
+from .write import write_patterns, write_sample, write_schemas  # noqa
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import logging
+import pathlib
+import typing as t
+
+from oasbuilder import decoder
+from oasbuilder.utils.serializer import digest
+from oasbuilder.writer import OASSpec
+
+from .index import EndpointIndex
+from .sample import Pattern, Sample, format_pattern, parse_pattern
+from .write import write_sample
+
+logger = logging.getLogger(__name__)
+
+# bumped whenever the writers render the same sample differently
+MANIFEST_VERSION = 2
+
+
+def sample_fingerprint(sample: Sample) -> str:
+    """
+    Hashes everything the documents of a sample are rendered from, ie.
+    its inferred schemas and the types of its query, but not the values
+    of its bodies, so that a sample of the same shape keeps the fingerprint
+
+    The schemas must have been inferred by `Sample.build_schemas()`
+    """
+    return digest(
+        {
+            "query": {k: type(v).__name__ for k, v in (sample.query or {}).items()},
+            "request_content": bool(sample.request_content),
+            "request_schema": sample.request_schema,
+            "has_response_schema": sample.has_response_schema,
+            "response_schema": sample.response_schema,
+        }
+    )
+
+
+def file_digest(path: pathlib.Path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+class BuildCache:
+    """
+    Persistent state of the last build, a JSON manifest of
+
+    - the documents rendered from every sample, keyed by its pattern,
+      along with the fingerprint of the sample
+    - the digest of every document flushed into the tree
+    - the digest of the bundle which was linted and rendered into HTML
+    - the high-water mark of the capture timestamp the build fetched up to
+    - the running schemas of `SampleMerger`, with `--merge-samples`
+
+    eg.
+        {
+            "version": 2,
+            "entries": {
+                "/v1/posts/{post_id} get 200": {
+                    "fingerprint": "3f786850e387550fdab836ed7e6dc881de23001b",
+                    "documents": {"paths/v1-posts-{post_id}/get/_index.yml": {...}},
+                },
+            },
+            "digests": {"index.yml": "89e6c98d92887913cadf06b2adb97f26cde4849b"},
+            "bundle": "2b66fd261ee5c6cfc8de7fa466bab600bcfe4f69",
+            "watermark": 1638316800000,
+            "merger": {"queries": {...}, "response_schemas": {...}, ...},
+        }
+
+    A sample whose fingerprint is unchanged is not rendered again,
+    but its documents are restored from the manifest
+
+    `reset()` starts over from an empty state, and without a `path`
+    the state is kept in memory only, eg. by a long-running `poll_and_emit()`
+    """
+
+    def __init__(self, path: t.Optional[pathlib.Path] = None) -> None:
+        self.path = path
+        self.entries: t.Dict[str, t.Dict[str, t.Any]] = {}
+        self.digests: t.Dict[str, str] = {}
+        self.bundle: t.Optional[str] = None
+        self.watermark: t.Optional[int] = None
+        self.merger: t.Optional[t.Dict[str, t.Any]] = None
+        self.reused = 0
+        self.rendered = 0
+        self.retained = 0
+        # entries of this build, which replace the last ones on `save()`
+        self._next_entries: t.Dict[str, t.Dict[str, t.Any]] = {}
+        if path is not None and path.is_file():
+            self._load(path)
+
+    def _load(self, path: pathlib.Path) -> None:
+        manifest = decoder.loads(path.read_bytes())
+        if manifest.get("version") != MANIFEST_VERSION:
+            logger.info(
+                f"🗑 ignored the build cache of version:{manifest.get('version')}"
+            )
+            return
+        self.entries = manifest["entries"]
+        self.digests = manifest["digests"]
+        self.bundle = manifest["bundle"]
+        watermark = manifest["watermark"]
+        # eg. the double of a manifest written before it was made integer
+        self.watermark = None if watermark is None else int(watermark)
+        self.merger = manifest["merger"]
+
+    def reset(self) -> None:
+        self.entries = {}
+        self.digests = {}
+        self.bundle = None
+        self.watermark = None
+        self.merger = None
+
+    def write_sample(
+        self,
+        dest_root: pathlib.Path,
+        sample: Sample,
+        spec: OASSpec,
+    ) -> bool:
+        """
+        Adds the documents of the `sample` to the `spec`, either restored
+        from the last build if the sample is unchanged, or else rendered
+
+        Returns whether the documents were rendered
+        """
+        sample.build_schemas()
+        key = format_pattern(sample.pattern)
+        fingerprint = sample_fingerprint(sample)
+        if self._restore(key, fingerprint, spec):
+            return False
+        dests = write_sample(dest_root, sample, spec)
+        self._next_entries[key] = {
+            "fingerprint": fingerprint,
+            "documents": {
+                dest.relative_to(dest_root).as_posix(): spec.get(dest) for dest in dests
+            },
+        }
+        self.rendered += 1
+        return True
+
+    def write_rendered(
+        self, pattern: Pattern, spec: OASSpec, rendered: t.Dict[str, t.Any]
+    ) -> bool:
+        """
+        Same as `write_sample()` with the fingerprint and documents
+        rendered from the sample of the `pattern`, eg. by a worker process,
+        along with their YAML if dumped
+        """
+        key = format_pattern(pattern)
+        if self._restore(key, rendered["fingerprint"], spec):
+            return False
+        spec.update(rendered["documents"], rendered.get("yaml"))
+        self._next_entries[key] = {
+            "fingerprint": rendered["fingerprint"],
+            "documents": rendered["documents"],
+        }
+        self.rendered += 1
+        return True
+
+    def _restore(self, key: str, fingerprint: str, spec: OASSpec) -> bool:
+        entry = self._next_entries.get(key, self.entries.get(key))
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return False
+        spec.update(entry["documents"])
+        self._next_entries[key] = entry
+        self.reused += 1
+        return True
+
+    def retain(
+        self, dest_root: pathlib.Path, spec: OASSpec, index: EndpointIndex
+    ) -> None:
+        """
+        Carries the entries of the last build which no sample of this build
+        has replaced over, eg. of the endpoints with no traffic since
+
+        The documents already added by this build are left as they are,
+        eg. the method of an endpoint whose other status code is replaced
+        """
+        for key, entry in self.entries.items():
+            if key in self._next_entries:
+                continue
+            for relpath, oas_json in entry["documents"].items():
+                dest = dest_root / relpath
+                if dest not in spec:
+                    spec.add(dest, oas_json)
+            index.add_pattern(parse_pattern(key))  # type: ignore
+            self._next_entries[key] = entry
+            self.retained += 1
+
+    def save(self, bundle_digest: t.Optional[str] = None) -> None:
+        """
+        Writes the manifest, with the digest of the bundle
+        once it has been linted and rendered
+        """
+        self.bundle = bundle_digest
+        if self.path is None:
+            return
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "entries": self._next_entries,
+            "digests": self.digests,
+            "bundle": bundle_digest,
+            "watermark": self.watermark,
+            "merger": self.merger,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False))
+        tmp.replace(self.path)
+
+    def report(self) -> str:
+        return (
+            f"reused:{self.reused} rendered:{self.rendered}"
+            f" retained:{self.retained}"
+        )
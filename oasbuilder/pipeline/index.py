@@ -0,0 +1,32 @@
+import typing as t
+
+from oasbuilder.models import HTTPMethod
+
+from .sample import Pattern, Sample
+
+
+class EndpointIndex:
+    """
+    Known methods and status codes per endpoint, maintained while the samples
+    are written, so that the pattern files are rendered once from it
+
+    eg.
+        {"/v1/posts/{post_id}": {HTTPMethod.GET: {200, 404}}}
+    """
+
+    def __init__(self) -> None:
+        self.endpoints: t.Dict[str, t.Dict[HTTPMethod, t.Set[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def add(self, sample: Sample) -> None:
+        self.add_pattern(sample.pattern)
+
+    def add_pattern(self, pattern: Pattern) -> None:
+        endpoint_path, method, status_code = pattern
+        methods = self.endpoints.setdefault(endpoint_path, {})
+        methods.setdefault(HTTPMethod(method), set()).add(status_code)
+
+    def methods(self, endpoint_path: str) -> t.Dict[HTTPMethod, t.Set[int]]:
+        return self.endpoints[endpoint_path]
@@ -0,0 +1,156 @@
+import logging
+import typing as t
+
+from oasbuilder.parser import ParseBudget, SchemaAccumulator
+
+from .sample import (
+    Operation,
+    Pattern,
+    Sample,
+    decode_sample,
+    format_pattern,
+    parse_pattern,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SampleMerger:
+    """
+    Folds every sample of a pattern into running schemas,
+    instead of keeping only the first sample per pattern
+
+    The request body schema is merged per (path, method), as it is written
+    per method, and the response body schema per (path, method, status_code)
+
+    Each body is inspected as far as the `budget` allows, if any
+
+    A merger kept across fetches, eg. by the polls of `poll_and_emit()`,
+    returns only the patterns of the operations merged into since
+    the last fetch, so that a fetch costs as much as its new samples
+    """
+
+    def __init__(self, budget: t.Optional[ParseBudget] = None) -> None:
+        self.budget = budget
+        self.samples: t.Dict[Pattern, Sample] = {}
+        self.queries: t.Dict[Operation, t.Dict[str, t.Any]] = {}
+        self.request_contents: t.Dict[Operation, t.Dict[str, t.Any]] = {}
+        self.request_schemas: t.Dict[Operation, SchemaAccumulator] = {}
+        self.response_schemas: t.Dict[Pattern, SchemaAccumulator] = {}
+        # the patterns of every operation, whose running schemas are dumped
+        self.patterns: t.Dict[Operation, t.Set[Pattern]] = {}
+        # the operations merged into since the last `results()`/`dump_state()`
+        self.dirty: t.Set[Operation] = set()
+        self.undumped: t.Set[Operation] = set()
+        self.state: t.Dict[str, t.Dict[str, t.Any]] = {
+            "queries": {},
+            "request_contents": {},
+            "request_schemas": {},
+            "response_schemas": {},
+        }
+        self.merged = 0
+        self.truncated = 0
+
+    def add(self, sample: Sample) -> None:
+        pattern = sample.pattern
+        operation = pattern[:2]
+        self.merged += 1
+        self.patterns.setdefault(operation, set()).add(pattern)
+        self.dirty.add(operation)
+        self.undumped.add(operation)
+        representative = self.samples.setdefault(pattern, sample)
+        query = self.queries.setdefault(operation, {})
+        for k, v in (sample.query or {}).items():
+            query.setdefault(k, v)
+        if sample.request_content:
+            self.request_contents.setdefault(operation, sample.request_content)
+            self.truncated += self.request_schemas.setdefault(
+                operation, SchemaAccumulator()
+            ).add(sample.request_content, self.budget)
+        if sample.has_response_schema:
+            if not representative.has_response_schema:
+                representative.response_content = sample.response_content
+            self.truncated += self.response_schemas.setdefault(
+                pattern, SchemaAccumulator()
+            ).add(sample.response_content, self.budget)
+
+    def results(self) -> t.List[Sample]:
+        """
+        The merged samples of the operations merged into since the last call,
+        every pattern of such an operation, as they share its query and
+        request body schema
+        """
+        results = []
+        for pattern, sample in self.samples.items():
+            operation = pattern[:2]
+            if operation not in self.dirty:
+                continue
+            sample.query = self.queries[operation]
+            if operation in self.request_schemas:
+                sample.request_content = self.request_contents[operation]
+                sample.request_schema = self.request_schemas[operation].build(
+                    required=True
+                )
+            if pattern in self.response_schemas:
+                sample.response_schema = self.response_schemas[pattern].build(
+                    required=True
+                )
+            results.append(sample)
+        self.dirty.clear()
+        return results
+
+    def iter_samples(
+        self, hits: t.Iterable[t.Tuple[str, t.Dict[str, t.Any]]]
+    ) -> t.Iterator[Sample]:
+        for endpoint_path, info in hits:
+            self.add(decode_sample(endpoint_path, info))
+        yield from self.results()
+
+    def dump_state(self) -> t.Dict[str, t.Any]:
+        """
+        Dumps the running schemas of every pattern into JSON values,
+        which the next build carries on from with `load_state()`,
+        eg. to merge only the samples captured since
+
+        Only the operations merged into since the last dump are dumped again
+        """
+        for operation in self.undumped:
+            key = format_pattern(operation)
+            self.state["queries"][key] = self.queries[operation]
+            if operation in self.request_contents:
+                self.state["request_contents"][key] = self.request_contents[operation]
+            if operation in self.request_schemas:
+                self.state["request_schemas"][key] = self.request_schemas[
+                    operation
+                ].to_json()
+            for pattern in self.patterns[operation]:
+                if pattern in self.response_schemas:
+                    self.state["response_schemas"][format_pattern(pattern)] = (
+                        self.response_schemas[pattern].to_json()
+                    )
+        self.undumped.clear()
+        return self.state
+
+    def load_state(self, state: t.Dict[str, t.Any]) -> None:
+        """
+        Loads the running schemas dumped by `dump_state()`, into which the
+        samples are merged; only the patterns of the samples added since
+        are returned by `results()`
+        """
+        for name, values in state.items():
+            self.state[name].update(values)
+        for k, query in state["queries"].items():
+            self.queries[parse_pattern(k)] = query  # type: ignore
+        for k, content in state["request_contents"].items():
+            self.request_contents[parse_pattern(k)] = content  # type: ignore
+        load = SchemaAccumulator.from_json
+        for k, d in state["request_schemas"].items():
+            self.request_schemas[parse_pattern(k)] = load(d)  # type: ignore
+        for k, d in state["response_schemas"].items():
+            self.response_schemas[parse_pattern(k)] = load(d)  # type: ignore
+
+    def report(self) -> str:
+        return (
+            f"merged:{self.merged} patterns:{len(self.samples)}"
+            f" truncated:{self.truncated}"
+        )
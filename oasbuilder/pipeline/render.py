@@ -0,0 +1,185 @@
+import collections
+import itertools
+import json
+import pathlib
+import typing as t
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from oasbuilder import decoder
+from oasbuilder.models import HTTPMethod
+from oasbuilder.parser import OASParser, ParseBudget, SchemaCache
+from oasbuilder.source import Hit
+from oasbuilder.utils.serializer import dump_yaml
+from oasbuilder.writer import OASSpec
+
+from .cache import sample_fingerprint
+from .sample import Pattern, Sample, decode_sample, hit_pattern
+from .write import write_sample
+
+# {"fingerprint": ..., "documents": {relpath: oas_json}}, as of `BuildCache`,
+# along with {"yaml": {relpath: oas_yaml}} if dumped by the worker
+Rendered = t.Dict[str, t.Any]
+
+# the stream threshold of the hits decoded on a worker process
+_stream_threshold: t.Optional[int] = None
+
+
+def dump_samples(samples: t.Sequence[t.Union[Sample, Hit]]) -> bytes:
+    """
+    Serializes the samples into a single compact JSON payload,
+    which is far cheaper to send to a worker process than pickled dicts
+
+    A hit is sent as its raw `_source`, to be decoded by the worker
+    """
+    return _dumps(
+        [
+            (
+                [
+                    sample.endpoint_path,
+                    sample.method.value,
+                    sample.query,
+                    sample.request_content,
+                    sample.status_code,
+                    sample.response_content,
+                    sample.request_schema,
+                    sample.response_schema,
+                ]
+                if isinstance(sample, Sample)
+                else list(sample)
+            )
+            for sample in samples
+        ]
+    )
+
+
+def load_samples(payload: bytes) -> t.List[Sample]:
+    samples = []
+    for item in json.loads(payload):
+        if len(item) == 2:
+            # a raw hit of [endpoint_path, _source]
+            samples.append(decode_sample(*item, _stream_threshold))
+            continue
+        (
+            endpoint_path,
+            method,
+            query,
+            request_content,
+            status_code,
+            response_content,
+            request_schema,
+            response_schema,
+        ) = item
+        samples.append(
+            Sample(
+                endpoint_path,
+                HTTPMethod(method),
+                query,
+                request_content,
+                status_code,
+                response_content,
+                request_schema=request_schema,
+                response_schema=response_schema,
+            )
+        )
+    return samples
+
+
+def render_chunk(dest_root: str, payload: bytes, yaml: bool = False) -> bytes:
+    """
+    Decodes the samples, infers their schemas and renders their documents
+    on a worker process, and with `yaml`, dumps the documents as well
+
+    Returns the fingerprint and the documents of every sample in order,
+    as a single JSON payload
+    """
+    root = pathlib.Path(dest_root)
+    rendered: t.List[Rendered] = []
+    for sample in load_samples(payload):
+        sample.build_schemas()
+        spec = OASSpec(root)
+        write_sample(root, sample, spec)
+        result: Rendered = {
+            "fingerprint": sample_fingerprint(sample),
+            "documents": {
+                relpath.as_posix(): oas_json
+                for relpath, oas_json in spec.documents.items()
+            },
+        }
+        if yaml:
+            result["yaml"] = {
+                relpath.as_posix(): dump_yaml(oas_json)
+                for relpath, oas_json in spec.documents.items()
+            }
+        rendered.append(result)
+    return _dumps(rendered)
+
+
+def init_worker(
+    parse_budget: t.Optional[ParseBudget],
+    schema_cache_size: int,
+    json_backend: t.Optional[str] = None,
+    stream_threshold: t.Optional[int] = None,
+) -> None:
+    global _stream_threshold
+    if parse_budget:
+        OASParser.budget = parse_budget
+    if schema_cache_size:
+        OASParser.cache = SchemaCache(schema_cache_size)
+    if json_backend:
+        decoder.set_backend(json_backend)
+    _stream_threshold = stream_threshold
+
+
+def item_pattern(item: t.Union[Sample, Hit]) -> Pattern:
+    if isinstance(item, Sample):
+        return item.pattern
+    return hit_pattern(*item)
+
+
+def render_samples(
+    samples: t.Iterable[t.Union[Sample, Hit]],
+    dest_root: pathlib.Path,
+    workers: int,
+    chunk_size: int = 32,
+    parse_budget: t.Optional[ParseBudget] = None,
+    schema_cache_size: int = 0,
+    json_backend: t.Optional[str] = None,
+    stream_threshold: t.Optional[int] = None,
+    yaml: bool = False,
+) -> t.Iterator[t.Tuple[Pattern, Rendered]]:
+    """
+    Renders the samples on `workers` processes, `chunk_size` samples per task,
+    and yields the pattern of every sample along with its rendering
+    in the order of `samples`, so that the output is the same whatever
+    the number of workers
+
+    The samples may be raw hits, eg. deduped by `SampleDeduper.iter_hits()`,
+    which are decoded by the workers rather than by the main process,
+    and with `yaml`, the workers dump the documents for `OASSpec.flush()`
+
+    At most `2 * workers` chunks are in flight, so that the samples
+    are not all held in memory at once
+    """
+    pending: t.Deque[t.Tuple[t.List[Pattern], Future]] = collections.deque()
+    iterator = iter(samples)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(parse_budget, schema_cache_size, json_backend, stream_threshold),
+    ) as executor:
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if chunk:
+                future = executor.submit(
+                    render_chunk, str(dest_root), dump_samples(chunk), yaml
+                )
+                pending.append(([item_pattern(item) for item in chunk], future))
+            if pending and (not chunk or len(pending) >= 2 * workers):
+                patterns, future = pending.popleft()
+                yield from zip(patterns, json.loads(future.result()))
+            elif not chunk:
+                return
+
+
+def _dumps(data: t.Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
@@ -0,0 +1,233 @@
+import json
+import logging
+import typing as t
+from dataclasses import dataclass
+
+from oasbuilder import decoder
+from oasbuilder.models import HTTPMethod
+from oasbuilder.utils import parameterized_endpoint_path
+from oasbuilder.writer import OASRequestBodySchemaWriter, OASResponseSchemaWriter
+
+logger = logging.getLogger(__name__)
+
+Pattern = t.Tuple[str, str, int]
+# (path, method) of a pattern
+Operation = t.Tuple[str, str]
+
+
+def build_pattern(endpoint_path: str, method: HTTPMethod, status_code: int) -> Pattern:
+    return (
+        parameterized_endpoint_path(endpoint_path),
+        method.value,
+        status_code,
+    )
+
+
+def format_pattern(pattern: t.Union[Pattern, Operation]) -> str:
+    """
+    eg.
+        in: ("/v1/posts/{post_id}", "get", 200)
+        out: "/v1/posts/{post_id} get 200"
+    """
+    return " ".join(str(c) for c in pattern)
+
+
+def parse_pattern(key: str) -> t.Union[Pattern, Operation]:
+    """
+    eg.
+        in: "/v1/posts/{post_id} get 200"
+        out: ("/v1/posts/{post_id}", "get", 200)
+    """
+    endpoint_path, method, *status_code = key.split(" ")
+    if status_code:
+        return endpoint_path, method, int(status_code[0])
+    return endpoint_path, method
+
+
+@dataclass
+class Sample:
+    endpoint_path: str
+    method: HTTPMethod
+    query: t.Optional[t.Dict[str, t.Any]]
+    request_content: t.Optional[t.Dict[str, t.Any]]
+    status_code: int
+    response_content: t.Optional[t.Any]
+    request_schema: t.Optional[t.Dict[str, t.Any]] = None
+    response_schema: t.Optional[t.Dict[str, t.Any]] = None
+
+    @property
+    def pattern(self) -> Pattern:
+        return build_pattern(self.endpoint_path, self.method, self.status_code)
+
+    @property
+    def has_response_schema(self) -> bool:
+        if self.response_schema is not None:
+            return True
+        return bool(self.response_content) and isinstance(
+            self.response_content, (dict, list)
+        )
+
+    def build_schemas(self) -> None:
+        """
+        Infers the body schemas up front, eg. on a worker process,
+        unless they have been built already, eg. merged by `SampleMerger`
+        """
+        if self.request_schema is None and self.request_content:
+            self.request_schema = OASRequestBodySchemaWriter.build_schema(
+                self.request_content
+            )
+        if self.response_schema is None and self.has_response_schema:
+            self.response_schema = OASResponseSchemaWriter.build_schema(
+                self.response_content
+            )
+
+
+def decode_sample(
+    endpoint_path: str,
+    info: t.Dict[str, t.Any],
+    stream_threshold: t.Optional[int] = None,
+) -> Sample:
+    """
+    Decodes a `_source` of the traffic index
+
+    eg.
+        {
+            "request": {"method": "GET", "query": "{}", "content": ""},
+            "response": {"status_code": 200, "content": "{\"id\": 1}"},
+        }
+
+    A response content of `stream_threshold` or more bytes is not decoded,
+    but its schema is inferred from the token stream instead
+    """
+    method = HTTPMethod[info["request"]["method"]]
+    query = decoder.loads(info["request"]["query"])
+    request_content_raw = info["request"]["content"]
+    status_code = info["response"]["status_code"]
+    request_content = decoder.loads_or_none(request_content_raw)
+    if not isinstance(request_content, dict):
+        # eg. a form-encoded body, which has no schema
+        request_content = None
+    response_content_raw = info["response"]["content"]
+    streamed = streamed_content(response_content_raw, stream_threshold)
+    if streamed is not None:
+        try:
+            response_schema = OASResponseSchemaWriter.build_stream_schema(streamed)
+        except json.JSONDecodeError:
+            response_schema = None
+        return Sample(
+            endpoint_path,
+            method,
+            query,
+            request_content,
+            status_code,
+            None,
+            response_schema=response_schema,
+        )
+    response_content = decoder.loads_or_none(response_content_raw)
+    return Sample(
+        endpoint_path,
+        method,
+        query,
+        request_content,
+        status_code,
+        response_content,
+    )
+
+
+def streamed_content(
+    raw: t.Optional[decoder.Raw], stream_threshold: t.Optional[int]
+) -> t.Optional[bytes]:
+    """
+    Returns the UTF-8 bytes of a body of `stream_threshold` or more bytes,
+    or None for a smaller one, which is decoded as usual
+
+    A `str` body, as of Elasticsearch, is encoded once, both to measure it
+    and to be streamed from, since a text stream over it would keep
+    a wide-char copy of its own
+    """
+    if stream_threshold is None or not raw:
+        return None
+    if isinstance(raw, str):
+        # a char takes 4 bytes at most, so a shorter body is not encoded
+        if len(raw) * 4 < stream_threshold:
+            return None
+        raw = raw.encode()
+    return raw if len(raw) >= stream_threshold else None
+
+
+def hit_pattern(endpoint_path: str, info: t.Dict[str, t.Any]) -> Pattern:
+    """
+    The pattern of a `_source`, without decoding its bodies
+    """
+    return build_pattern(
+        endpoint_path,
+        HTTPMethod[info["request"]["method"]],
+        info["response"]["status_code"],
+    )
+
+
+class SampleDeduper:
+    """
+    Dedupes hits by (path, method, status_code) before decoding their bodies,
+    so that duplicated hits never pay for `json.loads`
+    """
+
+    def __init__(self, stream_threshold: t.Optional[int] = None) -> None:
+        self.stream_threshold = stream_threshold
+        self.patterns: t.Set[Pattern] = set()
+        self.decoded = 0
+        self.skipped = 0
+        self.skipped_bytes = 0
+
+    def decode(
+        self, endpoint_path: str, info: t.Dict[str, t.Any]
+    ) -> t.Optional[Sample]:
+        if not self.is_new(endpoint_path, info):
+            return None
+        return decode_sample(endpoint_path, info, self.stream_threshold)
+
+    def is_new(self, endpoint_path: str, info: t.Dict[str, t.Any]) -> bool:
+        """
+        Whether the hit is the first one of its pattern, which is then decoded
+        """
+        pattern = hit_pattern(endpoint_path, info)
+        if pattern in self.patterns:
+            self.skipped += 1
+            # the length of a str body, which is not encoded only to be counted
+            self.skipped_bytes += sum(
+                len(raw or "")
+                for raw in (
+                    info["request"]["query"],
+                    info["request"]["content"],
+                    info["response"]["content"],
+                )
+            )
+            return False
+        self.patterns.add(pattern)
+        self.decoded += 1
+        return True
+
+    def iter_samples(
+        self, hits: t.Iterable[t.Tuple[str, t.Dict[str, t.Any]]]
+    ) -> t.Iterator[Sample]:
+        for endpoint_path, info in hits:
+            sample = self.decode(endpoint_path, info)
+            if sample:
+                yield sample
+
+    def iter_hits(
+        self, hits: t.Iterable[t.Tuple[str, t.Dict[str, t.Any]]]
+    ) -> t.Iterator[t.Tuple[str, t.Dict[str, t.Any]]]:
+        """
+        Same as `iter_samples()`, but leaves the first hit of every pattern
+        undecoded, eg. to be decoded by the workers of `render_samples()`
+        """
+        for endpoint_path, info in hits:
+            if self.is_new(endpoint_path, info):
+                yield endpoint_path, info
+
+    def report(self) -> str:
+        return (
+            f"decoded:{self.decoded} skipped:{self.skipped}"
+            f" skipped_bytes:{self.skipped_bytes}"
+        )
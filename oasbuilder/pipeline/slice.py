@@ -0,0 +1,118 @@
+import logging
+import typing as t
+from concurrent.futures import ProcessPoolExecutor
+
+from oasbuilder import decoder
+from oasbuilder.parser import OASParser, ParseBudget, SchemaCache
+from oasbuilder.source import SOURCE_FIELDS, iter_sources, request_endpoint_path
+
+from .sample import Pattern, Sample, SampleDeduper
+
+logger = logging.getLogger(__name__)
+
+PartialSamples = t.Dict[Pattern, t.Tuple[int, Sample]]
+
+
+def scan_slice(
+    es_factory: t.Callable[[], t.Any],
+    index: str,
+    pit_id: str,
+    slice_id: int,
+    max_slices: int,
+    batch_size: int = 1_000,
+    json_backend: t.Optional[str] = None,
+    parse_budget: t.Optional[ParseBudget] = None,
+    schema_cache_size: int = 0,
+    stream_threshold: t.Optional[int] = None,
+    query: t.Optional[t.Dict[str, t.Any]] = None,
+) -> PartialSamples:
+    """
+    Scans a slice of the index on a worker process, and returns the first
+    sample per pattern along with its position in the slice
+    """
+    if json_backend:
+        decoder.set_backend(json_backend)
+    if parse_budget:
+        OASParser.budget = parse_budget
+    if schema_cache_size:
+        OASParser.cache = SchemaCache(schema_cache_size)
+    es = es_factory()
+    deduper = SampleDeduper(stream_threshold)
+    samples: PartialSamples = {}
+    for seq, info in enumerate(
+        iter_sources(
+            es,
+            index,
+            query=query,
+            source_fields=["request.path", *SOURCE_FIELDS],
+            batch_size=batch_size,
+            pit_id=pit_id,
+            slice_id=slice_id,
+            max_slices=max_slices,
+        )
+    ):
+        sample = deduper.decode(request_endpoint_path(info), info)
+        if not sample:
+            continue
+        sample.build_schemas()
+        samples[sample.pattern] = (seq, sample)
+    logger.info(f"slice:{slice_id}/{max_slices} {deduper.report()}")
+    return samples
+
+
+def merge_slices(partials: t.Sequence[PartialSamples]) -> t.List[Sample]:
+    """
+    Merges partial samples of each slice deterministically,
+    by keeping the sample seen first in the order of (slice_id, seq)
+    """
+    merged: t.Dict[Pattern, t.Tuple[t.Tuple[int, int], Sample]] = {}
+    for slice_id, partial in enumerate(partials):
+        for pattern, (seq, sample) in partial.items():
+            key = (slice_id, seq)
+            if pattern in merged and merged[pattern][0] <= key:
+                continue
+            merged[pattern] = (key, sample)
+    return [sample for _, sample in sorted(merged.values(), key=lambda x: x[0])]
+
+
+def scan_slices(
+    es: t.Any,
+    es_factory: t.Callable[[], t.Any],
+    index: str,
+    max_slices: int,
+    batch_size: int = 1_000,
+    keep_alive: str = "5m",
+    json_backend: t.Optional[str] = None,
+    parse_budget: t.Optional[ParseBudget] = None,
+    schema_cache_size: int = 0,
+    stream_threshold: t.Optional[int] = None,
+    query: t.Optional[t.Dict[str, t.Any]] = None,
+) -> t.List[Sample]:
+    """
+    Scans the index in `max_slices` slices of a shared point-in-time,
+    each of which is decoded and parsed on a separate worker process
+    """
+    pit_id = es.open_point_in_time(index=index, keep_alive=keep_alive)["id"]
+    try:
+        with ProcessPoolExecutor(max_workers=max_slices) as executor:
+            futures = [
+                executor.submit(
+                    scan_slice,
+                    es_factory,
+                    index,
+                    pit_id,
+                    slice_id,
+                    max_slices,
+                    batch_size,
+                    json_backend,
+                    parse_budget,
+                    schema_cache_size,
+                    stream_threshold,
+                    query,
+                )
+                for slice_id in range(max_slices)
+            ]
+            partials = [f.result() for f in futures]
+    finally:
+        es.close_point_in_time(id=pit_id)
+    return merge_slices(partials)
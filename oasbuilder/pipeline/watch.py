@@ -0,0 +1,71 @@
+import logging
+import time
+import typing as t
+
+logger = logging.getLogger(__name__)
+
+Clock = t.Callable[[], float]
+
+
+class Debouncer:
+    """
+    Holds back the emission of changes until none has come for
+    `quiet` seconds, so that a burst of changes is emitted once
+
+    eg. quiet=60
+        0s: changed -> not ready
+        30s: changed -> not ready
+        90s: -> ready
+    """
+
+    def __init__(self, quiet: float, clock: Clock = time.monotonic) -> None:
+        self.quiet = quiet
+        self.clock = clock
+        self.last_changed: t.Optional[float] = None
+
+    def changed(self) -> None:
+        self.last_changed = self.clock()
+
+    def ready(self) -> bool:
+        return (
+            self.last_changed is not None
+            and self.clock() - self.last_changed >= self.quiet
+        )
+
+    def done(self) -> None:
+        self.last_changed = None
+
+
+def poll_and_emit(
+    poll: t.Callable[[], bool],
+    emit: t.Callable[[], None],
+    interval: float,
+    debouncer: Debouncer,
+    max_polls: t.Optional[int] = None,
+    sleep: t.Callable[[float], None] = time.sleep,
+) -> None:
+    """
+    Calls `poll` every `interval` seconds, which applies the new documents
+    and returns whether anything changed, and `emit` once the changes
+    have settled down
+
+    A failed `poll`, eg. on a transient error of the traffic index,
+    is retried after `interval`, and a failed `emit` after the next poll
+    """
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        try:
+            changed = poll()
+        except Exception:
+            logger.exception("🚨 poll failed, retrying after the interval")
+            changed = False
+        if changed:
+            debouncer.changed()
+        if debouncer.ready():
+            try:
+                emit()
+                debouncer.done()
+            except Exception:
+                logger.exception("🚨 emission failed, retrying after the next poll")
+        polls += 1
+        sleep(interval)
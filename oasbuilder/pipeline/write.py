@@ -0,0 +1,106 @@
+import pathlib
+import typing as t
+
+from oasbuilder.writer import (
+    OASEndpointMethodPatternWriter,
+    OASEndpointMethodWriter,
+    OASEndpointPatternWriter,
+    OASRequestBodySchemaWriter,
+    OASResponseContentWriter,
+    OASResponsePatternWriter,
+    OASResponseSchemaWriter,
+    OASSpec,
+)
+
+from .index import EndpointIndex
+from .sample import Sample
+
+
+def write_schemas(
+    dest_root: pathlib.Path, sample: Sample, spec: t.Optional[OASSpec] = None
+) -> t.List[pathlib.Path]:
+    """
+    Returns the paths of the documents written
+    """
+    writers: t.List[t.Any] = []
+    if sample.request_content:
+        writers.append(
+            OASRequestBodySchemaWriter(
+                dest_root,
+                sample.endpoint_path,
+                sample.method,
+                request_content=sample.request_content,
+                schema=sample.request_schema,
+                spec=spec,
+            )
+        )
+    if sample.has_response_schema:
+        writers.append(
+            OASResponseSchemaWriter(
+                dest_root,
+                sample.endpoint_path,
+                sample.method,
+                sample.status_code,
+                sample.response_content,
+                schema=sample.response_schema,
+                spec=spec,
+            )
+        )
+    for writer in writers:
+        writer.write()
+    return [writer.dest for writer in writers]
+
+
+def write_sample(
+    dest_root: pathlib.Path, sample: Sample, spec: t.Optional[OASSpec] = None
+) -> t.List[pathlib.Path]:
+    """
+    Returns the paths of the documents written
+    """
+    dests = write_schemas(dest_root, sample, spec)
+
+    response_content_writer = OASResponseContentWriter(
+        dest_root,
+        sample.endpoint_path,
+        sample.method,
+        sample.status_code,
+        sample.response_content,
+        has_schema=sample.has_response_schema,
+        spec=spec,
+    )
+    response_content_writer.write()
+
+    method_writer = OASEndpointMethodWriter(
+        dest_root,
+        sample.endpoint_path,
+        sample.method,
+        query=sample.query,
+        request_content=sample.request_content,
+        spec=spec,
+    )
+    method_writer.write()
+    return [*dests, response_content_writer.dest, method_writer.dest]
+
+
+def write_patterns(
+    dest_root: pathlib.Path, index: EndpointIndex, spec: t.Optional[OASSpec] = None
+):
+    """
+    Writes the pattern files of every endpoint once, from the known
+    methods and status codes
+    """
+    for endpoint_path, methods in index.endpoints.items():
+        for method, status_codes in methods.items():
+            OASResponsePatternWriter(
+                dest_root,
+                endpoint_path,
+                method,
+                spec=spec,
+                status_codes=status_codes,
+            ).write()
+        OASEndpointMethodPatternWriter(
+            dest_root, endpoint_path, spec=spec, methods=methods
+        ).write()
+    OASEndpointPatternWriter(
+        dest_root, spec=spec, endpoint_paths=index.endpoints
+    ).write()
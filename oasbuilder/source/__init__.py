@@ -0,0 +1,23 @@
+from .base import (  # noqa
+    Hit,
+    Record,
+    RecordFilter,
+    TrafficSource,
+    is_json_object,
+    request_endpoint_path,
+)
+from .elasticsearch import (  # noqa
+    SOURCE_FIELDS,
+    ElasticsearchSource,
+    fetch_high_water_mark,
+    iter_composite_buckets,
+    iter_representative_sources,
+    iter_request_paths,
+    iter_sources,
+    search_sources,
+    time_range_query,
+)
+from .har import HARSource, entry_record  # noqa
+from .jsonl import JSONLSource  # noqa
+from .mitmproxy import MitmproxySource, flow_record  # noqa
+from .pool import iter_concurrently  # noqa
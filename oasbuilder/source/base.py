@@ -0,0 +1,77 @@
+import collections
+import json
+import typing as t
+from urllib.parse import urlparse
+
+from oasbuilder import decoder
+from oasbuilder.models import HTTPMethod
+
+Record = t.Dict[str, t.Any]
+Hit = t.Tuple[str, Record]
+
+
+class TrafficSource:
+    """
+    Iterates captured traffic as (endpoint path, record) hits,
+    where a record is shaped as a `_source` of the traffic index
+
+    eg.
+        {
+            "request": {
+                "path": "/v1/posts?page=2",
+                "method": "GET",
+                "query": "{\"page\": \"2\"}",
+                "content": "",
+            },
+            "response": {"status_code": 200, "content": "[{\"id\": 1}]"},
+        }
+    """
+
+    def __iter__(self) -> t.Iterator[Hit]:
+        raise NotImplementedError
+
+
+def request_endpoint_path(record: Record) -> str:
+    return urlparse(record["request"]["path"]).path
+
+
+class RecordFilter:
+    """
+    Filters the records of a raw capture which no spec is built from,
+    and counts them
+
+    - a method other than `HTTPMethod`, eg. a CORS `OPTIONS` preflight or
+      `HEAD`, drops the record
+    - a request body other than a JSON object, eg. form-encoded, is blanked,
+      so that the request has no body schema
+    """
+
+    METHODS = frozenset(method.name for method in HTTPMethod)
+
+    def __init__(self) -> None:
+        self.skipped_methods: t.Counter[str] = collections.Counter()
+        self.blanked_contents = 0
+
+    def __call__(self, record: Record) -> t.Optional[Record]:
+        request = record["request"]
+        if request["method"] not in self.METHODS:
+            self.skipped_methods[request["method"]] += 1
+            return None
+        if request["content"] and not is_json_object(request["content"]):
+            request["content"] = ""
+            self.blanked_contents += 1
+        return record
+
+    def report(self) -> str:
+        skipped = ",".join(f"{k}:{v}" for k, v in sorted(self.skipped_methods.items()))
+        return (
+            f"skipped_methods:{skipped or '-'}"
+            f" blanked_request_contents:{self.blanked_contents}"
+        )
+
+
+def is_json_object(raw: str) -> bool:
+    try:
+        return isinstance(decoder.loads(raw), dict)
+    except json.JSONDecodeError:
+        return False
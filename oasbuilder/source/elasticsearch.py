@@ -0,0 +1,353 @@
+import logging
+import typing as t
+from urllib.parse import urlparse
+
+from oasbuilder.utils import parameterized_endpoint_path
+
+from .base import Hit, TrafficSource, request_endpoint_path
+from .pool import iter_concurrently
+
+logger = logging.getLogger(__name__)
+
+PATH_FIELD = "request.path.keyword"
+METHOD_FIELD = "request.method.keyword"
+STATUS_CODE_FIELD = "response.status_code"
+SOURCE_FIELDS = [
+    "request.method",
+    "request.query",
+    "request.content",
+    "response.status_code",
+    "response.content",
+]
+
+
+def iter_composite_buckets(
+    es: t.Any,
+    index: str,
+    sources: t.List[t.Dict[str, t.Any]],
+    page_size: int = 1_000,
+    aggs: t.Optional[t.Dict[str, t.Any]] = None,
+    query: t.Optional[t.Dict[str, t.Any]] = None,
+) -> t.Iterator[t.Dict[str, t.Any]]:
+    """
+    Yields composite aggregation buckets page by page following `after_key`,
+    so that the next page is requested only when the previous one is consumed
+    """
+    after_key = None
+    while True:
+        composite: t.Dict[str, t.Any] = dict(size=page_size, sources=sources)
+        if after_key:
+            composite["after"] = after_key
+        agg: t.Dict[str, t.Any] = dict(composite=composite)
+        if aggs:
+            agg["aggs"] = aggs
+        params: t.Dict[str, t.Any] = dict(index=index, size=0, aggs=dict(pages=agg))
+        if query:
+            params["query"] = query
+        result = es.search(**params)
+        page = result["aggregations"]["pages"]
+        buckets = page["buckets"]
+        yield from buckets
+        after_key = page.get("after_key")
+        if not buckets or not after_key:
+            return
+
+
+def iter_request_paths(
+    es: t.Any,
+    index: str,
+    page_size: int = 1_000,
+    query: t.Optional[t.Dict[str, t.Any]] = None,
+) -> t.Iterator[str]:
+    for bucket in iter_composite_buckets(
+        es,
+        index,
+        sources=[dict(path=dict(terms=dict(field=PATH_FIELD)))],
+        page_size=page_size,
+        query=query,
+    ):
+        yield bucket["key"]["path"]
+
+
+def iter_representative_sources(
+    es: t.Any,
+    index: str,
+    page_size: int = 1_000,
+    method_size: int = 10,
+    status_code_size: int = 100,
+    query: t.Optional[t.Dict[str, t.Any]] = None,
+) -> t.Iterator[t.Tuple[str, t.Dict[str, t.Any]]]:
+    """
+    Yields one representative `_source` per (path, method, status_code)
+    by nested aggregations paginated over the request paths
+
+    eg.
+        pages(composite on request path)
+          └ methods(terms)
+              └ status_codes(terms)
+                  └ sample(top_hits, size=1)
+    """
+    for path_bucket in iter_composite_buckets(
+        es,
+        index,
+        sources=[dict(path=dict(terms=dict(field=PATH_FIELD)))],
+        page_size=page_size,
+        aggs=dict(
+            methods=dict(
+                terms=dict(field=METHOD_FIELD, size=method_size),
+                aggs=dict(
+                    status_codes=dict(
+                        terms=dict(field=STATUS_CODE_FIELD, size=status_code_size),
+                        aggs=dict(
+                            sample=dict(top_hits=dict(size=1, _source=SOURCE_FIELDS))
+                        ),
+                    )
+                ),
+            )
+        ),
+        query=query,
+    ):
+        path = path_bucket["key"]["path"]
+        for method_bucket in path_bucket["methods"]["buckets"]:
+            for status_code_bucket in method_bucket["status_codes"]["buckets"]:
+                hits = status_code_bucket["sample"]["hits"]["hits"]
+                if not hits:
+                    logger.warning(
+                        f"⚠ no sample hit for path:{path}"
+                        f" method:{method_bucket['key']}"
+                        f" status_code:{status_code_bucket['key']}"
+                    )
+                    continue
+                yield path, hits[0]["_source"]
+
+
+def time_range_query(
+    field: str,
+    since: t.Optional[int] = None,
+    until: t.Optional[int] = None,
+) -> t.Optional[t.Dict[str, t.Any]]:
+    """
+    Filters the documents captured in (since, until], as epoch millis
+
+    eg.
+        {"range": {"timestamp": {"gt": 1638316800000, "lte": 1638403200000}}}
+    """
+    bounds: t.Dict[str, t.Any] = {}
+    if since is not None:
+        bounds["gt"] = since
+    if until is not None:
+        bounds["lte"] = until
+    if not bounds:
+        return None
+    return dict(range={field: dict(bounds, format="epoch_millis")})
+
+
+def fetch_high_water_mark(es: t.Any, index: str, field: str) -> t.Optional[int]:
+    """
+    The latest capture timestamp in the index as integer epoch millis,
+    or None if the index has no document
+
+    The `max` aggregation returns a double, eg. 1638316800000.0,
+    which would not round-trip through the manifest as a date bound
+    """
+    result = es.search(
+        index=index, size=0, aggs=dict(watermark=dict(max=dict(field=field)))
+    )
+    value = result["aggregations"]["watermark"]["value"]
+    return None if value is None else int(value)
+
+
+def search_sources(
+    es: t.Any,
+    index: str,
+    query: t.Optional[t.Dict[str, t.Any]] = None,
+    source_fields: t.Optional[t.List[str]] = None,
+    batch_size: int = 1_000,
+) -> t.List[t.Dict[str, t.Any]]:
+    """
+    Returns up to `batch_size` matched `_source`s by a single plain search,
+    without the round trips of opening and closing a point-in-time
+
+    If `batch_size` are returned, there may be more, which `iter_sources()`
+    fetches within a point-in-time
+    """
+    params: t.Dict[str, t.Any] = dict(
+        index=index,
+        size=batch_size,
+        _source=source_fields if source_fields is not None else SOURCE_FIELDS,
+        track_total_hits=False,
+    )
+    if query:
+        params["query"] = query
+    result = es.search(**params)
+    return [hit["_source"] for hit in result["hits"]["hits"]]
+
+
+def iter_sources(
+    es: t.Any,
+    index: str,
+    query: t.Optional[t.Dict[str, t.Any]] = None,
+    source_fields: t.Optional[t.List[str]] = None,
+    batch_size: int = 1_000,
+    keep_alive: str = "1m",
+    pit_id: t.Optional[str] = None,
+    slice_id: t.Optional[int] = None,
+    max_slices: t.Optional[int] = None,
+) -> t.Iterator[t.Dict[str, t.Any]]:
+    """
+    Yields every matched `_source` lazily by `search_after` within a
+    point-in-time, so that only `batch_size` hits are held at once
+
+    A point-in-time opened by the caller can be shared via `pit_id`
+    (eg. across slices), in which case it is left open
+    """
+    if source_fields is None:
+        source_fields = SOURCE_FIELDS
+    owns_pit = pit_id is None
+    if owns_pit:
+        pit_id = es.open_point_in_time(index=index, keep_alive=keep_alive)["id"]
+    try:
+        search_after = None
+        while True:
+            params: t.Dict[str, t.Any] = dict(
+                size=batch_size,
+                pit=dict(id=pit_id, keep_alive=keep_alive),
+                sort=[{"_shard_doc": "asc"}],
+                _source=source_fields,
+            )
+            if query:
+                params["query"] = query
+            if max_slices and max_slices > 1:
+                params["slice"] = dict(id=slice_id, max=max_slices)
+            if search_after:
+                params["search_after"] = search_after
+            result = es.search(**params)
+            pit_id = result.get("pit_id", pit_id)
+            hits = result["hits"]["hits"]
+            for hit in hits:
+                yield hit["_source"]
+            if len(hits) < batch_size:
+                return
+            search_after = hits[-1]["sort"]
+    finally:
+        if owns_pit:
+            es.close_point_in_time(id=pit_id)
+
+
+class ElasticsearchSource(TrafficSource):
+    """
+    Iterates the traffic index stored via mitmproxy-elasticagent
+
+    fetch_mode:
+        search: one query per endpoint path
+        aggregation: one representative hit per (path, method, status_code)
+        scan: a single pass over the whole index
+
+    Every fetch is filtered by `query` if any, eg. `time_range_query()`
+    """
+
+    FETCH_MODES = ("search", "aggregation", "scan")
+
+    def __init__(
+        self,
+        es: t.Any,
+        index: str,
+        fetch_mode: str = "search",
+        page_size: int = 1_000,
+        batch_size: int = 1_000,
+        concurrency: int = 8,
+        query: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> None:
+        if fetch_mode not in self.FETCH_MODES:
+            raise ValueError(f"unknown fetch_mode:{fetch_mode}")
+        self.es = es
+        self.index = index
+        self.fetch_mode = fetch_mode
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.query = query
+
+    def __iter__(self) -> t.Iterator[Hit]:
+        if self.fetch_mode == "aggregation":
+            return self._iter_aggregation_hits()
+        elif self.fetch_mode == "scan":
+            return self._iter_scan_hits()
+        else:
+            return self._iter_search_hits()
+
+    def _group_request_paths(self) -> t.Dict[str, t.List[str]]:
+        """
+        Groups the raw request paths under their parameterized endpoint path,
+        which no document holds as is
+
+        eg.
+            in: ["/v1/posts/1", "/v1/posts/2?x=1", "/v1/users"]
+            out: {
+                "/v1/posts/{post_id}": ["/v1/posts/1", "/v1/posts/2?x=1"],
+                "/v1/users": ["/v1/users"],
+            }
+        """
+        path_query_map: t.Dict[str, t.List[str]] = {}
+        for request_path in iter_request_paths(
+            self.es, self.index, page_size=self.page_size, query=self.query
+        ):
+            path = parameterized_endpoint_path(urlparse(request_path).path)
+            path_query_map.setdefault(path, []).append(request_path)
+        return path_query_map
+
+    def _iter_path_chunks(self) -> t.Iterator[t.Tuple[str, t.List[str]]]:
+        # up to `page_size` raw paths per `terms` query, below the
+        # `index.max_terms_count` of the index
+        for path, request_paths in self._group_request_paths().items():
+            for start in range(0, len(request_paths), self.page_size):
+                yield path, request_paths[start : start + self.page_size]
+
+    def _iter_search_hits(self) -> t.Iterator[Hit]:
+        """
+        Fetches the first batch of every endpoint path on the thread pool,
+        matching the raw request paths grouped under it, so that at most
+        `concurrency` batches are held at once, and pages the rest of a path
+        of more hits lazily as its hits are consumed
+        """
+
+        def fetch(
+            chunk: t.Tuple[str, t.List[str]],
+        ) -> t.Tuple[str, t.Dict[str, t.Any], t.List[t.Dict[str, t.Any]]]:
+            path, request_paths = chunk
+            logger.info(f"path:{path} request_paths:{len(request_paths)}")
+            query: t.Dict[str, t.Any] = dict(terms={PATH_FIELD: request_paths})
+            if self.query:
+                query = dict(bool=dict(filter=[query, self.query]))
+            sources = search_sources(
+                self.es, self.index, query=query, batch_size=self.batch_size
+            )
+            return path, query, sources
+
+        for path, query, sources in iter_concurrently(
+            fetch, self._iter_path_chunks(), self.concurrency
+        ):
+            infos: t.Iterable[t.Dict[str, t.Any]] = sources
+            if len(sources) >= self.batch_size:
+                # a path of more hits than a batch is paged within a point-in-time
+                infos = iter_sources(
+                    self.es, self.index, query=query, batch_size=self.batch_size
+                )
+            for info in infos:
+                yield path, info
+
+    def _iter_aggregation_hits(self) -> t.Iterator[Hit]:
+        for path, info in iter_representative_sources(
+            self.es, self.index, page_size=self.page_size, query=self.query
+        ):
+            yield urlparse(path).path, info
+
+    def _iter_scan_hits(self) -> t.Iterator[Hit]:
+        for info in iter_sources(
+            self.es,
+            self.index,
+            query=self.query,
+            source_fields=["request.path", *SOURCE_FIELDS],
+            batch_size=self.batch_size,
+        ):
+            yield request_endpoint_path(info), info
@@ -0,0 +1,62 @@
+import base64
+import json
+import logging
+import pathlib
+import typing as t
+from urllib.parse import urlparse
+
+from .base import Hit, Record, RecordFilter, TrafficSource, request_endpoint_path
+
+logger = logging.getLogger(__name__)
+
+
+def entry_record(entry: t.Dict[str, t.Any]) -> Record:
+    """
+    Maps a HAR `log.entries` item onto a record shaped as mitmproxy-elasticagent does
+    """
+    request = entry["request"]
+    response = entry["response"]
+    url = urlparse(request["url"])
+    path = url.path + (f"?{url.query}" if url.query else "")
+    query = {q["name"]: q["value"] for q in request.get("queryString", [])}
+    content = response.get("content", {})
+    response_text = content.get("text") or ""
+    if response_text and content.get("encoding") == "base64":
+        response_text = base64.b64decode(response_text).decode("utf-8", "replace")
+    return {
+        "request": {
+            "path": path,
+            "method": request["method"],
+            "query": json.dumps(query),
+            "content": request.get("postData", {}).get("text") or "",
+        },
+        "response": {
+            "status_code": response["status"],
+            "content": response_text,
+        },
+    }
+
+
+class HARSource(TrafficSource):
+    """
+    Streams entries of a HAR archive by an incremental JSON parser,
+    so that the whole document is never loaded at once
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+
+    def __iter__(self) -> t.Iterator[Hit]:
+        import ijson
+
+        record_filter = RecordFilter()
+        with self.path.open("rb") as f:
+            for entry in ijson.items(f, "log.entries.item", use_float=True):
+                if not entry["response"]["status"]:
+                    # blocked or aborted requests are recorded with status 0
+                    continue
+                record = record_filter(entry_record(entry))
+                if record is None:
+                    continue
+                yield request_endpoint_path(record), record
+        logger.info(f"📊 {self.path} {record_filter.report()}")
@@ -0,0 +1,54 @@
+import gzip
+import json
+import logging
+import pathlib
+import typing as t
+
+from oasbuilder import decoder
+
+from .base import Hit, RecordFilter, TrafficSource, request_endpoint_path
+
+logger = logging.getLogger(__name__)
+
+
+class JSONLSource(TrafficSource):
+    """
+    Streams a JSONL/NDJSON dump of captured flows line by line
+    (gzipped if the file name ends with `.gz`)
+
+    Each line is either a record or an exported hit wrapping it in `_source`,
+    filtered by `RecordFilter`
+    eg.
+        {"request": {"path": "/v1/posts", ...}, "response": {...}}
+        {"_index": "flows", "_source": {"request": {...}, "response": {...}}}
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+
+    def __iter__(self) -> t.Iterator[Hit]:
+        record_filter = RecordFilter()
+        with self._open() as f:
+            for lineno, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = decoder.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"⚠ invalid JSON at {self.path}:{lineno}")
+                    continue
+                if isinstance(record, dict):
+                    record = record.get("_source", record)
+                if not isinstance(record, dict):
+                    logger.warning(f"⚠ not a JSON object at {self.path}:{lineno}")
+                    continue
+                record = record_filter(record)
+                if record is None:
+                    continue
+                yield request_endpoint_path(record), record
+        logger.info(f"📊 {self.path} {record_filter.report()}")
+
+    def _open(self) -> t.BinaryIO:
+        if self.path.suffix == ".gz":
+            return t.cast(t.BinaryIO, gzip.open(self.path, "rb"))
+        return self.path.open("rb")
@@ -0,0 +1,52 @@
+import json
+import logging
+import pathlib
+import typing as t
+
+from .base import Hit, Record, RecordFilter, TrafficSource, request_endpoint_path
+
+logger = logging.getLogger(__name__)
+
+
+def flow_record(flow: t.Any) -> Record:
+    """
+    Maps a mitmproxy HTTPFlow onto a record shaped as mitmproxy-elasticagent does
+    """
+    request = flow.request
+    response = flow.response
+    return {
+        "request": {
+            "path": request.path,
+            "method": request.method,
+            "query": json.dumps(dict(request.query.items())),
+            "content": request.get_text(strict=False) or "",
+        },
+        "response": {
+            "status_code": response.status_code,
+            "content": response.get_text(strict=False) or "",
+        },
+    }
+
+
+class MitmproxySource(TrafficSource):
+    """
+    Streams flows of mitmproxy dump files (`mitmdump -w flows.mitm`)
+    one by one, so that the memory does not depend on the capture size
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+
+    def __iter__(self) -> t.Iterator[Hit]:
+        from mitmproxy import http, io
+
+        record_filter = RecordFilter()
+        with self.path.open("rb") as f:
+            for flow in io.FlowReader(f).stream():
+                if not isinstance(flow, http.HTTPFlow) or not flow.response:
+                    continue
+                record = record_filter(flow_record(flow))
+                if record is None:
+                    continue
+                yield request_endpoint_path(record), record
+        logger.info(f"📊 {self.path} {record_filter.report()}")
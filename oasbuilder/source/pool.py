@@ -0,0 +1,25 @@
+import typing as t
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+T = t.TypeVar("T")
+R = t.TypeVar("R")
+
+
+def iter_concurrently(
+    fn: t.Callable[[T], R],
+    items: t.Iterable[T],
+    concurrency: int,
+) -> t.Iterator[R]:
+    """
+    Maps `fn` over `items` on a thread pool keeping at most `concurrency`
+    calls in flight, and yields the results in the order of `items`
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        in_flight: t.Deque[Future] = deque()
+        for item in items:
+            in_flight.append(executor.submit(fn, item))
+            if len(in_flight) >= concurrency:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
@@ -10,3 +10,17 @@ def ensure_dest_exists(f):
         return f(self, *args, **kwargs)
 
     return wrapper
+
+
+def emit_to_spec(f):
+    """
+    Adds the document to `self.spec` instead of writing it, if any
+    """
+
+    @wraps(f)
+    def wrapper(self, *args, **kwargs):
+        if self.spec is None:
+            return f(self, *args, **kwargs)
+        self.spec.add(self.dest, self.build_oas_json())
+
+    return wrapper
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import typing as t
+
+import yaml
+from oasbuilder.types import YAML
+
+try:
+    from yaml import CSafeDumper as _CDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml is not installed
+    from yaml import SafeLoader  # type: ignore
+
+    _CDumper = None  # type: ignore
+
+# libyaml turns longer keys into `? key` at a different length than PyYAML does
+MAX_SIMPLE_KEY_LENGTH = 100
+SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+class NoAliasDumper(yaml.Dumper):
+    """
+    Dumper which writes shared nodes out in full instead of `&id001`/`*id001`
+
+    eg. the sub-schemas shared by `OASParser.cache`
+    """
+
+    def ignore_aliases(self, data: t.Any) -> bool:
+        return True
+
+
+if _CDumper is not None:
+
+    class CNoAliasDumper(_CDumper):  # type: ignore
+        """
+        libyaml counterpart of `NoAliasDumper`
+        """
+
+        def ignore_aliases(self, data: t.Any) -> bool:
+            return True
+
+else:
+    CNoAliasDumper = None  # type: ignore
+
+
+def dump_yaml(data: t.Any) -> YAML:
+    """
+    Dumps with libyaml if it is installed and writes `data` out
+    byte-identical to the pure-Python `NoAliasDumper`, or else with the latter
+    """
+    if CNoAliasDumper is not None and is_c_dumpable(data):
+        return yaml.dump(data, Dumper=CNoAliasDumper)
+    return yaml.dump(data, Dumper=NoAliasDumper)
+
+
+def is_c_dumpable(data: t.Any) -> bool:
+    """
+    Whether libyaml emits `data` the same as PyYAML does, ie. a dict/list
+    of plain JSON values whose strings are printable ASCII
+
+    eg.
+        {"type": "string"} -> True
+        {"name": "café"} -> False(escaped and wrapped differently)
+        "string" -> False(PyYAML ends a scalar document with `...`)
+    """
+    if type(data) is not dict and type(data) is not list:
+        return False
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if type(node) is dict:
+            for k, v in node.items():
+                if type(k) is str:
+                    if not k or len(k) > MAX_SIMPLE_KEY_LENGTH or not _is_plain(k):
+                        return False
+                elif type(k) not in SCALAR_TYPES:
+                    return False
+                stack.append(v)
+        elif type(node) is list:
+            stack.extend(node)
+        elif type(node) is str:
+            if not _is_plain(node):
+                return False
+        elif type(node) not in SCALAR_TYPES:
+            return False
+    return True
+
+
+def _is_plain(s: str) -> bool:
+    return s.isascii() and s.isprintable()
+
+
+def load_yaml(oas_yaml: YAML) -> t.Any:
+    return yaml.load(oas_yaml, Loader=SafeLoader)
+
+
+def dump_json(data: t.Any) -> str:
+    # keys sorted as `yaml.dump` does
+    return json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+
+
+def digest(data: t.Any) -> str:
+    """
+    Hashes the content of a document regardless of the order of its keys,
+    without dumping it to YAML
+    """
+    canonical = json.dumps(
+        data, sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha1(canonical.encode()).hexdigest()
@@ -1,3 +1,11 @@
+from .batch import BatchWriter, list_files, swap_dir, unique_dirs  # noqa
+from .bundle import (  # noqa
+    BUNDLE_EXTENSIONS,
+    BUNDLE_FORMATS,
+    DocumentCache,
+    OASBundleWriter,
+    bundle_document,
+)
 from .endpoint_pattern import OASEndpointPatternWriter  # noqa
 from .index import OASIndexWriter  # noqa
 from .method import OASEndpointMethodWriter  # noqa
@@ -10,3 +18,4 @@ from .response_content import OASResponseContentWriter  # noqa
 from .response_pattern import OASResponsePatternWriter  # noqa
 from .response_schema import OASResponseSchemaWriter  # noqa
 from .schema_index import OASSchemaIndexWriter  # noqa
+from .spec import OASSpec  # noqa
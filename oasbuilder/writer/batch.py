@@ -0,0 +1,114 @@
+import os
+import pathlib
+import shutil
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+
+def unique_dirs(relpaths: t.Iterable[pathlib.Path]) -> t.List[pathlib.Path]:
+    """
+    Returns every directory the files are under, parents first
+
+    eg.
+        in: [paths/v1-posts/get/_index.yml, paths/v1-posts/post/_index.yml]
+        out: [paths, paths/v1-posts, paths/v1-posts/get, paths/v1-posts/post]
+    """
+    dirs: t.Set[pathlib.Path] = set()
+    for relpath in relpaths:
+        dirs.update(p for p in relpath.parents if p != pathlib.Path("."))
+    return sorted(dirs, key=lambda p: (len(p.parts), p))
+
+
+def list_files(root: pathlib.Path) -> t.Set[pathlib.Path]:
+    """
+    Returns the path of every file under `root` relative to it,
+    in a single walk instead of a `stat` per file
+    """
+    files: t.Set[pathlib.Path] = set()
+    for dirpath, _, filenames in os.walk(root):
+        reldir = pathlib.Path(dirpath).relative_to(root)
+        files.update(reldir / filename for filename in filenames)
+    return files
+
+
+class BatchWriter:
+    """
+    Collects the files to write under `dest_root`, and writes them at once,
+    so that each directory is created once rather than per file, and the
+    files are written by `concurrency` threads, eg. on a network filesystem
+
+    The files are staged into a temporary directory next to `dest_root`,
+    so that a failed write leaves `dest_root` as it was
+    """
+
+    def __init__(self, dest_root: pathlib.Path, concurrency: int = 16) -> None:
+        self.dest_root = dest_root
+        self.concurrency = concurrency
+        self.files: t.Dict[pathlib.Path, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def add(self, relpath: pathlib.Path, content: str) -> None:
+        self.files[relpath] = content
+
+    def commit(self, replace: bool = False) -> None:
+        """
+        Moves the staged files into `dest_root`, each replacing its
+        counterpart, or with `replace`, swaps the staging directory
+        with `dest_root` as a whole, eg. so that no file of a former build
+        lingers
+        """
+        # next to `dest_root`, so that it is moved by a rename on the same filesystem
+        staging = self.dest_root.with_name(
+            f".{self.dest_root.name}.staging-{os.getpid()}"
+        )
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        try:
+            make_dirs(staging, self.files)
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                for _ in executor.map(
+                    lambda item: (staging / item[0]).write_text(item[1]),
+                    self.files.items(),
+                ):
+                    pass
+                if replace:
+                    swap_dir(staging, self.dest_root)
+                else:
+                    make_dirs(self.dest_root, self.files)
+                    for _ in executor.map(
+                        lambda relpath: os.replace(
+                            staging / relpath, self.dest_root / relpath
+                        ),
+                        self.files,
+                    ):
+                        pass
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.files = {}
+
+
+def make_dirs(root: pathlib.Path, relpaths: t.Iterable[pathlib.Path]) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    for reldir in unique_dirs(relpaths):
+        (root / reldir).mkdir(exist_ok=True)
+
+
+def swap_dir(src: pathlib.Path, dest: pathlib.Path) -> None:
+    """
+    Renames `src` to `dest`, in place of `dest` if it exists
+
+    Directories cannot be exchanged in a single rename, so `dest` is
+    renamed away first, leaving it missing only between the two renames
+
+    An `old` directory left by a swap which crashed between them is removed
+    """
+    if not dest.exists():
+        src.rename(dest)
+        return
+    old = src.with_name(src.name + ".old")
+    shutil.rmtree(old, ignore_errors=True)
+    dest.rename(old)
+    src.rename(dest)
+    shutil.rmtree(old)
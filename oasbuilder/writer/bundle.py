@@ -0,0 +1,130 @@
+import pathlib
+import posixpath
+import typing as t
+
+from oasbuilder.constants import OAS_REF, TEMPLATE_OAS_REF
+from oasbuilder.utils.serializer import dump_json, dump_yaml, load_yaml
+
+from .spec import OASSpec
+
+BUNDLE_FORMATS = ("yaml", "json")
+BUNDLE_EXTENSIONS = {"yaml": "yml", "json": "json"}
+
+Loader = t.Callable[[pathlib.Path], t.Any]
+
+
+def bundle_document(entry: pathlib.Path, load: Loader) -> t.Any:
+    """
+    Resolves every file `$ref` from the `entry` document into a single
+    document, by inlining the document it refers to, and turns `$$ref`
+    into `$ref`
+
+    eg.
+        index.yml:
+          paths:
+            $ref: paths/_index.yml
+        paths/_index.yml:
+          /v1/posts:
+            $$ref: '#/components/schemas/GetPostsResponse'
+        ->
+          paths:
+            /v1/posts:
+              $ref: '#/components/schemas/GetPostsResponse'
+
+    `load` returns the document of a path relative to the root,
+    which is never mutated
+    """
+    holder: t.Dict[str, t.Any] = {}
+    # (value, dir of the document it belongs to, parent, key in parent)
+    stack: t.List[t.Tuple[t.Any, str, t.Any, t.Any]] = [
+        (load(entry), posixpath.dirname(entry.as_posix()), holder, "root")
+    ]
+    while stack:
+        value, base, parent, key = stack.pop()
+        if type(value) is dict:
+            ref = value.get(OAS_REF)
+            if len(value) == 1 and isinstance(ref, str) and not ref.startswith("#"):
+                path = posixpath.normpath(posixpath.join(base, ref))
+                document = load(pathlib.Path(path))
+                stack.append((document, posixpath.dirname(path), parent, key))
+                continue
+            d: t.Dict[str, t.Any] = {}
+            parent[key] = d
+            for k, v in value.items():
+                if k == TEMPLATE_OAS_REF:
+                    k = OAS_REF
+                d[k] = v
+                if type(v) is dict or type(v) is list:
+                    stack.append((v, base, d, k))
+        elif type(value) is list:
+            items = list(value)
+            parent[key] = items
+            for i, v in enumerate(items):
+                if type(v) is dict or type(v) is list:
+                    stack.append((v, base, items, i))
+        else:
+            parent[key] = value
+    return holder["root"]
+
+
+class DocumentCache:
+    """
+    Documents of the tree under `dest_root`, each parsed once
+    however many times it is referred to
+    """
+
+    def __init__(self, dest_root: pathlib.Path) -> None:
+        self.dest_root = dest_root
+        self.documents: t.Dict[pathlib.Path, t.Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def load(self, relpath: pathlib.Path) -> t.Any:
+        if relpath not in self.documents:
+            oas_yaml = (self.dest_root / relpath).read_text()
+            self.documents[relpath] = load_yaml(oas_yaml)
+        return self.documents[relpath]
+
+
+class OASBundleWriter:
+    """
+    Bundles the documents into a single `bundle.yml`/`bundle.json`,
+    in place of `swagger-cli bundle`
+
+    The documents are taken from the `spec` if any,
+    or else parsed from the tree under `dest_root`
+    """
+
+    def __init__(
+        self,
+        dest_root: pathlib.Path,
+        spec: t.Optional[OASSpec] = None,
+        entry: pathlib.Path = pathlib.Path("index.yml"),
+        format: str = "yaml",
+    ) -> None:
+        self.dest_root = dest_root
+        self.spec = spec
+        self.entry = entry
+        self.format = format
+        self.documents = DocumentCache(dest_root)
+        self.dest = self.dest_root / f"bundle.{BUNDLE_EXTENSIONS[format]}"
+
+    def write(self):
+        self.dest.parent.mkdir(parents=True, exist_ok=True)
+        self.dest.write_text(self._build())
+
+    def _build(self) -> str:
+        oas_json = self.build_oas_json()
+        if self.format == "json":
+            return dump_json(oas_json)
+        return dump_yaml(oas_json)
+
+    def build_oas_json(self) -> t.Dict[str, t.Any]:
+        return bundle_document(self.entry, self._load)
+
+    def _load(self, relpath: pathlib.Path) -> t.Any:
+        dest = self.dest_root / relpath
+        if self.spec is not None and dest in self.spec:
+            return self.spec.get(dest)
+        return self.documents.load(relpath)
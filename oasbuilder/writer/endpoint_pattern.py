@@ -3,9 +3,17 @@ import pathlib
 import re
 import typing as t
 
-import yaml
 from oasbuilder.types import YAML
-from oasbuilder.utils import endpoint_root_dir, to_endpoint_dir, to_endpoint_path
+from oasbuilder.utils import (
+    endpoint_root_dir,
+    parameterized_endpoint_path,
+    to_endpoint_dir,
+    to_endpoint_path,
+)
+from oasbuilder.utils.decorators import emit_to_spec
+from oasbuilder.utils.serializer import dump_yaml
+
+from .spec import OASSpec
 
 logger = logging.getLogger(__name__)
 
@@ -14,31 +22,52 @@ class OASEndpointPatternWriter:
     """
     /pets:
       $ref: "pets/_index.yml"
+
+    The endpoints are discovered from the endpoint dirs,
+    unless the known ones are given as `endpoint_paths`
     """
 
     def __init__(
         self,
         dest_root: pathlib.Path,
+        spec: t.Optional[OASSpec] = None,
+        endpoint_paths: t.Optional[t.Iterable[str]] = None,
     ) -> None:
         self.dest_root = dest_root
+        self.spec = spec
+        self.endpoint_paths = endpoint_paths
         self.dest = self.dest_root / endpoint_root_dir() / "_index.yml"
 
+    @emit_to_spec
     def write(self):
         oas_yaml = self._build()
         self.dest.write_text(oas_yaml)
 
     def _build(self) -> YAML:
-        oas_json = {
-            x: {"$ref": f"{to_endpoint_dir(x)}/_index.yml"}
-            for x in self._find_endpoint_paths()
-        }
-        return yaml.dump(oas_json)
+        return dump_yaml(self.build_oas_json())
+
+    def build_oas_json(self) -> t.Dict[str, t.Any]:
+        if self.endpoint_paths is not None:
+            endpoint_paths: t.Iterable[str] = (
+                parameterized_endpoint_path(x) for x in self.endpoint_paths
+            )
+        else:
+            endpoint_paths = self._find_endpoint_paths()
+        return {x: {"$ref": f"{to_endpoint_dir(x)}/_index.yml"} for x in endpoint_paths}
 
     def _find_endpoint_paths(self) -> t.Iterator[str]:
-        paths = self.dest.parent.glob("*")
+        if self.spec is not None:
+            # the endpoint dirs directly under the root, in order of addition
+            paths: t.Iterable[pathlib.Path] = dict.fromkeys(
+                self.dest.parent / p.relative_to(self.dest.parent).parts[0]
+                for p in self.spec.iter_paths(self.dest.parent)
+                if p.parent != self.dest.parent
+            )
+        else:
+            paths = self.dest.parent.glob("*")
         rex_endpoint_dir = re.compile(r".*/paths/(?P<endpoint_dir>v[0-9]+[\w{}-]+)")
         for p in paths:
-            if p.is_file():
+            if self.spec is None and p.is_file():
                 continue
             result = re.match(rex_endpoint_dir, str(p))
             if not result:
@@ -2,10 +2,13 @@ import pathlib
 import typing as t
 from dataclasses import asdict
 
-import yaml
 from oasbuilder.models import OASIndexInfo, OASServer, OASSpecInfo
 from oasbuilder.types import YAML
 from oasbuilder.utils import endpoint_root_dir
+from oasbuilder.utils.decorators import emit_to_spec
+from oasbuilder.utils.serializer import dump_yaml
+
+from .spec import OASSpec
 
 
 class OASIndexWriter:
@@ -33,8 +36,10 @@ class OASIndexWriter:
         description: str,
         server_urls: t.Optional[t.List[str]] = None,
         components: t.Optional[t.Dict[str, t.Any]] = None,
+        spec: t.Optional[OASSpec] = None,
     ) -> None:
         self.dest_root = dest_root
+        self.spec = spec
         if not server_urls:
             server_urls = []
         if not components:
@@ -48,10 +53,13 @@ class OASIndexWriter:
         )
         self.dest = self.dest_root / "index.yml"
 
+    @emit_to_spec
     def write(self):
         oas_yaml = self._build()
         self.dest.write_text(oas_yaml)
 
     def _build(self) -> YAML:
-        oas_json = asdict(self.info)
-        return yaml.dump(oas_json)
+        return dump_yaml(self.build_oas_json())
+
+    def build_oas_json(self) -> t.Dict[str, t.Any]:
+        return asdict(self.info)
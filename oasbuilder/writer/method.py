@@ -2,7 +2,6 @@ import logging
 import pathlib
 import typing as t
 
-import yaml
 from oasbuilder.constants import TEMPLATE_OAS_REF
 from oasbuilder.models import HTTPMethod, OASParameter, OASParameterSchema, SchemaType
 from oasbuilder.parser import OASParser
@@ -13,7 +12,10 @@ from oasbuilder.utils import (
     build_schema_identifier,
     endpoint_dir,
 )
-from oasbuilder.utils.decorators import ensure_dest_exists
+from oasbuilder.utils.decorators import emit_to_spec, ensure_dest_exists
+from oasbuilder.utils.serializer import dump_yaml
+
+from .spec import OASSpec
 
 logger = logging.getLogger(__name__)
 
@@ -37,12 +39,14 @@ class OASEndpointMethodWriter:
         method: HTTPMethod,
         query: t.Optional[t.Dict[str, t.Any]] = None,
         request_content: t.Optional[t.Dict[str, t.Any]] = None,
+        spec: t.Optional[OASSpec] = None,
     ) -> None:
         self.dest_root = dest_root
         self.endpoint_path = endpoint_path
         self.method = method
         self.query = query
         self.request_content = request_content
+        self.spec = spec
         self.dest = (
             self.dest_root
             / endpoint_dir(self.endpoint_path)
@@ -50,12 +54,16 @@ class OASEndpointMethodWriter:
             / "_index.yml"
         )
 
+    @emit_to_spec
     @ensure_dest_exists
     def write(self):
         oas_yaml = self._build()
         self.dest.write_text(oas_yaml)
 
     def _build(self) -> YAML:
+        return dump_yaml(self.build_oas_json())
+
+    def build_oas_json(self) -> t.Dict[str, t.Any]:
         oas_json: t.Dict[str, t.Any] = {
             "summary": "",
             "operationId": build_operation_id(self.method, self.endpoint_path),
@@ -106,4 +114,4 @@ class OASEndpointMethodWriter:
             )
         if params:
             oas_json["parameters"] = [p.build_oas_json() for p in params]
-        return yaml.dump(oas_json)
+        return oas_json
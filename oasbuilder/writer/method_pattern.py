@@ -2,11 +2,13 @@ import pathlib
 import re
 import typing as t
 
-import yaml
 from oasbuilder.models import HTTPMethod
 from oasbuilder.types import YAML
 from oasbuilder.utils import endpoint_dir
-from oasbuilder.utils.decorators import ensure_dest_exists
+from oasbuilder.utils.decorators import emit_to_spec, ensure_dest_exists
+from oasbuilder.utils.serializer import dump_yaml
+
+from .spec import OASSpec
 
 
 class OASEndpointMethodPatternWriter:
@@ -15,26 +17,39 @@ class OASEndpointMethodPatternWriter:
       $ref: 'get/_index.yml'
     post:
       $ref: 'post/_index.yml'
+
+    The methods are discovered from the response files,
+    unless the known ones are given as `methods`
     """
 
     def __init__(
         self,
         dest_root: pathlib.Path,
         endpoint_path: str,
+        spec: t.Optional[OASSpec] = None,
+        methods: t.Optional[t.Iterable[HTTPMethod]] = None,
     ) -> None:
         self.dest_root = dest_root
         self.endpoint_path = endpoint_path
+        self.spec = spec
+        self.methods = methods
         self.dest = self.dest_root / endpoint_dir(self.endpoint_path) / "_index.yml"
 
+    @emit_to_spec
     @ensure_dest_exists
     def write(self):
         oas_yaml = self._build()
         self.dest.write_text(oas_yaml)
 
     def _build(self) -> YAML:
-        methods = self._find_endpoint_methods()
-        oas_json = {m: {"$ref": f"{m}/_index.yml"} for m in methods}
-        return yaml.dump(oas_json)
+        return dump_yaml(self.build_oas_json())
+
+    def build_oas_json(self) -> t.Dict[str, t.Any]:
+        if self.methods is not None:
+            methods = {m.value for m in self.methods}
+        else:
+            methods = self._find_endpoint_methods()
+        return {m: {"$ref": f"{m}/_index.yml"} for m in methods}
 
     def _find_endpoint_methods(self) -> t.Set[str]:
         rex = re.compile(
@@ -43,7 +58,10 @@ class OASEndpointMethodPatternWriter:
             )
             + r"responses/\d{3}/.*.ya?ml$"
         )
-        paths = self.dest.parent.glob("**/*.yml")
+        if self.spec is not None:
+            paths = self.spec.iter_paths(self.dest.parent)
+        else:
+            paths = self.dest.parent.glob("**/*.yml")
         methods: t.Set[str] = set()
         for p in paths:
             result = re.match(rex, str(p))
@@ -2,12 +2,14 @@ import logging
 import pathlib
 import typing as t
 
-import yaml
 from oasbuilder.models import HTTPMethod
 from oasbuilder.parser import OASParser
 from oasbuilder.types import YAML
 from oasbuilder.utils import endpoint_schema_dir
-from oasbuilder.utils.decorators import ensure_dest_exists
+from oasbuilder.utils.decorators import emit_to_spec, ensure_dest_exists
+from oasbuilder.utils.serializer import dump_yaml
+
+from .spec import OASSpec
 
 logger = logging.getLogger(__name__)
 
@@ -34,11 +36,13 @@ class OASRequestParamsSchemaWriter:
         endpoint_path: str,
         method: HTTPMethod,
         query: t.Dict[str, t.Any],
+        spec: t.Optional[OASSpec] = None,
     ) -> None:
         self.dest_root = dest_root
         self.endpoint_path = endpoint_path
         self.method = method
         self.query = query
+        self.spec = spec
         self.dest = (
             self.dest_root
             / endpoint_schema_dir(self.endpoint_path)
@@ -46,14 +50,17 @@ class OASRequestParamsSchemaWriter:
             / "request_params.yml"
         )
 
+    @emit_to_spec
     @ensure_dest_exists
     def write(self):
         oas_yaml = self._build()
         self.dest.write_text(oas_yaml)
 
     def _build(self) -> YAML:
-        schema = OASParser.parse(self.query)
-        return yaml.dump(schema)
+        return dump_yaml(self.build_oas_json())
+
+    def build_oas_json(self) -> t.Dict[str, t.Any]:
+        return OASParser.parse(self.query)
 
 
 class OASRequestBodySchemaWriter:
@@ -71,11 +78,15 @@ class OASRequestBodySchemaWriter:
         endpoint_path: str,
         method: HTTPMethod,
         request_content: t.Dict[str, t.Any],
+        schema: t.Optional[t.Dict[str, t.Any]] = None,
+        spec: t.Optional[OASSpec] = None,
     ) -> None:
         self.dest_root = dest_root
         self.endpoint_path = endpoint_path
         self.method = method
         self.request_content = request_content
+        self.schema = schema
+        self.spec = spec
         self.dest = (
             self.dest_root
             / endpoint_schema_dir(self.endpoint_path)
@@ -83,12 +94,22 @@ class OASRequestBodySchemaWriter:
             / "request_body.yml"
         )
 
+    @emit_to_spec
     @ensure_dest_exists
     def write(self):
         oas_yaml = self._build()
         self.dest.write_text(oas_yaml)
 
     def _build(self) -> YAML:
-        schema = OASParser.parse(self.request_content)
-        schema["required"] = sorted(list(self.request_content.keys()))
-        return yaml.dump(schema)
+        return dump_yaml(self.build_oas_json())
+
+    def build_oas_json(self) -> t.Dict[str, t.Any]:
+        if self.schema is None:
+            return self.build_schema(self.request_content)
+        return self.schema
+
+    @staticmethod
+    def build_schema(request_content: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+        schema = OASParser.parse(request_content)
+        schema["required"] = sorted(list(request_content.keys()))
+        return schema
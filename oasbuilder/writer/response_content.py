@@ -1,12 +1,14 @@
 import pathlib
 import typing as t
 
-import yaml
 from oasbuilder.constants import TEMPLATE_OAS_REF
 from oasbuilder.models import HTTPMethod, SchemaType
 from oasbuilder.types import YAML
 from oasbuilder.utils import build_schema_identifier, endpoint_dir, response_description
-from oasbuilder.utils.decorators import ensure_dest_exists
+from oasbuilder.utils.decorators import emit_to_spec, ensure_dest_exists
+from oasbuilder.utils.serializer import dump_yaml
+
+from .spec import OASSpec
 
 
 class OASResponseContentWriter:
@@ -31,12 +33,20 @@ class OASResponseContentWriter:
         method: HTTPMethod,
         status_code: int,
         response_content: t.Optional[t.Any],
+        has_schema: t.Optional[bool] = None,
+        spec: t.Optional[OASSpec] = None,
     ) -> None:
         self.dest_root = dest_root
         self.endpoint_path = endpoint_path
         self.method = method
         self.status_code = status_code
         self.response_content = response_content
+        if has_schema is None:
+            has_schema = bool(self.response_content) and isinstance(
+                self.response_content, (dict, list)
+            )
+        self.has_schema = has_schema
+        self.spec = spec
         self.dest = (
             self.dest_root
             / endpoint_dir(self.endpoint_path)
@@ -46,20 +56,21 @@ class OASResponseContentWriter:
             / "_index.yml"
         )
 
+    @emit_to_spec
     @ensure_dest_exists
     def write(self):
         oas_yaml = self._build()
         self.dest.write_text(oas_yaml)
 
     def _build(self) -> YAML:
+        return dump_yaml(self.build_oas_json())
+
+    def build_oas_json(self) -> t.Dict[str, t.Any]:
         description = response_description(self.status_code)
         oas_json: t.Dict[str, t.Any] = {
             "description": description,
         }
-        if self.response_content and (
-            isinstance(self.response_content, dict)
-            or isinstance(self.response_content, list)
-        ):
+        if self.has_schema:
             schema_id = build_schema_identifier(
                 self.method, self.endpoint_path, SchemaType.RESPONSE_BODY
             )
@@ -68,4 +79,4 @@ class OASResponseContentWriter:
                     "schema": {TEMPLATE_OAS_REF: f"#/components/schemas/{schema_id}"}
                 }
             }
-        return yaml.dump(oas_json)
+        return oas_json
@@ -1,17 +1,23 @@
 import pathlib
 import re
+import typing as t
 
-import yaml
 from oasbuilder.models import HTTPMethod
 from oasbuilder.types import YAML
 from oasbuilder.utils import endpoint_dir
-from oasbuilder.utils.decorators import ensure_dest_exists
+from oasbuilder.utils.decorators import emit_to_spec, ensure_dest_exists
+from oasbuilder.utils.serializer import dump_yaml
+
+from .spec import OASSpec
 
 
 class OASResponsePatternWriter:
     """
     '200':
       $ref: '200/_index.yml'
+
+    The status codes are discovered from the response files,
+    unless the known ones are given as `status_codes`
     """
 
     def __init__(
@@ -19,10 +25,14 @@ class OASResponsePatternWriter:
         dest_root: pathlib.Path,
         endpoint_path: str,
         method: HTTPMethod,
+        spec: t.Optional[OASSpec] = None,
+        status_codes: t.Optional[t.Iterable[int]] = None,
     ) -> None:
         self.dest_root = dest_root
         self.endpoint_path = endpoint_path
         self.method = method
+        self.spec = spec
+        self.status_codes = status_codes
 
         self.dest = (
             self.dest_root
@@ -36,7 +46,17 @@ class OASResponsePatternWriter:
         )
 
     def _build(self) -> YAML:
-        paths = self.dest.parent.glob("**/*.yml")
+        return dump_yaml(self.build_oas_json())
+
+    def build_oas_json(self) -> t.Dict[str, t.Any]:
+        if self.status_codes is not None:
+            return {
+                str(s): {"$ref": f"{s}/_index.yml"} for s in sorted(self.status_codes)
+            }
+        if self.spec is not None:
+            paths = self.spec.iter_paths(self.dest.parent)
+        else:
+            paths = self.dest.parent.glob("**/*.yml")
         oas_json = {}
         for p in paths:
             result = re.match(self.rex_status_code, str(p))
@@ -44,8 +64,9 @@ class OASResponsePatternWriter:
                 continue
             status_code = result.group("status_code")
             oas_json[status_code] = {"$ref": f"{status_code}/_index.yml"}
-        return yaml.dump(oas_json)
+        return oas_json
 
+    @emit_to_spec
     @ensure_dest_exists
     def write(self):
         oas_yaml = self._build()
@@ -1,12 +1,18 @@
+import logging
 import pathlib
 import typing as t
 
-import yaml
 from oasbuilder.models import HTTPMethod
 from oasbuilder.parser import OASParser
+from oasbuilder.parser.stream import parse_stream
 from oasbuilder.types import YAML
 from oasbuilder.utils import endpoint_schema_dir
-from oasbuilder.utils.decorators import ensure_dest_exists
+from oasbuilder.utils.decorators import emit_to_spec, ensure_dest_exists
+from oasbuilder.utils.serializer import dump_yaml
+
+from .spec import OASSpec
+
+logger = logging.getLogger(__name__)
 
 
 class OASResponseSchemaWriter:
@@ -17,12 +23,16 @@ class OASResponseSchemaWriter:
         method: HTTPMethod,
         status_code: int,
         response_content: t.Dict[str, t.Any],
+        schema: t.Optional[t.Dict[str, t.Any]] = None,
+        spec: t.Optional[OASSpec] = None,
     ) -> None:
         self.dest_root = dest_root
         self.endpoint_path = endpoint_path
         self.method = method
         self.status_code = status_code
         self.response_content = response_content
+        self.schema = schema
+        self.spec = spec
         self.dest = (
             self.dest_root
             / endpoint_schema_dir(self.endpoint_path)
@@ -32,12 +42,47 @@ class OASResponseSchemaWriter:
             / "_index.yml"
         )
 
+    @emit_to_spec
     @ensure_dest_exists
     def write(self):
         oas_yaml = self._build()
         self.dest.write_text(oas_yaml)
 
     def _build(self) -> YAML:
-        schema = OASParser.parse(self.response_content)
-        schema["required"] = sorted(list(self.response_content.keys()))
-        return yaml.dump(schema)
+        return dump_yaml(self.build_oas_json())
+
+    def build_oas_json(self) -> t.Dict[str, t.Any]:
+        if self.schema is None:
+            return self.build_schema(self.response_content)
+        return self.schema
+
+    @staticmethod
+    def build_schema(response_content: t.Any) -> t.Dict[str, t.Any]:
+        schema = OASParser.parse(response_content)
+        if isinstance(response_content, dict):
+            schema["required"] = sorted(list(response_content.keys()))
+        return schema
+
+    @staticmethod
+    def build_stream_schema(
+        response_content_raw: t.Union[str, bytes],
+    ) -> t.Optional[t.Dict[str, t.Any]]:
+        """
+        Same as `build_schema()`, from the raw content without decoding it
+
+        Returns None for a content without a schema(eg. `{}`, `[]`, `"foo"`)
+        Raises `json.JSONDecodeError` for a non-JSON content
+        """
+        result = parse_stream(response_content_raw)
+        for truncation in result.truncations:
+            logger.warning(
+                f"✂ schema truncated at {truncation.path}: {truncation.reason}"
+            )
+        schema = result.schema
+        if not schema or schema["type"] not in ("object", "array"):
+            return None
+        if result.keys is not None:
+            if not result.keys:
+                return None
+            schema["required"] = sorted(result.keys)
+        return schema
@@ -3,11 +3,14 @@ import pathlib
 import re
 import typing as t
 
-import yaml
 from oasbuilder.models import HTTPMethod, SchemaType
+from oasbuilder.parser.components import extract_components
 from oasbuilder.types import YAML
 from oasbuilder.utils import build_schema_identifier, schema_root_dir, to_endpoint_path
-from oasbuilder.utils.decorators import ensure_dest_exists
+from oasbuilder.utils.decorators import emit_to_spec, ensure_dest_exists
+from oasbuilder.utils.serializer import dump_yaml, load_yaml
+
+from .spec import OASSpec
 
 logger = logging.getLogger(__name__)
 
@@ -43,31 +46,52 @@ class OASSchemaIndexWriter:
       $ref: v1-posts-{post_id}-photos/get/responses/200/_index.yml
     PostPostsRequestBody:
       $ref: v1-posts/post/request_body.yml
+
+    With `extract_components`, sub-schemas repeated across the schemas
+    are hoisted into shared components(see `extract_components()`)
     """
 
     def __init__(
         self,
         dest_root: pathlib.Path,
+        extract_components: bool = False,
+        spec: t.Optional[OASSpec] = None,
     ) -> None:
         self.dest_root = dest_root
+        self.extract_components = extract_components
+        self.spec = spec
         self.dest = self.dest_root / schema_root_dir() / "_index.yml"
 
+    @emit_to_spec
     @ensure_dest_exists
     def write(self):
         oas_yaml = self._build()
         self.dest.write_text(oas_yaml)
 
     def _build(self) -> YAML:
+        return dump_yaml(self.build_oas_json())
+
+    def build_oas_json(self) -> t.Dict[str, t.Any]:
         oas_json = {}
         for schema_id, path in self._extract_schemas():
-            oas_json[schema_id] = yaml.safe_load(path.read_text())
-        return yaml.dump(oas_json)
+            if self.spec is not None:
+                oas_json[schema_id] = self.spec.get(path)
+            else:
+                oas_json[schema_id] = load_yaml(path.read_text())
+        if self.extract_components:
+            oas_json = extract_components(oas_json)
+        return oas_json
 
     def _extract_schemas(
         self,
     ) -> t.Generator[t.Tuple[str, pathlib.Path], None, None]:
-        paths = self.dest.parent.glob("**/*.yml")
+        if self.spec is not None:
+            paths: t.Iterable[pathlib.Path] = self.spec.iter_paths(self.dest.parent)
+        else:
+            paths = self.dest.parent.glob("**/*.yml")
         for path in paths:
+            if path == self.dest:
+                continue
             result = None
             for rex, schema in zip(
                 (REX_REQUEST_PARAMS, REX_REQUEST_BODY, REX_RESPONSE_BODY),
@@ -0,0 +1,142 @@
+import logging
+import pathlib
+import typing as t
+
+from oasbuilder.utils.serializer import digest, dump_yaml
+
+from .batch import BatchWriter, list_files
+
+logger = logging.getLogger(__name__)
+
+
+class OASSpec:
+    """
+    In-memory tree of the spec documents, keyed by their path relative to
+    `dest_root`, which the writers add to and read from instead of the disk
+
+    eg.
+        {
+            "index.yml": {"openapi": "3.0.0", ...},
+            "paths/_index.yml": {"/v1/posts": {"$ref": "v1-posts/_index.yml"}},
+            ...
+        }
+
+    `flush()` writes every document once at the end of the build,
+    from the YAML already dumped along with it if any, eg. by a worker process
+    """
+
+    def __init__(self, dest_root: pathlib.Path) -> None:
+        self.dest_root = dest_root
+        self.documents: t.Dict[pathlib.Path, t.Any] = {}
+        # the YAML of a document as is, dropped once it is replaced
+        self.dumped: t.Dict[pathlib.Path, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __contains__(self, dest: pathlib.Path) -> bool:
+        return self._relpath(dest) in self.documents
+
+    def add(self, dest: pathlib.Path, oas_json: t.Any) -> None:
+        relpath = self._relpath(dest)
+        self.documents[relpath] = oas_json
+        self.dumped.pop(relpath, None)
+
+    def get(self, dest: pathlib.Path) -> t.Any:
+        return self.documents[self._relpath(dest)]
+
+    def update(
+        self,
+        documents: t.Dict[str, t.Any],
+        dumped: t.Optional[t.Dict[str, str]] = None,
+    ) -> None:
+        """
+        Adds the documents keyed by their POSIX path relative to `dest_root`,
+        along with their `dumped` YAML if any
+
+        eg. {"paths/v1-posts/get/_index.yml": {"summary": "", ...}}
+        """
+        for key, oas_json in documents.items():
+            relpath = pathlib.Path(key)
+            self.documents[relpath] = oas_json
+            if dumped is not None and key in dumped:
+                self.dumped[relpath] = dumped[key]
+            else:
+                self.dumped.pop(relpath, None)
+
+    def iter_paths(self, dest_dir: pathlib.Path) -> t.Iterator[pathlib.Path]:
+        """
+        Yields the path of every document under `dest_dir`,
+        like `dest_dir.glob("**/*.yml")` does on the disk
+        """
+        reldir = self._relpath(dest_dir)
+        for relpath in self.documents:
+            if reldir in relpath.parents:
+                yield self.dest_root / relpath
+
+    def flush(
+        self, digests: t.Optional[t.Dict[str, str]] = None, concurrency: int = 16
+    ) -> None:
+        """
+        With the `digests` of the documents last flushed(by relpath),
+        writes only the documents which changed or are missing on the disk,
+        and updates `digests` in place
+
+        Without `digests`, the tree replaces `dest_root` as a whole
+
+        The documents are written by `BatchWriter` with `concurrency` threads
+        """
+        writer = BatchWriter(self.dest_root, concurrency)
+        existing = list_files(self.dest_root) if digests is not None else set()
+        for relpath, oas_json in self.documents.items():
+            if digests is not None:
+                key = relpath.as_posix()
+                content_digest = digest(oas_json)
+                if digests.get(key) == content_digest and relpath in existing:
+                    continue
+                digests[key] = content_digest
+            oas_yaml = self.dumped.get(relpath)
+            writer.add(
+                relpath, oas_yaml if oas_yaml is not None else dump_yaml(oas_json)
+            )
+        # flushed, so that a long-running build does not keep it in memory
+        self.dumped = {}
+        written = len(writer)
+        writer.commit(replace=digests is None)
+        removed = 0
+        if digests is not None:
+            # the documents of a former flush which are no longer in the spec,
+            # eg. of an endpoint with no traffic left
+            for key in set(digests) - {p.as_posix() for p in self.documents}:
+                del digests[key]
+                removed += remove_file(self.dest_root, pathlib.Path(key))
+        logger.info(
+            f"💾 flushed {written} documents into {self.dest_root}"
+            + (
+                f", {len(self) - written} unchanged, {removed} removed"
+                if digests is not None
+                else ""
+            )
+        )
+
+    def _relpath(self, dest: pathlib.Path) -> pathlib.Path:
+        return dest.relative_to(self.dest_root)
+
+
+def remove_file(root: pathlib.Path, relpath: pathlib.Path) -> bool:
+    """
+    Removes the file at `relpath` under `root`, along with the directories
+    it leaves empty, and returns whether it existed
+    """
+    try:
+        (root / relpath).unlink()
+    except FileNotFoundError:
+        return False
+    for reldir in relpath.parents:
+        if reldir == pathlib.Path("."):
+            break
+        try:
+            (root / reldir).rmdir()
+        except OSError:  # not empty
+            break
+    return True
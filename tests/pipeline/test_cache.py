@@ -0,0 +1,159 @@
+import json
+import pathlib
+
+import pytest
+from oasbuilder.models import HTTPMethod
+from oasbuilder.pipeline import (
+    BuildCache,
+    EndpointIndex,
+    SampleMerger,
+    decode_sample,
+    sample_fingerprint,
+)
+from oasbuilder.writer import OASSpec
+
+
+def source(method, status_code, response_content, content=""):
+    return {
+        "request": {"method": method, "query": '{"page": 1}', "content": content},
+        "response": {"status_code": status_code, "content": response_content},
+    }
+
+
+HITS = [
+    ("/v1/posts/1", source("GET", 200, '{"id": 1, "title": "foo"}')),
+    ("/v1/posts/2", source("GET", 404, '{"error": "x"}')),
+    ("/v1/posts", source("POST", 201, '{"id": 101}', content='{"title": "foo"}')),
+]
+
+
+def build(dest_root: pathlib.Path, cache_path: pathlib.Path, hits=HITS):
+    build_cache = BuildCache(cache_path)
+    spec = OASSpec(dest_root)
+    for endpoint_path, info in hits:
+        build_cache.write_sample(dest_root, decode_sample(endpoint_path, info), spec)
+    build_cache.save()
+    return build_cache, spec
+
+
+class TestBuildCache:
+    def test_reuse(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir) / ".build"
+        cache_path = pathlib.Path(tmpdir) / "cache.json"
+        first, first_spec = build(dest_root, cache_path)
+        assert (first.reused, first.rendered) == (0, 3)
+
+        second, second_spec = build(dest_root, cache_path)
+        assert (second.reused, second.rendered) == (3, 0)
+        assert second_spec.documents == first_spec.documents
+
+    def test_render_changed(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir) / ".build"
+        cache_path = pathlib.Path(tmpdir) / "cache.json"
+        build(dest_root, cache_path)
+        hits = [
+            # same shape, other values
+            ("/v1/posts/3", source("GET", 200, '{"title": "bar", "id": 3}')),
+            ("/v1/posts/2", source("GET", 404, '{"error": "x", "code": 1}')),
+        ]
+        build_cache, spec = build(dest_root, cache_path, hits)
+        assert (build_cache.reused, build_cache.rendered) == (1, 1)
+        assert spec.get(
+            dest_root
+            / "components/schemas/v1-posts-{post_id}/get/responses/404/_index.yml"
+        )["properties"] == {"code": {"type": "integer"}, "error": {"type": "string"}}
+
+        # the entries not built this time are dropped
+        assert len(json.loads(cache_path.read_text())["entries"]) == 2
+
+    def test_retain(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir) / ".build"
+        cache_path = pathlib.Path(tmpdir) / "cache.json"
+        _, first_spec = build(dest_root, cache_path)
+
+        build_cache = BuildCache(cache_path)
+        spec = OASSpec(dest_root)
+        index = EndpointIndex()
+        sample = decode_sample(
+            "/v1/posts/3", source("GET", 200, '{"id": 3, "title": "bar", "x": 1}')
+        )
+        index.add(sample)
+        build_cache.write_sample(dest_root, sample, spec)
+        build_cache.retain(dest_root, spec, index)
+        assert (build_cache.rendered, build_cache.retained) == (1, 2)
+        assert spec.documents.keys() == first_spec.documents.keys()
+        assert index.methods("/v1/posts/{post_id}") == {HTTPMethod.GET: {200, 404}}
+        assert index.methods("/v1/posts") == {HTTPMethod.POST: {201}}
+
+        # eg. the double recorded by a former build
+        build_cache.watermark = 2.0  # type: ignore
+        build_cache.save()
+        loaded = BuildCache(cache_path)
+        assert loaded.watermark == 2 and isinstance(loaded.watermark, int)
+        assert len(loaded.entries) == 3
+
+        loaded.reset()
+        assert (loaded.entries, loaded.watermark) == ({}, None)
+
+    def test_in_memory(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir) / ".build"
+        build_cache = BuildCache()
+        spec = OASSpec(dest_root)
+        rendered = [
+            build_cache.write_sample(
+                dest_root, decode_sample(endpoint_path, info), spec
+            )
+            for endpoint_path, info in HITS + HITS[:1]
+        ]
+        # compared with the entries of the polls so far
+        assert rendered == [True, True, True, False]
+        build_cache.save("digest")
+        assert build_cache.bundle == "digest"
+        assert list(pathlib.Path(tmpdir).iterdir()) == []
+
+    def test_merged_samples(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir) / ".build"
+        hits = [
+            ("/v1/posts", source("POST", 201, '{"id": 1}', content='{"title": "x"}')),
+            (
+                "/v1/posts",
+                source("POST", 201, '{"id": 2}', content='{"title": "y", "draft": 1}'),
+            ),
+        ]
+        build_cache = BuildCache()
+        spec = OASSpec(dest_root)
+        for sample in SampleMerger().iter_samples(hits):
+            build_cache.write_sample(dest_root, sample, spec)
+        # the merged schema is not inferred again from the representative
+        assert spec.get(
+            dest_root / "components/schemas/v1-posts/post/request_body.yml"
+        )["properties"] == {"draft": {"type": "integer"}, "title": {"type": "string"}}
+
+    def test_ignore_other_version(self, tmpdir):
+        cache_path = pathlib.Path(tmpdir) / "cache.json"
+        cache_path.write_text(
+            json.dumps({"version": 0, "entries": {}, "digests": {}, "bundle": "x"})
+        )
+        assert BuildCache(cache_path).bundle is None
+
+
+@pytest.mark.parametrize(
+    "a, b, expected",
+    [
+        (source("GET", 200, '{"id": 1}'), source("GET", 200, '{"id": 2}'), True),
+        (source("GET", 200, '{"id": 1}'), source("GET", 200, '{"id": "1"}'), False),
+        (source("GET", 200, "[]"), source("GET", 200, '[{"id": 1}]'), False),
+        (
+            source("POST", 201, "", content='{"title": "foo"}'),
+            source("POST", 201, "", content='{"title": 1}'),
+            False,
+        ),
+    ],
+)
+def test_sample_fingerprint(a, b, expected):
+    samples = [decode_sample("/v1/posts", info) for info in (a, b)]
+    for sample in samples:
+        sample.build_schemas()
+    assert (
+        sample_fingerprint(samples[0]) == sample_fingerprint(samples[1])
+    ) == expected
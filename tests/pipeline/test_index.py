@@ -0,0 +1,50 @@
+import pathlib
+
+import yaml
+from oasbuilder.models import HTTPMethod
+from oasbuilder.pipeline import EndpointIndex, Sample, write_patterns
+from oasbuilder.writer import OASSpec
+
+
+def sample(endpoint_path, method, status_code):
+    return Sample(endpoint_path, method, {}, None, status_code, None)
+
+
+class TestEndpointIndex:
+    def test_add(self):
+        index = EndpointIndex()
+        for s in (
+            sample("/v1/posts/1", HTTPMethod.GET, 200),
+            sample("/v1/posts/2", HTTPMethod.GET, 404),
+            sample("/v1/posts/2", HTTPMethod.DELETE, 204),
+            sample("/v1/posts", HTTPMethod.GET, 200),
+        ):
+            index.add(s)
+        assert len(index) == 2
+        assert index.methods("/v1/posts/{post_id}") == {
+            HTTPMethod.GET: {200, 404},
+            HTTPMethod.DELETE: {204},
+        }
+
+    def test_write_patterns(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir)
+        index = EndpointIndex()
+        index.add(sample("/v1/posts/1", HTTPMethod.GET, 200))
+        index.add(sample("/v1/posts/2", HTTPMethod.GET, 404))
+        spec = OASSpec(dest_root)
+        write_patterns(dest_root, index, spec)
+        spec.flush()
+
+        def load(path):
+            return yaml.safe_load((dest_root / "paths" / path).read_text())
+
+        assert load("_index.yml") == {
+            "/v1/posts/{post_id}": {"$ref": "v1-posts-{post_id}/_index.yml"}
+        }
+        assert load("v1-posts-{post_id}/_index.yml") == {
+            "get": {"$ref": "get/_index.yml"}
+        }
+        assert load("v1-posts-{post_id}/get/responses/_index.yml") == {
+            "200": {"$ref": "200/_index.yml"},
+            "404": {"$ref": "404/_index.yml"},
+        }
@@ -0,0 +1,110 @@
+import json
+
+from oasbuilder.parser import ParseBudget
+from oasbuilder.pipeline import SampleMerger
+
+
+def source(method, status_code, content, request_content="", query="{}"):
+    return {
+        "request": {"method": method, "query": query, "content": request_content},
+        "response": {"status_code": status_code, "content": content},
+    }
+
+
+class TestSampleMerger:
+    def test_iter_samples(self):
+        hits = [
+            ("/v1/posts/1", source("GET", 200, '{"id": 1}', query='{"a": "1"}')),
+            ("/v1/posts/2", source("GET", 200, '{"id": 2, "title": "x"}')),
+            ("/v1/posts/3", source("GET", 200, "<html></html>", query='{"b": 1}')),
+            ("/v1/posts", source("POST", 400, '{"error": "x"}', "{}")),
+            ("/v1/posts", source("POST", 201, '{"id": 3}', '{"title": "x"}')),
+        ]
+        merger = SampleMerger()
+        samples = {s.pattern: s for s in merger.iter_samples(hits)}
+        assert merger.merged == 5
+
+        get = samples[("/v1/posts/{post_id}", "get", 200)]
+        assert get.endpoint_path == "/v1/posts/1"
+        assert get.query == {"a": "1", "b": 1}
+        assert get.request_schema is None
+        assert get.response_schema == {
+            "type": "object",
+            "properties": {"id": {"type": "integer"}, "title": {"type": "string"}},
+            "required": ["id"],
+        }
+
+        request_schema = {
+            "type": "object",
+            "properties": {"title": {"type": "string"}},
+            "required": ["title"],
+        }
+        for status_code in (201, 400):
+            post = samples[("/v1/posts", "post", status_code)]
+            assert post.request_content == {"title": "x"}
+            assert post.request_schema == request_schema
+
+    def test_load_state(self):
+        hits = [
+            ("/v1/posts/1", source("GET", 200, '{"id": 1}', query='{"a": "1"}')),
+            ("/v1/posts", source("POST", 201, '{"id": 3}', '{"title": "x"}')),
+            ("/v1/posts/2", source("GET", 200, '{"id": 2, "title": "x"}')),
+            ("/v1/posts", source("POST", 201, '{"id": 4}', '{"body": "x"}')),
+        ]
+        expected = {s.pattern: s for s in SampleMerger().iter_samples(hits)}
+
+        first = SampleMerger()
+        list(first.iter_samples(hits[:2]))
+        state = json.loads(json.dumps(first.dump_state()))
+        second = SampleMerger()
+        second.load_state(state)
+        samples = {s.pattern: s for s in second.iter_samples(hits[2:])}
+        assert samples.keys() == expected.keys()
+        for pattern, sample in samples.items():
+            assert sample.query == expected[pattern].query
+            assert sample.request_schema == expected[pattern].request_schema
+            assert sample.response_schema == expected[pattern].response_schema
+
+        # only the patterns of the samples added since
+        third = SampleMerger()
+        third.load_state(state)
+        assert [s.pattern for s in third.iter_samples(hits[3:])] == [
+            ("/v1/posts", "post", 201)
+        ]
+
+    def test_iter_samples_again(self):
+        hits = [
+            ("/v1/posts/1", source("GET", 200, '{"id": 1}')),
+            ("/v1/posts/2", source("GET", 404, '{"error": "x"}')),
+            ("/v1/posts", source("POST", 201, '{"id": 3}', '{"title": "x"}')),
+            ("/v1/posts/3", source("GET", 200, '{"id": 3}', query='{"a": 1}')),
+        ]
+        merger = SampleMerger()
+        list(merger.iter_samples(hits[:3]))
+        merger.dump_state()
+        # every pattern of the operation merged into since, as they share its query
+        samples = list(merger.iter_samples(hits[3:]))
+        assert [s.pattern for s in samples] == [
+            ("/v1/posts/{post_id}", "get", 200),
+            ("/v1/posts/{post_id}", "get", 404),
+        ]
+        assert samples[1].query == {"a": 1}
+        assert list(merger.iter_samples([])) == []
+
+        expected = SampleMerger()
+        list(expected.iter_samples(hits))
+        assert merger.dump_state() == expected.dump_state()
+
+    def test_budget(self):
+        hits = [
+            ("/v1/posts/1", source("GET", 200, '{"id": 1, "author": {"id": 1}}')),
+            ("/v1/posts/2", source("GET", 200, '{"id": 2, "tags": [1, "x"]}')),
+        ]
+        merger = SampleMerger(ParseBudget(max_depth=1, max_items=1))
+        [sample] = merger.iter_samples(hits)
+        assert sample.response_schema["properties"] == {
+            "id": {"type": "integer"},
+            "author": {"type": "object", "properties": {}},
+            "tags": {"type": "array", "items": {}},
+        }
+        assert merger.report() == "merged:2 patterns:1 truncated:2"
@@ -0,0 +1,114 @@
+import pathlib
+
+import pytest
+from oasbuilder.pipeline import (
+    BuildCache,
+    SampleDeduper,
+    SampleMerger,
+    decode_sample,
+    dump_samples,
+    load_samples,
+    render_samples,
+    write_sample,
+)
+from oasbuilder.utils.serializer import dump_yaml
+from oasbuilder.writer import OASSpec
+
+
+def source(method, status_code, response_content, content=""):
+    return {
+        "request": {"method": method, "query": '{"page": 1}', "content": content},
+        "response": {"status_code": status_code, "content": response_content},
+    }
+
+
+HITS = [
+    ("/v1/posts/1", source("GET", 200, '{"id": 1, "title": "foo"}')),
+    ("/v1/posts/2", source("GET", 404, '{"error": "x"}')),
+    ("/v1/posts", source("POST", 201, '{"id": 101}', content='{"title": "café"}')),
+    ("/v1/users/1", source("GET", 200, '[{"id": 1, "score": 1.5}]')),
+    ("/v1/users/1", source("DELETE", 204, "")),
+]
+# merged into the request body schema of `POST /v1/posts` with --merge-samples
+MERGED_HITS = [
+    (
+        "/v1/posts",
+        source("POST", 201, '{"id": 102}', content='{"title": "x", "draft": true}'),
+    ),
+]
+
+
+def samples():
+    return [decode_sample(endpoint_path, info) for endpoint_path, info in HITS]
+
+
+class TestRender:
+    def test_dump_samples(self):
+        expected = samples()
+        expected[0].build_schemas()
+        assert load_samples(dump_samples(expected)) == expected
+
+    def test_dump_hits(self):
+        expected = samples()
+        assert load_samples(dump_samples(HITS)) == expected
+
+    @pytest.mark.parametrize(
+        "workers, chunk_size, kind",
+        [
+            (1, 32, "samples"),
+            (2, 1, "samples"),
+            (3, 2, "samples"),
+            (2, 1, "hits"),
+            (2, 1, "merged"),
+        ],
+    )
+    def test_render_samples(self, workers, chunk_size, kind):
+        def iter_samples():
+            if kind == "merged":
+                return SampleMerger().iter_samples(HITS + MERGED_HITS)
+            return samples()
+
+        dest_root = pathlib.Path(".build")
+        expected = OASSpec(dest_root)
+        for sample in iter_samples():
+            write_sample(dest_root, sample, expected)
+        spec = OASSpec(dest_root)
+        patterns = []
+        for pattern, rendered in render_samples(
+            SampleDeduper().iter_hits(HITS) if kind == "hits" else iter_samples(),
+            dest_root,
+            workers,
+            chunk_size=chunk_size,
+            yaml=True,
+        ):
+            patterns.append(pattern)
+            spec.update(rendered["documents"], rendered["yaml"])
+        assert patterns == [sample.pattern for sample in iter_samples()]
+        assert list(spec.documents.items()) == list(expected.documents.items())
+        assert spec.dumped == {
+            relpath: dump_yaml(oas_json) for relpath, oas_json in spec.documents.items()
+        }
+        if kind == "merged":
+            assert spec.get(
+                dest_root / "components/schemas/v1-posts/post/request_body.yml"
+            )["properties"] == {
+                "draft": {"type": "boolean"},
+                "title": {"type": "string"},
+            }
+
+    def test_build_cache(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir) / ".build"
+        expected = BuildCache()
+        expected_spec = OASSpec(dest_root)
+        for sample in samples():
+            expected.write_sample(dest_root, sample, expected_spec)
+        build_cache = BuildCache()
+        spec = OASSpec(dest_root)
+        for pattern, rendered in render_samples(samples(), dest_root, 2, yaml=True):
+            assert build_cache.write_rendered(pattern, spec, rendered)
+        assert build_cache._next_entries == expected._next_entries
+        assert spec.documents == expected_spec.documents
+        assert spec.dumped.keys() == spec.documents.keys()
+        for pattern, rendered in render_samples(samples(), dest_root, 2):
+            assert not build_cache.write_rendered(pattern, spec, rendered)
+        assert build_cache.report() == "reused:5 rendered:5 retained:0"
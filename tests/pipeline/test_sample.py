@@ -0,0 +1,216 @@
+import json
+import tracemalloc
+
+import pytest
+from oasbuilder.models import HTTPMethod
+from oasbuilder.pipeline import SampleDeduper, decode_sample
+
+
+class TestDecodeSample:
+    @pytest.mark.parametrize(
+        ("input", "expected"),
+        [
+            (
+                dict(
+                    endpoint_path="/v1/posts",
+                    _source={
+                        "request": {
+                            "method": "POST",
+                            "query": "{}",
+                            "content": '{"title": "foo"}',
+                        },
+                        "response": {
+                            "status_code": 201,
+                            "content": '{"id": 101, "title": "foo"}',
+                        },
+                    },
+                ),
+                dict(
+                    pattern=("/v1/posts", "post", 201),
+                    query={},
+                    request_content={"title": "foo"},
+                    response_content={"id": 101, "title": "foo"},
+                    request_schema={
+                        "type": "object",
+                        "properties": {"title": {"type": "string"}},
+                        "required": ["title"],
+                    },
+                    response_schema={
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "integer"},
+                            "title": {"type": "string"},
+                        },
+                        "required": ["id", "title"],
+                    },
+                ),
+            ),
+            (
+                dict(
+                    endpoint_path="/v1/posts/1/comments",
+                    _source={
+                        "request": {
+                            "method": "GET",
+                            "query": '{"id": "1"}',
+                            "content": "",
+                        },
+                        "response": {
+                            "status_code": 200,
+                            "content": "<html></html>",
+                        },
+                    },
+                ),
+                dict(
+                    pattern=("/v1/posts/{post_id}/comments", "get", 200),
+                    query={"id": "1"},
+                    request_content=None,
+                    response_content=None,
+                    request_schema=None,
+                    response_schema=None,
+                ),
+            ),
+            (
+                dict(
+                    endpoint_path="/v1/login",
+                    _source={
+                        "request": {
+                            "method": "POST",
+                            "query": "{}",
+                            "content": "user=foo&password=bar",
+                        },
+                        "response": {"status_code": 204, "content": ""},
+                    },
+                ),
+                dict(
+                    pattern=("/v1/login", "post", 204),
+                    query={},
+                    request_content=None,
+                    response_content=None,
+                    request_schema=None,
+                    response_schema=None,
+                ),
+            ),
+        ],
+    )
+    def test_decode_sample(self, input, expected):
+        sample = decode_sample(input["endpoint_path"], input["_source"])
+        assert sample.endpoint_path == input["endpoint_path"]
+        assert sample.method == HTTPMethod[input["_source"]["request"]["method"]]
+        assert sample.pattern == expected["pattern"]
+        assert sample.query == expected["query"]
+        assert sample.request_content == expected["request_content"]
+        assert sample.response_content == expected["response_content"]
+
+        sample.build_schemas()
+        assert sample.request_schema == expected["request_schema"]
+        assert sample.response_schema == expected["response_schema"]
+
+    @pytest.mark.parametrize(
+        ("content", "expected"),
+        [
+            (
+                '{"id": 101, "title": null}',
+                {
+                    "type": "object",
+                    "properties": {"id": {"type": "integer"}},
+                    "required": ["id", "title"],
+                },
+            ),
+            (
+                '[{"id": 1}, {"id": 2}]',
+                {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"id": {"type": "integer"}},
+                    },
+                },
+            ),
+            ("{}", None),
+            ("[]", None),
+            ("<html></html>", None),
+        ],
+    )
+    def test_decode_sample_streamed(self, content, expected):
+        info = {
+            "request": {"method": "GET", "query": "{}", "content": ""},
+            "response": {"status_code": 200, "content": content},
+        }
+        sample = decode_sample("/v1/posts", info, stream_threshold=2)
+        assert sample.response_content is None
+        assert sample.response_schema == expected
+        assert sample.has_response_schema == (expected is not None)
+
+        decoded = decode_sample("/v1/posts", info, stream_threshold=len(content) + 1)
+        decoded.build_schemas()
+        assert decoded.response_schema == expected
+
+    @pytest.mark.parametrize(
+        "content", ['{"title": "café"}', b'{"title": "caf\xc3\xa9"}']
+    )
+    def test_decode_sample_streamed_bytes(self, content):
+        info = {
+            "request": {"method": "GET", "query": "{}", "content": ""},
+            "response": {"status_code": 200, "content": content},
+        }
+        # "é" is 2 bytes once encoded
+        sample = decode_sample("/v1/posts", info, stream_threshold=18)
+        assert sample.response_content is None
+        assert sample.response_schema == {
+            "type": "object",
+            "properties": {"title": {"type": "string"}},
+            "required": ["title"],
+        }
+
+    def test_decode_sample_streamed_memory(self):
+        content = json.dumps([{"id": i, "title": "foo"} for i in range(50_000)])
+
+        def peak(content):
+            info = {
+                "request": {"method": "GET", "query": "{}", "content": ""},
+                "response": {"status_code": 200, "content": content},
+            }
+            tracemalloc.start()
+            try:
+                sample = decode_sample("/v1/posts", info, stream_threshold=1)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            assert sample.response_schema["type"] == "array"
+            return peak
+
+        encoded = content.encode()
+        peak(encoded)  # imports ijson
+        # a str body takes its encoded copy, but no wide-char copy of its own
+        assert peak(content) < peak(encoded) + 1.5 * len(encoded)
+
+
+class TestSampleDeduper:
+    def test_iter_samples(self):
+        def source(method, status_code, content):
+            return {
+                "request": {"method": method, "query": "{}", "content": ""},
+                "response": {"status_code": status_code, "content": content},
+            }
+
+        hits = [
+            ("/v1/posts/1", source("GET", 200, '{"id": 1}')),
+            ("/v1/posts/2", source("GET", 200, "{broken")),
+            ("/v1/posts/2", source("GET", 404, "{}")),
+            ("/v1/posts", source("GET", 200, "[]")),
+        ]
+        deduper = SampleDeduper()
+        samples = list(deduper.iter_samples(hits))
+        assert [s.pattern for s in samples] == [
+            ("/v1/posts/{post_id}", "get", 200),
+            ("/v1/posts/{post_id}", "get", 404),
+            ("/v1/posts", "get", 200),
+        ]
+        assert samples[0].response_content == {"id": 1}
+        assert deduper.decoded == 3
+        assert deduper.skipped == 1
+        assert deduper.skipped_bytes == len("{}") + len("{broken")
+
+        deduper = SampleDeduper()
+        assert list(deduper.iter_hits(hits)) == [hits[0], hits[2], hits[3]]
+        assert (deduper.decoded, deduper.skipped) == (3, 1)
@@ -0,0 +1,72 @@
+import json
+
+from oasbuilder.pipeline import merge_slices, scan_slice
+
+
+def source(path, method="GET", status_code=200, content=None):
+    return {
+        "request": {"path": path, "method": method, "query": "{}", "content": ""},
+        "response": {
+            "status_code": status_code,
+            "content": json.dumps(content) if content is not None else "",
+        },
+    }
+
+
+class FakeElasticsearch:
+    def __init__(self, sources):
+        self.sources = sources
+        self.requests = []
+
+    def search(self, **kwargs):
+        self.requests.append(kwargs)
+        return {
+            "hits": {
+                "hits": [
+                    {"_source": s, "sort": [i]} for i, s in enumerate(self.sources)
+                ]
+            }
+        }
+
+
+class TestScanSlice:
+    def test_scan_slice(self):
+        es = FakeElasticsearch(
+            [
+                source("/v1/posts/1?page=2", content={"id": 1}),
+                source("/v1/posts/2", content={"id": 2, "title": "foo"}),
+                source("/v1/posts", method="POST", status_code=201),
+            ]
+        )
+        partial = scan_slice(lambda: es, "flows", "pit-0", 1, 4)
+        assert list(partial.keys()) == [
+            ("/v1/posts/{post_id}", "get", 200),
+            ("/v1/posts", "post", 201),
+        ]
+        seq, sample = partial[("/v1/posts/{post_id}", "get", 200)]
+        assert seq == 0
+        assert sample.endpoint_path == "/v1/posts/1"
+        assert sample.response_schema == {
+            "type": "object",
+            "properties": {"id": {"type": "integer"}},
+            "required": ["id"],
+        }
+        request = es.requests[0]
+        assert request["pit"]["id"] == "pit-0"
+        assert request["slice"] == {"id": 1, "max": 4}
+
+
+class TestMergeSlices:
+    def test_merge_slices(self):
+        a = source("/v1/posts/1", content={"id": 1})
+        b = source("/v1/posts/2", content={"id": 2})
+        c = source("/v1/users", content={"id": 3})
+        partials = [
+            scan_slice(lambda: FakeElasticsearch([c, b]), "flows", "pit", 0, 2),
+            scan_slice(lambda: FakeElasticsearch([a]), "flows", "pit", 1, 2),
+        ]
+        samples = merge_slices(partials)
+        assert [s.endpoint_path for s in samples] == ["/v1/users", "/v1/posts/2"]
+        assert merge_slices(list(reversed(partials)))[0].endpoint_path == (
+            "/v1/posts/1"
+        )
@@ -0,0 +1,96 @@
+import pytest
+from oasbuilder.pipeline import Debouncer, poll_and_emit
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TestDebouncer:
+    def test_ready(self):
+        clock = FakeClock()
+        debouncer = Debouncer(60, clock=clock)
+        assert not debouncer.ready()
+        debouncer.changed()
+        clock.sleep(30)
+        debouncer.changed()
+        clock.sleep(59)
+        assert not debouncer.ready()
+        clock.sleep(1)
+        assert debouncer.ready()
+        debouncer.done()
+        assert not debouncer.ready()
+
+
+@pytest.mark.parametrize(
+    ("changes", "expected"),
+    [
+        # emitted once the burst of changes has settled down
+        ([True, True, False, False, False, False], [3]),
+        ([True, False, False, True, False, False], [2, 5]),
+        ([False, False, False], []),
+    ],
+)
+def test_poll_and_emit(changes, expected):
+    clock = FakeClock()
+    polls = iter(changes)
+    emitted = []
+    poll_and_emit(
+        lambda: next(polls),
+        lambda: emitted.append(int(clock.now // 10)),
+        10,
+        Debouncer(20, clock=clock),
+        max_polls=len(changes),
+        sleep=clock.sleep,
+    )
+    assert emitted == expected
+
+
+def test_poll_and_emit_retries_failed_emit():
+    clock = FakeClock()
+    polls = iter([True, False, False, False])
+    emitted = []
+
+    def emit():
+        emitted.append(clock.now)
+        if len(emitted) == 1:
+            raise RuntimeError("lint failed")
+
+    poll_and_emit(
+        lambda: next(polls),
+        emit,
+        10,
+        Debouncer(0, clock=clock),
+        max_polls=4,
+        sleep=clock.sleep,
+    )
+    assert emitted == [0, 10]
+
+
+def test_poll_and_emit_retries_failed_poll():
+    clock = FakeClock()
+    polls = iter([ConnectionError("node restarted"), True, False])
+    emitted = []
+
+    def poll():
+        result = next(polls)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    poll_and_emit(
+        poll,
+        lambda: emitted.append(clock.now),
+        10,
+        Debouncer(0, clock=clock),
+        max_polls=3,
+        sleep=clock.sleep,
+    )
+    assert emitted == [10]
@@ -0,0 +1,345 @@
+import logging
+
+import pytest
+from oasbuilder.source import (
+    ElasticsearchSource,
+    fetch_high_water_mark,
+    iter_representative_sources,
+    iter_request_paths,
+    iter_sources,
+    time_range_query,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FakeElasticsearch:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def search(self, **kwargs):
+        self.requests.append(kwargs)
+        return self.responses.pop(0)
+
+    def search_by_kind(self, **kwargs):
+        # aggregations and hits are requested from different threads
+        self.requests.append(kwargs)
+        for i, response in enumerate(self.responses):
+            if ("aggregations" in response) == ("aggs" in kwargs):
+                return self.responses.pop(i)
+
+    def open_point_in_time(self, **kwargs):
+        self.opened_pit = kwargs
+        return {"id": "pit-0"}
+
+    def close_point_in_time(self, **kwargs):
+        self.closed_pit = kwargs
+
+
+def composite_page(buckets, after_key=None):
+    page = {"buckets": buckets}
+    if after_key:
+        page["after_key"] = after_key
+    return {"aggregations": {"pages": page}}
+
+
+def status_code_bucket(status_code, _source):
+    return {
+        "key": status_code,
+        "sample": {"hits": {"hits": [{"_source": _source}] if _source else []}},
+    }
+
+
+class TestIterRequestPaths:
+    @pytest.mark.parametrize(
+        ("responses", "expected"),
+        [
+            (
+                [
+                    composite_page(
+                        [
+                            {"key": {"path": "/v1/posts"}},
+                            {"key": {"path": "/v1/posts/1"}},
+                        ],
+                        after_key={"path": "/v1/posts/1"},
+                    ),
+                    composite_page(
+                        [{"key": {"path": "/v1/users"}}],
+                        after_key={"path": "/v1/users"},
+                    ),
+                    composite_page([]),
+                ],
+                ["/v1/posts", "/v1/posts/1", "/v1/users"],
+            )
+        ],
+    )
+    def test_iter_request_paths(self, responses, expected):
+        es = FakeElasticsearch(responses)
+        assert list(iter_request_paths(es, "flows", page_size=2)) == expected
+        assert [r["aggs"]["pages"]["composite"].get("after") for r in es.requests] == [
+            None,
+            {"path": "/v1/posts/1"},
+            {"path": "/v1/users"},
+        ]
+        assert all(r["aggs"]["pages"]["composite"]["size"] == 2 for r in es.requests)
+
+    def test_pages_lazily(self):
+        es = FakeElasticsearch(
+            [
+                composite_page(
+                    [{"key": {"path": "/v1/posts"}}], after_key={"path": "/v1/posts"}
+                ),
+                composite_page([]),
+            ]
+        )
+        paths = iter_request_paths(es, "flows")
+        assert next(paths) == "/v1/posts"
+        assert len(es.requests) == 1
+
+
+class TestIterRepresentativeSources:
+    @pytest.mark.parametrize(
+        ("responses", "expected"),
+        [
+            (
+                [
+                    composite_page(
+                        [
+                            {
+                                "key": {"path": "/v1/posts"},
+                                "methods": {
+                                    "buckets": [
+                                        {
+                                            "key": "GET",
+                                            "status_codes": {
+                                                "buckets": [
+                                                    status_code_bucket(
+                                                        200, {"id": "a"}
+                                                    ),
+                                                    status_code_bucket(
+                                                        404, {"id": "b"}
+                                                    ),
+                                                ]
+                                            },
+                                        },
+                                        {
+                                            "key": "POST",
+                                            "status_codes": {
+                                                "buckets": [
+                                                    status_code_bucket(201, None),
+                                                ]
+                                            },
+                                        },
+                                    ]
+                                },
+                            }
+                        ],
+                        after_key={"path": "/v1/posts"},
+                    ),
+                    composite_page([]),
+                ],
+                [("/v1/posts", {"id": "a"}), ("/v1/posts", {"id": "b"})],
+            )
+        ],
+    )
+    def test_iter_representative_sources(self, responses, expected):
+        es = FakeElasticsearch(responses)
+        assert list(iter_representative_sources(es, "flows")) == expected
+        assert len(es.requests) == 2
+        request = es.requests[0]
+        assert request["index"] == "flows"
+        assert request["size"] == 0
+        methods = request["aggs"]["pages"]["aggs"]["methods"]
+        status_codes = methods["aggs"]["status_codes"]
+        assert status_codes["aggs"]["sample"]["top_hits"]["size"] == 1
+
+
+def hits_page(sources, pit_id, offset=0):
+    return {
+        "pit_id": pit_id,
+        "hits": {
+            "hits": [
+                {"_source": source, "sort": [offset + i]}
+                for i, source in enumerate(sources)
+            ]
+        },
+    }
+
+
+class TestIterSources:
+    def test_iter_sources(self):
+        es = FakeElasticsearch(
+            [
+                hits_page([{"id": 1}, {"id": 2}], "pit-1"),
+                hits_page([{"id": 3}, {"id": 4}], "pit-2", offset=2),
+                hits_page([{"id": 5}], "pit-3", offset=4),
+            ]
+        )
+        query = dict(term={"request.path.keyword": "/v1/posts"})
+        sources = iter_sources(es, "flows", query=query, batch_size=2)
+        assert [s["id"] for s in sources] == [1, 2, 3, 4, 5]
+        assert es.opened_pit["index"] == "flows"
+        assert [r["pit"]["id"] for r in es.requests] == ["pit-0", "pit-1", "pit-2"]
+        assert [r.get("search_after") for r in es.requests] == [None, [1], [3]]
+        assert all(r["query"] == query for r in es.requests)
+        assert es.closed_pit == {"id": "pit-3"}
+
+    def test_closes_pit_when_abandoned(self):
+        es = FakeElasticsearch([hits_page([{"id": 1}, {"id": 2}], "pit-1")])
+        sources = iter_sources(es, "flows", batch_size=2)
+        assert next(sources) == {"id": 1}
+        sources.close()
+        assert len(es.requests) == 1
+        assert es.closed_pit == {"id": "pit-1"}
+
+
+class TestElasticsearchSource:
+    def test_search_mode(self):
+        es = FakeElasticsearch(
+            [
+                composite_page(
+                    [
+                        {"key": {"path": "/v1/posts?page=2"}},
+                        {"key": {"path": "/v1/posts"}},
+                        {"key": {"path": "/v1/users"}},
+                    ],
+                    after_key={"path": "/v1/users"},
+                ),
+                composite_page([]),
+                hits_page([{"id": 1}], "pit-1"),
+                hits_page([{"id": 2}], "pit-2"),
+            ]
+        )
+        es.search = es.search_by_kind
+        source = ElasticsearchSource(es, "flows", concurrency=2)
+        assert list(source) == [("/v1/posts", {"id": 1}), ("/v1/users", {"id": 2})]
+        assert [r["query"] for r in es.requests if "query" in r] == [
+            {"terms": {"request.path.keyword": ["/v1/posts?page=2", "/v1/posts"]}},
+            {"terms": {"request.path.keyword": ["/v1/users"]}},
+        ]
+        # no point-in-time for the paths which fit in a batch
+        assert not hasattr(es, "opened_pit")
+        assert all("pit" not in r for r in es.requests)
+
+    def test_search_mode_parameterized(self):
+        es = FakeElasticsearch(
+            [
+                composite_page(
+                    [
+                        {"key": {"path": "/v1/posts/42"}},
+                        {"key": {"path": "/v1/posts/7?x=1"}},
+                        {"key": {"path": "/v1/posts/8"}},
+                    ]
+                ),
+                hits_page([{"id": 42}, {"id": 7}], None),
+                hits_page([{"id": 8}], None),
+            ]
+        )
+        es.search = es.search_by_kind
+        source = ElasticsearchSource(es, "flows", page_size=2, concurrency=1)
+        assert list(source) == [
+            ("/v1/posts/{post_id}", {"id": 42}),
+            ("/v1/posts/{post_id}", {"id": 7}),
+            ("/v1/posts/{post_id}", {"id": 8}),
+        ]
+        # the raw paths in chunks of `page_size`
+        assert [r["query"] for r in es.requests if "query" in r] == [
+            {"terms": {"request.path.keyword": ["/v1/posts/42", "/v1/posts/7?x=1"]}},
+            {"terms": {"request.path.keyword": ["/v1/posts/8"]}},
+        ]
+
+    def test_search_mode_paged(self):
+        es = FakeElasticsearch(
+            [
+                composite_page([{"key": {"path": "/v1/posts"}}]),
+                # a full batch, which is fetched again within a point-in-time
+                hits_page([{"id": 1}, {"id": 2}], None),
+                hits_page([{"id": 1}, {"id": 2}], "pit-1"),
+                hits_page([{"id": 3}], "pit-2", offset=2),
+            ]
+        )
+        es.search = es.search_by_kind
+        source = ElasticsearchSource(es, "flows", batch_size=2)
+        hits = iter(source)
+        assert next(hits) == ("/v1/posts", {"id": 1})
+        # the next page is fetched only once the first one is consumed
+        assert len(es.requests) == 3
+        assert [info["id"] for _, info in hits] == [2, 3]
+        assert [r.get("pit", {}).get("id") for r in es.requests[1:]] == [
+            None,
+            "pit-0",
+            "pit-1",
+        ]
+        assert es.closed_pit == {"id": "pit-2"}
+
+    def test_scan_mode(self):
+        info = {"request": {"path": "/v1/posts/1?x=1"}, "response": {}}
+        es = FakeElasticsearch([hits_page([info], "pit-1")])
+        source = ElasticsearchSource(es, "flows", fetch_mode="scan")
+        assert list(source) == [("/v1/posts/1", info)]
+        assert "request.path" in es.requests[0]["_source"]
+
+    def test_search_mode_with_query(self):
+        es = FakeElasticsearch(
+            [
+                composite_page([{"key": {"path": "/v1/posts"}}]),
+                hits_page([{"id": 1}], "pit-1"),
+            ]
+        )
+        es.search = es.search_by_kind
+        query = time_range_query("timestamp", since=1)
+        source = ElasticsearchSource(es, "flows", query=query)
+        assert list(source) == [("/v1/posts", {"id": 1})]
+        assert [r["query"] for r in es.requests] == [
+            query,
+            {
+                "bool": {
+                    "filter": [
+                        {"terms": {"request.path.keyword": ["/v1/posts"]}},
+                        query,
+                    ]
+                }
+            },
+        ]
+
+    @pytest.mark.parametrize("fetch_mode", ["aggregation", "scan"])
+    def test_query(self, fetch_mode):
+        es = FakeElasticsearch([composite_page([]), hits_page([], "pit-1")])
+        es.search = es.search_by_kind
+        query = time_range_query("timestamp", since=1)
+        source = ElasticsearchSource(es, "flows", fetch_mode=fetch_mode, query=query)
+        assert list(source) == []
+        assert es.requests[0]["query"] == query
+
+    def test_unknown_fetch_mode(self):
+        with pytest.raises(ValueError):
+            ElasticsearchSource(FakeElasticsearch([]), "flows", fetch_mode="x")
+
+
+@pytest.mark.parametrize(
+    ("since", "until", "expected"),
+    [
+        (None, None, None),
+        (1, None, {"range": {"timestamp": {"gt": 1, "format": "epoch_millis"}}}),
+        (None, 2, {"range": {"timestamp": {"lte": 2, "format": "epoch_millis"}}}),
+        (
+            1,
+            2,
+            {"range": {"timestamp": {"gt": 1, "lte": 2, "format": "epoch_millis"}}},
+        ),
+    ],
+)
+def test_time_range_query(since, until, expected):
+    assert time_range_query("timestamp", since, until) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected", [(1638316800000.0, 1638316800000), (None, None)]
+)
+def test_fetch_high_water_mark(value, expected):
+    es = FakeElasticsearch([{"aggregations": {"watermark": {"value": value}}}])
+    watermark = fetch_high_water_mark(es, "flows", "timestamp")
+    assert watermark == expected
+    assert type(watermark) is type(expected)
+    assert es.requests[0]["aggs"] == {"watermark": {"max": {"field": "timestamp"}}}
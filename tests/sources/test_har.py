@@ -0,0 +1,170 @@
+import base64
+import json
+import pathlib
+
+import pytest
+from oasbuilder.source import HARSource, RecordFilter, entry_record
+
+
+def entry(
+    url,
+    method="GET",
+    status=200,
+    text="",
+    post_data=None,
+    encoding=None,
+    mime_type="application/json",
+):
+    content = {"size": len(text), "mimeType": "application/json", "text": text}
+    if encoding:
+        content["encoding"] = encoding
+    request = {
+        "method": method,
+        "url": url,
+        "queryString": [
+            {"name": k, "value": v}
+            for k, v in (
+                pair.split("=") for pair in url.partition("?")[2].split("&") if pair
+            )
+        ],
+    }
+    if post_data is not None:
+        request["postData"] = {"mimeType": mime_type, "text": post_data}
+    return {
+        "startedDateTime": "2021-12-01T00:00:00.000Z",
+        "time": 12.5,
+        "request": request,
+        "response": {"status": status, "content": content},
+    }
+
+
+class TestEntryRecord:
+    @pytest.mark.parametrize(
+        ("entry", "expected"),
+        [
+            (
+                entry("https://example.com/v1/posts?page=2", text='[{"id": 1}]'),
+                {
+                    "request": {
+                        "path": "/v1/posts?page=2",
+                        "method": "GET",
+                        "query": '{"page": "2"}',
+                        "content": "",
+                    },
+                    "response": {"status_code": 200, "content": '[{"id": 1}]'},
+                },
+            ),
+            (
+                entry(
+                    "https://example.com/v1/posts",
+                    method="POST",
+                    status=201,
+                    text=base64.b64encode(b'{"id": 101}').decode(),
+                    post_data='{"title": "foo"}',
+                    encoding="base64",
+                ),
+                {
+                    "request": {
+                        "path": "/v1/posts",
+                        "method": "POST",
+                        "query": "{}",
+                        "content": '{"title": "foo"}',
+                    },
+                    "response": {"status_code": 201, "content": '{"id": 101}'},
+                },
+            ),
+        ],
+    )
+    def test_entry_record(self, entry, expected):
+        assert entry_record(entry) == expected
+
+
+class TestHARSource:
+    def test_iter(self, tmpdir):
+        pytest.importorskip("ijson")
+        path = pathlib.Path(tmpdir) / "session.har"
+        path.write_text(
+            json.dumps(
+                {
+                    "log": {
+                        "version": "1.2",
+                        "creator": {"name": "test", "version": "0"},
+                        "entries": [
+                            entry("https://example.com/v1/posts/1", text='{"id": 1}'),
+                            entry("https://example.com/v1/ads", status=0),
+                            entry("https://example.com/v1/users?id=3", text="[]"),
+                        ],
+                    }
+                }
+            )
+        )
+        hits = list(HARSource(path))
+        assert [(p, r["response"]["content"]) for p, r in hits] == [
+            ("/v1/posts/1", '{"id": 1}'),
+            ("/v1/users", "[]"),
+        ]
+
+    def test_iter_unsupported(self, tmpdir):
+        pytest.importorskip("ijson")
+        path = pathlib.Path(tmpdir) / "session.har"
+        path.write_text(
+            json.dumps(
+                {
+                    "log": {
+                        "entries": [
+                            entry("https://example.com/v1/posts", method="OPTIONS"),
+                            entry("https://example.com/v1/posts", method="HEAD"),
+                            entry(
+                                "https://example.com/v1/login",
+                                method="POST",
+                                status=204,
+                                post_data="user=foo&password=bar",
+                                mime_type="application/x-www-form-urlencoded",
+                            ),
+                            entry(
+                                "https://example.com/v1/posts",
+                                method="POST",
+                                status=201,
+                                text='{"id": 101}',
+                                post_data='{"title": "foo"}',
+                            ),
+                        ],
+                    }
+                }
+            )
+        )
+        hits = list(HARSource(path))
+        assert [
+            (p, r["request"]["method"], r["request"]["content"]) for p, r in hits
+        ] == [
+            ("/v1/login", "POST", ""),
+            ("/v1/posts", "POST", '{"title": "foo"}'),
+        ]
+
+
+class TestRecordFilter:
+    @pytest.mark.parametrize(
+        ("method", "content", "expected"),
+        [
+            ("GET", "", ""),
+            ("POST", '{"title": "foo"}', '{"title": "foo"}'),
+            ("POST", "title=foo", ""),
+            ("POST", "[1, 2]", ""),
+            ("OPTIONS", "", None),
+            ("HEAD", "", None),
+        ],
+    )
+    def test_filter(self, method, content, expected):
+        record_filter = RecordFilter()
+        record = record_filter(
+            {
+                "request": {"method": method, "content": content},
+                "response": {"status_code": 200, "content": ""},
+            }
+        )
+        if expected is None:
+            assert record is None
+            assert record_filter.skipped_methods == {method: 1}
+        else:
+            assert record["request"]["content"] == expected
+            assert record_filter.blanked_contents == int(expected != content)
@@ -0,0 +1,71 @@
+import gzip
+import json
+import logging
+import pathlib
+
+import pytest
+from oasbuilder.source import JSONLSource
+
+RECORDS = [
+    {
+        "request": {
+            "path": "/v1/posts/1/comments?id=1",
+            "method": "GET",
+            "query": '{"id": "1"}',
+            "content": "",
+        },
+        "response": {"status_code": 200, "content": '[{"id": 1}]'},
+    },
+    {
+        "request": {
+            "path": "/v1/posts",
+            "method": "POST",
+            "query": "{}",
+            "content": '{"title": "foo"}',
+        },
+        "response": {"status_code": 201, "content": '{"id": 101}'},
+    },
+]
+
+
+class TestJSONLSource:
+    @pytest.mark.parametrize("filename", ["flows.jsonl", "flows.jsonl.gz"])
+    def test_iter(self, filename, tmpdir):
+        path = pathlib.Path(tmpdir) / filename
+        lines = [
+            json.dumps(RECORDS[0]),
+            "",
+            "{broken",
+            "[1, 2]",
+            json.dumps({"_source": "x"}),
+            json.dumps({"_index": "flows", "_source": RECORDS[1]}),
+        ]
+        text = "\n".join(lines) + "\n"
+        if path.suffix == ".gz":
+            path.write_bytes(gzip.compress(text.encode()))
+        else:
+            path.write_text(text)
+
+        assert list(JSONLSource(path)) == [
+            ("/v1/posts/1/comments", RECORDS[0]),
+            ("/v1/posts", RECORDS[1]),
+        ]
+
+    def test_iter_unsupported(self, tmpdir, caplog):
+        path = pathlib.Path(tmpdir) / "flows.jsonl"
+        options = {
+            "request": dict(RECORDS[1]["request"], method="OPTIONS", content=""),
+            "response": {"status_code": 204, "content": ""},
+        }
+        form = {
+            "request": dict(RECORDS[1]["request"], content="title=foo"),
+            "response": RECORDS[1]["response"],
+        }
+        path.write_text("\n".join(json.dumps(r) for r in [options, form]) + "\n")
+
+        with caplog.at_level(logging.INFO):
+            hits = list(JSONLSource(path))
+        assert [
+            (endpoint_path, r["request"]["content"]) for endpoint_path, r in hits
+        ] == [("/v1/posts", "")]
+        assert "skipped_methods:OPTIONS:1 blanked_request_contents:1" in caplog.text
@@ -0,0 +1,75 @@
+import json
+import pathlib
+from types import SimpleNamespace
+
+import pytest
+from oasbuilder.source import MitmproxySource, flow_record
+
+
+class FakeMessage(SimpleNamespace):
+    def get_text(self, strict=True):
+        return self.text
+
+
+class TestFlowRecord:
+    def test_flow_record(self):
+        flow = SimpleNamespace(
+            request=FakeMessage(
+                path="/v1/posts?page=2",
+                method="GET",
+                query={"page": "2"},
+                text=None,
+            ),
+            response=FakeMessage(status_code=200, text='[{"id": 1}]'),
+        )
+        assert flow_record(flow) == {
+            "request": {
+                "path": "/v1/posts?page=2",
+                "method": "GET",
+                "query": '{"page": "2"}',
+                "content": "",
+            },
+            "response": {"status_code": 200, "content": '[{"id": 1}]'},
+        }
+
+
+class TestMitmproxySource:
+    def test_iter(self, tmpdir):
+        io = pytest.importorskip("mitmproxy.io")
+        tflow = pytest.importorskip("mitmproxy.test.tflow")
+
+        path = pathlib.Path(tmpdir) / "flows.mitm"
+        with path.open("wb") as f:
+            writer = io.FlowWriter(f)
+            flow = tflow.tflow(resp=True)
+            flow.request.method = "POST"
+            flow.request.path = "/v1/posts?draft=1"
+            flow.request.text = '{"title": "foo"}'
+            flow.response.status_code = 201
+            flow.response.text = '{"id": 101}'
+            writer.add(flow)
+            writer.add(tflow.tflow(resp=False))
+            writer.add(tflow.ttcpflow())
+            for method in ("OPTIONS", "HEAD"):
+                preflight = tflow.tflow(resp=True)
+                preflight.request.method = method
+                writer.add(preflight)
+            form = tflow.tflow(resp=True)
+            form.request.method = "POST"
+            form.request.path = "/v1/login"
+            form.request.text = "user=foo&password=bar"
+            writer.add(form)
+
+        hits = list(MitmproxySource(path))
+        assert len(hits) == 2
+        endpoint_path, record = hits[0]
+        assert endpoint_path == "/v1/posts"
+        assert record["request"]["method"] == "POST"
+        assert json.loads(record["request"]["query"]) == {"draft": "1"}
+        assert record["request"]["content"] == '{"title": "foo"}'
+        assert record["response"] == {"status_code": 201, "content": '{"id": 101}'}
+
+        # the form-encoded body is blanked
+        endpoint_path, record = hits[1]
+        assert endpoint_path == "/v1/login"
+        assert record["request"]["content"] == ""
@@ -0,0 +1,32 @@
+import threading
+import time
+
+import pytest
+from oasbuilder.source import iter_concurrently
+
+
+class TestIterConcurrently:
+    @pytest.mark.parametrize("concurrency", [1, 3, 8])
+    def test_keeps_order(self, concurrency):
+        def fn(x):
+            time.sleep(0.001 * (10 - x))
+            return x * 2
+
+        results = iter_concurrently(fn, range(10), concurrency)
+        assert list(results) == [x * 2 for x in range(10)]
+
+    def test_bounds_in_flight(self):
+        lock = threading.Lock()
+        state = dict(in_flight=0, peak=0)
+
+        def fn(x):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.005)
+            with lock:
+                state["in_flight"] -= 1
+            return x
+
+        assert list(iter_concurrently(fn, range(20), 4)) == list(range(20))
+        assert 1 < state["peak"] <= 4
@@ -0,0 +1,127 @@
+import copy
+
+import pytest
+from oasbuilder.parser import OASParser, SchemaCache
+from oasbuilder.parser.components import component_name, extract_components
+
+USER = {
+    "type": "object",
+    "properties": {"id": {"type": "integer"}, "name": {"type": "string"}},
+}
+
+
+def ref(name):
+    return {"$$ref": f"#/components/schemas/{name}"}
+
+
+@pytest.mark.parametrize(
+    ("key", "is_item", "expected"),
+    [
+        ("author", False, "Author"),
+        ("user_profile", False, "UserProfile"),
+        ("comments", True, "Comment"),
+        ("2fa", False, "Schema2fa"),
+    ],
+)
+def test_component_name(key, is_item, expected):
+    assert component_name(key, is_item) == expected
+
+
+class TestExtractComponents:
+    @pytest.mark.parametrize(
+        ("schemas", "expected"),
+        [
+            (
+                {
+                    "GetPostResponse": {
+                        "type": "object",
+                        "properties": {"author": USER, "editor": dict(USER)},
+                    },
+                    "GetCommentsResponse": {"type": "array", "items": USER},
+                },
+                {
+                    "Author": USER,
+                    "GetPostResponse": {
+                        "type": "object",
+                        "properties": {
+                            "author": ref("Author"),
+                            "editor": ref("Author"),
+                        },
+                    },
+                    "GetCommentsResponse": {"type": "array", "items": ref("Author")},
+                },
+            ),
+            # appears once
+            (
+                {
+                    "GetPostResponse": {
+                        "type": "object",
+                        "properties": {"author": USER},
+                    },
+                },
+                {
+                    "GetPostResponse": {
+                        "type": "object",
+                        "properties": {"author": USER},
+                    },
+                },
+            ),
+            # name taken by another schema
+            (
+                {
+                    "Author": {"type": "object", "properties": {"author": USER}},
+                    "Book": {"type": "object", "properties": {"author": USER}},
+                },
+                {
+                    "Author": {
+                        "type": "object",
+                        "properties": {"author": ref("Author2")},
+                    },
+                    "Author2": USER,
+                    "Book": {
+                        "type": "object",
+                        "properties": {"author": ref("Author2")},
+                    },
+                },
+            ),
+        ],
+    )
+    def test_extract(self, schemas, expected):
+        original = copy.deepcopy(schemas)
+        assert extract_components(schemas) == expected
+        assert schemas == original
+
+    def test_nested_components_referenced_once_are_inlined(self):
+        post = {
+            "type": "object",
+            "properties": {"title": {"type": "string"}, "author": USER},
+        }
+        schemas = {
+            "GetPostResponse": {"type": "object", "properties": {"post": post}},
+            "GetPostsResponse": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"post": post},
+                },
+            },
+        }
+        result = extract_components(schemas)
+        assert set(result) == {"GetPostResponse", "GetPostsResponse", "Post"}
+        assert result["Post"] == post
+
+    def test_shared_by_cache(self):
+        OASParser.cache = SchemaCache()
+        try:
+            user = {"id": 1, "profile": {"bio": "b", "age": 1}}
+            schema = OASParser.parse({"author": user, "editor": user})
+        finally:
+            OASParser.cache = None
+        original = copy.deepcopy(schema)
+        result = extract_components({"GetPostResponse": schema})
+        assert schema == original
+        assert result["GetPostResponse"]["properties"] == {
+            "author": ref("Author"),
+            "editor": ref("Author"),
+        }
+        assert "Profile" not in result
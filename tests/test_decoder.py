@@ -0,0 +1,45 @@
+import json
+
+import pytest
+from oasbuilder import decoder
+from oasbuilder.decoder import JSONDecoder, get_decoder
+
+
+@pytest.fixture
+def json_backend():
+    yield decoder.set_backend("json")
+    decoder.set_backend(None)
+
+
+class TestDecoder:
+    @pytest.mark.parametrize(
+        ("raw", "expected"),
+        [
+            ('{"id": 1, "tags": ["a"]}', {"id": 1, "tags": ["a"]}),
+            (b'[{"id": 1.5}]', [{"id": 1.5}]),
+            ("", None),
+            (None, None),
+            ("<html></html>", None),
+        ],
+    )
+    def test_loads_or_none(self, raw, expected):
+        assert decoder.loads_or_none(raw) == expected
+
+    def test_loads_raises_json_decode_error(self, json_backend):
+        with pytest.raises(json.JSONDecodeError):
+            decoder.loads("{broken")
+
+    def test_falls_back_to_stdlib(self):
+        def strict_loads(raw):
+            raise ValueError("integer exceeds 64-bit range")
+
+        strict = JSONDecoder("strict", strict_loads, (ValueError,))
+        assert strict.loads('{"id": 18446744073709551616}') == {
+            "id": 18446744073709551616
+        }
+        with pytest.raises(json.JSONDecodeError):
+            strict.loads("{broken")
+
+    def test_get_decoder(self):
+        assert get_decoder("json").name == "json"
+        assert get_decoder().name in decoder.BACKENDS
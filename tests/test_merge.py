@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from oasbuilder.parser import OASParser, ParseBudget, SchemaAccumulator, merge_samples
+
+
+class TestSchemaAccumulator:
+    @pytest.mark.parametrize(
+        "sample",
+        [
+            {"user": {"id": 1, "name": None, "posts": []}},
+            [{"id": 1, "score": 1.5}],
+            {"tags": ["a", "b"], "active": True},
+        ],
+    )
+    def test_single_sample_equals_parse(self, sample):
+        assert merge_samples([sample]) == OASParser.parse(sample)
+
+    @pytest.mark.parametrize(
+        ("samples", "expected"),
+        [
+            (
+                [
+                    {"id": 1, "name": "foo", "deleted_at": None},
+                    {"id": 2, "deleted_at": "2021-12-01", "score": 1},
+                    {"id": 3, "score": 1.5, "name": None},
+                ],
+                {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "name": {"type": "string", "nullable": True},
+                        "deleted_at": {"type": "string", "nullable": True},
+                        "score": {"type": "number", "format": "float"},
+                    },
+                    "required": ["id"],
+                },
+            ),
+            (
+                [
+                    [{"id": 1}, {"id": 2, "title": "foo"}],
+                    [],
+                    [{"id": "3"}],
+                ],
+                {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"oneOf": [{"type": "integer"}, {"type": "string"}]},
+                            "title": {"type": "string"},
+                        },
+                    },
+                },
+            ),
+            ([None, None], None),
+        ],
+    )
+    def test_merge_samples(self, samples, expected):
+        assert merge_samples(samples, required=True) == expected
+
+    def test_merge(self):
+        samples = [{"id": 1, "a": [1]}, {"id": 2, "b": "x"}, {"id": None, "a": []}]
+        left, right = SchemaAccumulator(), SchemaAccumulator()
+        left.add(samples[0])
+        for sample in samples[1:]:
+            right.add(sample)
+        left.merge(right)
+        assert left.build(required=True) == merge_samples(samples, required=True)
+
+    def test_json_round_trip(self):
+        samples = [{"id": 1, "a": [1]}, {"id": 2, "b": "x"}, {"id": None, "a": []}]
+        accumulator = SchemaAccumulator()
+        for sample in samples[:2]:
+            accumulator.add(sample)
+        loaded = SchemaAccumulator.from_json(
+            json.loads(json.dumps(accumulator.to_json()))
+        )
+        loaded.add(samples[2])
+        assert loaded.build(required=True) == merge_samples(samples, required=True)
+
+    def test_deeply_nested(self):
+        sample = current = {}
+        for _ in range(5_000):
+            current["a"] = {}
+            current = current["a"]
+        accumulator = SchemaAccumulator()
+        accumulator.add(sample)
+        loaded = SchemaAccumulator.from_json(accumulator.to_json())
+        loaded.merge(accumulator)
+        schema = loaded.build()
+        depth = 0
+        while schema:
+            schema = schema["properties"].get("a")
+            depth += 1
+        assert depth == 5_001
+
+    @pytest.mark.parametrize(
+        "budget",
+        [
+            ParseBudget(max_depth=1),
+            ParseBudget(max_depth=2, max_properties=1),
+            ParseBudget(max_items=1),
+        ],
+    )
+    def test_budget(self, budget):
+        sample = {"id": 1, "tags": [{"name": "x"}, {"name": "y", "n": 1}], "b": "x"}
+        accumulator = SchemaAccumulator()
+        truncations = accumulator.add(sample, budget)
+        loaded = SchemaAccumulator.from_json(
+            json.loads(json.dumps(accumulator.to_json()))
+        )
+        expected = OASParser.parse_bounded(sample, budget)
+        assert loaded.build() == expected.schema
+        assert truncations == len(expected.truncations)
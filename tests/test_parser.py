@@ -2,7 +2,8 @@ import json
 import logging
 
 import pytest
-from oasbuilder.parser import OASParser
+from oasbuilder.parser import OASParser, ParseBudget, SchemaCache, Truncation
+from oasbuilder.parser.cache import fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -37,3 +38,115 @@ class TestOASParser:
         oas_schema = OASParser.parse(schema_json)
         logger.debug(f"📜oas_schema:\n{json.dumps(oas_schema, indent=2)}")
         assert oas_schema == expected
+
+    def test_parse_deeply_nested(self):
+        schema_json = leaf = {}
+        for _ in range(10_000):
+            leaf["child"] = {}
+            leaf = leaf["child"]
+        oas_schema = OASParser.parse(schema_json)
+        for _ in range(10_000):
+            oas_schema = oas_schema["properties"]["child"]
+        assert oas_schema == {"type": "object", "properties": {}}
+
+    @pytest.mark.parametrize(
+        ("schema_json", "budget", "expected", "truncations"),
+        [
+            (
+                {"user": {"profile": {"bio": "foo"}}, "tags": [["a"]]},
+                ParseBudget(max_depth=1),
+                {
+                    "type": "object",
+                    "properties": {
+                        "user": {"type": "object", "properties": {}},
+                        "tags": {"type": "array", "items": {}},
+                    },
+                },
+                [
+                    Truncation("$.user", "depth exceeds max_depth:1"),
+                    Truncation("$.tags", "depth exceeds max_depth:1"),
+                ],
+            ),
+            (
+                {"a": 1, "b": "x", "c": True},
+                ParseBudget(max_properties=2),
+                {
+                    "type": "object",
+                    "properties": {"a": {"type": "integer"}, "b": {"type": "string"}},
+                },
+                [Truncation("$", "1 properties exceed max_properties:2")],
+            ),
+            (
+                [{"id": 1}, {"id": 2, "title": "foo"}, {"id": 3, "body": "bar"}],
+                ParseBudget(max_items=2),
+                {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "integer"},
+                            "title": {"type": "string"},
+                        },
+                    },
+                },
+                [],
+            ),
+        ],
+    )
+    def test_parse_bounded(self, schema_json, budget, expected, truncations):
+        result = OASParser.parse_bounded(schema_json, budget)
+        assert result.schema == expected
+        assert result.truncations == truncations
+
+
+class TestSchemaCache:
+    @pytest.fixture(autouse=True)
+    def cache(self):
+        OASParser.cache = SchemaCache(maxsize=2)
+        yield OASParser.cache
+        OASParser.cache = None
+
+    def test_fingerprint(self):
+        a = {"id": 1, "name": "foo"}
+        b = {"name": "bar", "id": 2}
+        c = {"id": "1", "name": "foo"}
+        shapes = fingerprint([a, b, c], ParseBudget(max_items=3))
+        assert shapes[id(a)] == shapes[id(b)]
+        assert shapes[id(a)] != shapes[id(c)]
+
+    def test_parse_shared(self, cache):
+        body = {
+            "author": {"id": 1, "name": "foo"},
+            "editor": {"name": "bar", "id": 2},
+        }
+        schema = OASParser.parse(body)
+        properties = schema["properties"]
+        assert properties["author"] is properties["editor"]
+        assert (cache.hits, cache.misses) == (1, 1)
+        OASParser.cache = None
+        assert OASParser.parse(body) == schema
+
+    @pytest.mark.parametrize(
+        "budget",
+        [
+            ParseBudget(),
+            ParseBudget(max_depth=2, max_properties=1, max_items=2),
+        ],
+    )
+    def test_parse_equals_uncached(self, budget):
+        bodies = [
+            {"user": {"id": 1, "tags": [{"k": "v"}], "profile": {"bio": "b"}}},
+            {"items": [{"user": {"id": 1, "tags": [], "profile": {"bio": "b"}}}]},
+            {"items": [{"profile": {"bio": "b"}}, {"tags": [{"k": 1}]}]},
+        ]
+        cached = [OASParser.parse(body, budget) for body in bodies]
+        OASParser.cache = None
+        assert [OASParser.parse(body, budget) for body in bodies] == cached
+
+    def test_lru(self, cache):
+        for key in ("a", "b", "a", "c"):
+            OASParser.parse({"x": {key: 1}})
+        assert len(cache) == 2
+        assert (cache.hits, cache.misses) == (1, 3)
+        OASParser.parse({"x": {"b": 1}})
+        assert cache.misses == 4
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+from oasbuilder.parser import OASParser, ParseBudget, Truncation
+from oasbuilder.parser.stream import parse_stream
+
+
+class TestParseStream:
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"user": {"id": 1, "name": None, "posts": []}},
+            [{"id": 1, "score": 1.5}, {"id": 2, "tags": ["a"]}],
+            {"id": 12345678901234567890, "items": [[], [{"a": True}]]},
+            {"a": {"b": {"c": {"d": 1}}}, "e": [{"f": [1]}], "g": 1, "h": 2},
+            [],
+            "foo",
+        ],
+    )
+    @pytest.mark.parametrize(
+        "budget",
+        [
+            ParseBudget(),
+            ParseBudget(max_items=2),
+            ParseBudget(max_depth=2, max_properties=2),
+            ParseBudget(max_depth=0),
+        ],
+    )
+    def test_equals_parse_bounded(self, body, budget):
+        expected = OASParser.parse_bounded(body, budget)
+        for raw in (json.dumps(body), json.dumps(body).encode()):
+            result = parse_stream(raw, budget)
+            assert result.schema == expected.schema
+            assert result.truncations == expected.truncations
+            assert result.keys == (list(body) if isinstance(body, dict) else None)
+
+    def test_samples_items(self):
+        body = [{"id": i, f"k{i}": i} for i in range(1000)]
+        result = parse_stream(json.dumps(body), ParseBudget(max_items=2))
+        assert result.schema == {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "k0": {"type": "integer"},
+                    "k1": {"type": "integer"},
+                },
+            },
+        }
+
+    def test_truncations(self):
+        body = {"a": 1, "b": {"c": {"d": 1}, "e": 1}, "f": 1}
+        result = parse_stream(json.dumps(body), ParseBudget(2, 2))
+        assert result.truncations == [
+            Truncation("$", "1 properties exceed max_properties:2"),
+            Truncation("$.b.c", "depth exceeds max_depth:2"),
+        ]
+
+    @pytest.mark.parametrize("raw", ["", "{broken", "[1", "1 2"])
+    def test_invalid(self, raw):
+        with pytest.raises(json.JSONDecodeError):
+            parse_stream(raw)
@@ -1,4 +1,5 @@
 import pytest
+import yaml
 from oasbuilder.models import HTTPMethod, SchemaType
 from oasbuilder.utils import (
     build_operation_id,
@@ -7,6 +8,7 @@ from oasbuilder.utils import (
     to_endpoint_dir,
     to_endpoint_path,
 )
+from oasbuilder.utils.serializer import NoAliasDumper, dump_yaml, is_c_dumpable
 
 
 @pytest.mark.parametrize(
@@ -104,3 +106,48 @@ def test_build_operation_id(input, expected):
 )
 def test_build_schema_identifier(input, expected):
     assert build_schema_identifier(*input) == expected
+
+
+def test_dump_yaml_without_aliases():
+    shared = {"type": "integer"}
+    dumped = dump_yaml({"a": shared, "b": shared})
+    assert "&" not in dumped and "*" not in dumped
+    assert dumped == "a:\n  type: integer\nb:\n  type: integer\n"
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ({"type": "string"}, True),
+        ([{"200": {"$$ref": "#/components/schemas/A"}}, 1, 1.5, None], True),
+        ({200: {"description": "OK"}}, True),
+        ({"name": "café"}, False),
+        ({"name": "a\nb"}, False),
+        ({"": 1}, False),
+        ({"k" * 101: 1}, False),
+        ({"k": ("a", "b")}, False),
+        ("string", False),
+    ],
+)
+def test_is_c_dumpable(data, expected):
+    assert is_c_dumpable(data) == expected
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {
+            "openapi": "3.0.0",
+            "paths": {"/v1/posts/{id}": {"$ref": "v1-posts-{id}/_index.yml"}},
+            "responses": {200: {"description": "OK"}, "404": None},
+            "required": ["id", "true", "null", "1.0", "2021-01-01"],
+            "numbers": [1, -1, 1.5, 10**20, float("inf")],
+            "long": "word " * 40,
+            "key: with colon": "'quoted' \"value\"",
+            "k" * 100: [],
+        },
+        {"name": "café", "lines": "a\nb\n", "k" * 200: {}},
+    ],
+)
+def test_dump_yaml_matches_pure_python(data):
+    assert dump_yaml(data) == yaml.dump(data, Dumper=NoAliasDumper)
@@ -0,0 +1,80 @@
+import pathlib
+
+import pytest
+from oasbuilder.writer import BatchWriter, list_files, swap_dir, unique_dirs
+
+P = pathlib.Path
+
+
+class TestBatchWriter:
+    def test_unique_dirs(self):
+        assert unique_dirs(
+            [
+                P("paths/v1-posts/post/_index.yml"),
+                P("paths/v1-posts/get/_index.yml"),
+                P("paths/_index.yml"),
+                P("index.yml"),
+            ]
+        ) == [
+            P("paths"),
+            P("paths/v1-posts"),
+            P("paths/v1-posts/get"),
+            P("paths/v1-posts/post"),
+        ]
+
+    @pytest.mark.parametrize(
+        "replace, expected",
+        [
+            (
+                False,
+                {P("index.yml"), P("stale.yml"), P("paths/v1-posts/get/_index.yml")},
+            ),
+            (True, {P("index.yml"), P("paths/v1-posts/get/_index.yml")}),
+        ],
+    )
+    def test_commit(self, tmpdir, replace, expected):
+        dest_root = pathlib.Path(tmpdir) / ".build"
+        dest_root.mkdir()
+        (dest_root / "index.yml").write_text("old\n")
+        (dest_root / "stale.yml").write_text("stale\n")
+        writer = BatchWriter(dest_root, concurrency=2)
+        writer.add(P("index.yml"), "new\n")
+        writer.add(P("paths/v1-posts/get/_index.yml"), "get\n")
+        writer.commit(replace=replace)
+
+        assert list_files(dest_root) == expected
+        assert (dest_root / "index.yml").read_text() == "new\n"
+        assert (dest_root / "paths/v1-posts/get/_index.yml").read_text() == "get\n"
+        assert len(writer) == 0
+        # the staging directory is gone
+        assert [p.name for p in pathlib.Path(tmpdir).iterdir()] == [".build"]
+
+    def test_commit_failed(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir) / ".build"
+        dest_root.mkdir()
+        (dest_root / "index.yml").write_text("old\n")
+        writer = BatchWriter(dest_root)
+        writer.add(P("index.yml"), "new\n")
+        writer.add(P("paths/_index.yml"), None)  # type: ignore
+        with pytest.raises(TypeError):
+            writer.commit(replace=True)
+
+        assert list_files(dest_root) == {P("index.yml")}
+        assert (dest_root / "index.yml").read_text() == "old\n"
+        assert [p.name for p in pathlib.Path(tmpdir).iterdir()] == [".build"]
+
+    def test_swap_dir_leftover(self, tmpdir):
+        src = pathlib.Path(tmpdir) / ".staging"
+        dest = pathlib.Path(tmpdir) / ".build"
+        for d, content in ((src, "new\n"), (dest, "old\n")):
+            d.mkdir()
+            (d / "index.yml").write_text(content)
+        # left by a swap which crashed between its two renames
+        leftover = src.with_name(src.name + ".old")
+        leftover.mkdir()
+        (leftover / "stale.yml").write_text("stale\n")
+        swap_dir(src, dest)
+
+        assert list_files(dest) == {P("index.yml")}
+        assert (dest / "index.yml").read_text() == "new\n"
+        assert sorted(p.name for p in pathlib.Path(tmpdir).iterdir()) == [".build"]
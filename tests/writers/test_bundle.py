@@ -0,0 +1,103 @@
+import copy
+import json
+import pathlib
+
+import pytest
+import yaml
+from oasbuilder.writer import DocumentCache, OASBundleWriter, OASSpec, bundle_document
+
+DOCUMENTS = {
+    "index.yml": {
+        "openapi": "3.0.0",
+        "paths": {"$ref": "paths/_index.yml"},
+        "components": {"schemas": {"GetPostsResponse": {"type": "array"}}},
+    },
+    "paths/_index.yml": {"/v1/posts": {"$ref": "v1-posts/_index.yml"}},
+    "paths/v1-posts/_index.yml": {"get": {"$ref": "get/_index.yml"}},
+    "paths/v1-posts/get/_index.yml": {
+        "operationId": "getPosts",
+        "responses": {"$ref": "responses/_index.yml"},
+    },
+    "paths/v1-posts/get/responses/_index.yml": {
+        "200": {"$ref": "200/_index.yml"},
+        "404": {"$ref": "../../../errors/404.yml"},
+    },
+    "paths/v1-posts/get/responses/200/_index.yml": {
+        "content": {
+            "application/json": {
+                "schema": {"$$ref": "#/components/schemas/GetPostsResponse"}
+            }
+        },
+    },
+    "paths/errors/404.yml": {"description": "Error response"},
+}
+
+EXPECTED = {
+    "openapi": "3.0.0",
+    "paths": {
+        "/v1/posts": {
+            "get": {
+                "operationId": "getPosts",
+                "responses": {
+                    "200": {
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "$ref": "#/components/schemas/GetPostsResponse"
+                                }
+                            }
+                        },
+                    },
+                    "404": {"description": "Error response"},
+                },
+            }
+        }
+    },
+    "components": {"schemas": {"GetPostsResponse": {"type": "array"}}},
+}
+
+
+def test_bundle_document():
+    documents = {pathlib.Path(k): v for k, v in copy.deepcopy(DOCUMENTS).items()}
+    bundled = bundle_document(pathlib.Path("index.yml"), documents.__getitem__)
+    assert bundled == EXPECTED
+    assert documents == {pathlib.Path(k): v for k, v in DOCUMENTS.items()}
+
+
+class TestOASBundleWriter:
+    @pytest.mark.parametrize(
+        ("format", "path", "load"),
+        [("yaml", "bundle.yml", yaml.safe_load), ("json", "bundle.json", json.loads)],
+    )
+    def test_write(self, format, path, load, tmpdir):
+        dest_root = pathlib.Path(tmpdir)
+        spec = OASSpec(dest_root)
+        for relpath, oas_json in DOCUMENTS.items():
+            spec.add(dest_root / relpath, oas_json)
+        writer = OASBundleWriter(dest_root, spec, format=format)
+        writer.write()
+        assert writer.dest == dest_root / path
+        assert load(writer.dest.read_text()) == EXPECTED
+        assert [p.name for p in dest_root.iterdir()] == [path]
+
+    def test_write_from_tree(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir)
+        spec = OASSpec(dest_root)
+        for relpath, oas_json in DOCUMENTS.items():
+            spec.add(dest_root / relpath, oas_json)
+        spec.flush()
+
+        writer = OASBundleWriter(dest_root)
+        writer.write()
+        assert yaml.safe_load(writer.dest.read_text()) == EXPECTED
+        assert len(writer.documents) == len(DOCUMENTS)
+
+
+def test_document_cache(tmpdir):
+    dest_root = pathlib.Path(tmpdir)
+    (dest_root / "a.yml").write_text("b:\n  $ref: b.yml\n")
+    documents = DocumentCache(dest_root)
+    assert documents.load(pathlib.Path("a.yml")) == {"b": {"$ref": "b.yml"}}
+    (dest_root / "a.yml").unlink()
+    assert documents.load(pathlib.Path("a.yml")) == {"b": {"$ref": "b.yml"}}
+    assert len(documents) == 1
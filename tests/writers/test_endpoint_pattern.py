@@ -49,3 +49,17 @@ class TestOASEndpointPatternWriter:
 
         assert str(writer.dest) == str(dest_root / expected["path"])
         assert yaml.safe_load(writer.dest.read_text()) == expected["yaml"]
+
+    def test_write_endpoint_paths(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir)
+        (dest_root / "paths").mkdir()
+        writer = OASEndpointPatternWriter(
+            dest_root, endpoint_paths=["/v1/posts", "/v1/posts/1/comments"]
+        )
+        writer.write()
+        assert yaml.safe_load(writer.dest.read_text()) == {
+            "/v1/posts": {"$ref": "v1-posts/_index.yml"},
+            "/v1/posts/{post_id}/comments": {
+                "$ref": "v1-posts-{post_id}-comments/_index.yml"
+            },
+        }
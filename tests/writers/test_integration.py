@@ -9,6 +9,7 @@ import yaml
 from oasbuilder.constants import OAS_REF, TEMPLATE_OAS_REF
 from oasbuilder.models import HTTPMethod
 from oasbuilder.writer import (
+    OASBundleWriter,
     OASEndpointMethodPatternWriter,
     OASEndpointMethodWriter,
     OASEndpointPatternWriter,
@@ -22,8 +23,22 @@ from oasbuilder.writer import (
 
 logger = logging.getLogger(__name__)
 
+SWAGGER_CLI = pathlib.Path("./node_modules/.bin/swagger-cli")
+
 
 class TestIntegratedWriters:
+    @pytest.mark.parametrize(
+        "bundler",
+        [
+            "native",
+            pytest.param(
+                "swagger-cli",
+                marks=pytest.mark.skipif(
+                    not SWAGGER_CLI.exists(), reason="swagger-cli is not installed"
+                ),
+            ),
+        ],
+    )
     @pytest.mark.parametrize(
         ("spec", "inputs", "expected"),
         [
@@ -201,7 +216,7 @@ class TestIntegratedWriters:
             )
         ],
     )
-    def test_write(self, spec, inputs, expected, tmpdir):
+    def test_write(self, bundler, spec, inputs, expected, tmpdir):
         #  dest_root = pathlib.Path(tmpdir)
         # debug
         dest_root = pathlib.Path(".test")
@@ -297,22 +312,27 @@ class TestIntegratedWriters:
         ):
             assert str(path) == str(dest_root / exp_path)
 
-        bundle_dest_path = pathlib.Path(".test/bundle.yml")
-        subprocess.run(
-            [
-                "./node_modules/.bin/swagger-cli",
-                "bundle",
-                str(index_writer.dest),
-                "--outfile",
-                str(bundle_dest_path),
-                "--type",
-                "yaml",
-            ],
-            check=True,
-        )
-        raw_oas_yaml = bundle_dest_path.read_text()
-        ref_enabled = raw_oas_yaml.replace(TEMPLATE_OAS_REF, OAS_REF)
-        bundle_dest_path.write_text(ref_enabled)
+        if bundler == "native":
+            bundle_writer = OASBundleWriter(dest_root)
+            bundle_writer.write()
+            bundle_dest_path = bundle_writer.dest
+        else:
+            bundle_dest_path = pathlib.Path(".test/bundle.yml")
+            subprocess.run(
+                [
+                    str(SWAGGER_CLI),
+                    "bundle",
+                    str(index_writer.dest),
+                    "--outfile",
+                    str(bundle_dest_path),
+                    "--type",
+                    "yaml",
+                ],
+                check=True,
+            )
+            raw_oas_yaml = bundle_dest_path.read_text()
+            ref_enabled = raw_oas_yaml.replace(TEMPLATE_OAS_REF, OAS_REF)
+            bundle_dest_path.write_text(ref_enabled)
         subprocess.run(
             [
                 "./node_modules/.bin/spectral",
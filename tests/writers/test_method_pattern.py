@@ -57,3 +57,14 @@ class TestOASEndpointMethodPatternWriter:
 
         assert str(writer.dest) == str(dest_root / expected["path"])
         assert yaml.safe_load(writer.dest.read_text()) == expected["yaml"]
+
+    def test_write_methods(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir)
+        writer = OASEndpointMethodPatternWriter(
+            dest_root, "/v1/posts", methods=[HTTPMethod.POST, HTTPMethod.GET]
+        )
+        writer.write()
+        assert yaml.safe_load(writer.dest.read_text()) == {
+            "get": {"$ref": "get/_index.yml"},
+            "post": {"$ref": "post/_index.yml"},
+        }
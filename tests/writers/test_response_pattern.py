@@ -69,3 +69,14 @@ class TestOASResponsePatternWriter:
 
         assert str(writer.dest) == str(dest_root / expected["path"])
         assert yaml.safe_load(writer.dest.read_text()) == expected["yaml"]
+
+    def test_write_status_codes(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir)
+        writer = OASResponsePatternWriter(
+            dest_root, "/v1/posts/1", HTTPMethod.GET, status_codes={404, 200}
+        )
+        writer.write()
+        assert yaml.safe_load(writer.dest.read_text()) == {
+            "200": {"$ref": "200/_index.yml"},
+            "404": {"$ref": "404/_index.yml"},
+        }
@@ -44,7 +44,36 @@ class TestOASResponseSchemaWriter:
                         "type": "object",
                     },
                 ),
-            )
+            ),
+            (
+                dict(
+                    endpoint_path="/v1/posts",
+                    _source={
+                        "request": {
+                            "method": "GET",
+                            "query": "{}",
+                            "content": "",
+                        },
+                        "response": {
+                            "status_code": 200,
+                            "content": '[{"id": 1, "title": "foo"}]',
+                        },
+                    },
+                ),
+                dict(
+                    path="components/schemas/v1-posts/get/responses/200/_index.yml",
+                    yaml={
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "integer"},
+                                "title": {"type": "string"},
+                            },
+                        },
+                    },
+                ),
+            ),
         ],
     )
     def test_write(self, input, expected, tmpdir):
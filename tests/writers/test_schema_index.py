@@ -81,3 +81,27 @@ class TestOASSchemaIndexWriter:
         logger.debug(yaml.safe_load(writer.dest.read_text()))
         assert str(writer.dest) == str(dest_root / expected["path"])
         assert yaml.safe_load(writer.dest.read_text()) == expected["yaml"]
+
+    def test_write_extract_components(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir)
+        user = {
+            "type": "object",
+            "properties": {"id": {"type": "integer"}, "name": {"type": "string"}},
+        }
+        content = {"type": "object", "properties": {"user": user}}
+        touch_child(dest_root, "v1-posts/post/request_body.yml", content)
+        touch_child(dest_root, "v1-posts/post/responses/201/_index.yml", content)
+
+        writer = OASSchemaIndexWriter(dest_root, extract_components=True)
+        writer.write()
+
+        logger.debug(f"📜yaml:\n{writer.dest.read_text()}")
+        user_ref = {"$$ref": "#/components/schemas/User"}
+        assert yaml.safe_load(writer.dest.read_text()) == {
+            "PostPostsRequestBody": {
+                "type": "object",
+                "properties": {"user": user_ref},
+            },
+            "PostPostsResponse": {"type": "object", "properties": {"user": user_ref}},
+            "User": user,
+        }
@@ -0,0 +1,158 @@
+import pathlib
+
+import pytest
+import yaml
+from oasbuilder.pipeline import (
+    EndpointIndex,
+    decode_sample,
+    write_patterns,
+    write_sample,
+)
+from oasbuilder.writer import (
+    OASIndexWriter,
+    OASSchemaIndexWriter,
+    OASSpec,
+)
+
+
+def source(method, query, content, status_code, response_content):
+    return {
+        "request": {"method": method, "query": query, "content": content},
+        "response": {"status_code": status_code, "content": response_content},
+    }
+
+
+HITS = [
+    ("/v1/posts/1/comments", source("GET", '{"id": "1"}', "", 200, '{"id": 1}')),
+    ("/v1/posts/2", source("GET", "{}", "", 404, '{"error": "x"}')),
+    ("/v1/posts", source("POST", "{}", '{"title": "foo"}', 201, '{"id": 101}')),
+    ("/v1/posts", source("GET", "{}", "", 200, '[{"id": 1, "title": "foo"}]')),
+]
+
+
+def build(dest_root: pathlib.Path, spec=None):
+    index = EndpointIndex()
+    for endpoint_path, info in HITS:
+        sample = decode_sample(endpoint_path, info)
+        index.add(sample)
+        write_sample(dest_root, sample, spec)
+    write_patterns(dest_root, index, spec)
+    schema_index_writer = OASSchemaIndexWriter(dest_root, spec=spec)
+    schema_index_writer.write()
+    if spec is not None:
+        schemas = spec.get(schema_index_writer.dest)
+    else:
+        schemas = yaml.safe_load(schema_index_writer.dest.read_text())
+    OASIndexWriter(
+        dest_root,
+        openapi_version="3.0.0",
+        version="0.0.1",
+        title="test api",
+        description="test description",
+        components={"schemas": schemas},
+        spec=spec,
+    ).write()
+
+
+def load_tree(dest_root: pathlib.Path):
+    return {
+        str(p.relative_to(dest_root)): yaml.safe_load(p.read_text())
+        for p in dest_root.glob("**/*.yml")
+    }
+
+
+class TestOASSpec:
+    def test_build_equals_disk(self, tmpdir):
+        disk_root = pathlib.Path(tmpdir) / "disk"
+        build(disk_root)
+
+        spec_root = pathlib.Path(tmpdir) / "spec"
+        spec = OASSpec(spec_root)
+        build(spec_root, spec)
+        assert not spec_root.exists()
+        spec.flush()
+
+        assert load_tree(spec_root) == load_tree(disk_root)
+        assert len(spec) == len(load_tree(disk_root))
+
+    def test_iter_paths(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir)
+        spec = OASSpec(dest_root)
+        for path in ("paths/_index.yml", "paths/v1-posts/get/_index.yml", "index.yml"):
+            spec.add(dest_root / path, {})
+        assert list(spec.iter_paths(dest_root / "paths")) == [
+            dest_root / "paths/_index.yml",
+            dest_root / "paths/v1-posts/get/_index.yml",
+        ]
+        assert dest_root / "index.yml" in spec
+        with pytest.raises(KeyError):
+            spec.get(dest_root / "paths/v1-posts/_index.yml")
+
+    def test_flush_changed(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir)
+        spec = OASSpec(dest_root)
+        build(dest_root, spec)
+        digests = {}
+        spec.flush(digests)
+        assert len(digests) == len(spec)
+
+        unchanged = dest_root / "paths/_index.yml"
+        unchanged.write_text("# not rewritten\n")
+        missing = dest_root / "paths/v1-posts/get/_index.yml"
+        missing.unlink()
+        changed = dest_root / "index.yml"
+        spec.add(changed, {"openapi": "3.0.1"})
+        spec.flush(digests)
+
+        assert unchanged.read_text() == "# not rewritten\n"
+        assert missing.is_file()
+        assert yaml.safe_load(changed.read_text()) == {"openapi": "3.0.1"}
+
+    def test_flush_removed(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir)
+        spec = OASSpec(dest_root)
+        build(dest_root, spec)
+        removed = dest_root / "paths/v1-users/get/_index.yml"
+        spec.add(removed, {"summary": ""})
+        digests = {}
+        spec.flush(digests)
+        assert removed.is_file()
+
+        # the next build no longer has the endpoint
+        spec = OASSpec(dest_root)
+        build(dest_root, spec)
+        spec.flush(digests)
+
+        assert not removed.exists()
+        assert not (dest_root / "paths/v1-users").exists()
+        assert set(digests) == {p.as_posix() for p in spec.documents}
+        assert len(load_tree(dest_root)) == len(spec)
+
+    def test_flush_dumped(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir)
+        spec = OASSpec(dest_root)
+        spec.update(
+            {"index.yml": {"openapi": "3.0.0"}, "paths/_index.yml": {}},
+            {"index.yml": "openapi: 3.0.0 # dumped\n", "paths/_index.yml": "{}\n"},
+        )
+        # a replaced document is dumped again
+        spec.add(dest_root / "paths/_index.yml", {"/v1/posts": {}})
+        spec.flush()
+
+        assert (dest_root / "index.yml").read_text() == "openapi: 3.0.0 # dumped\n"
+        assert yaml.safe_load((dest_root / "paths/_index.yml").read_text()) == {
+            "/v1/posts": {}
+        }
+        assert spec.dumped == {}
+
+    def test_flush_replace(self, tmpdir):
+        dest_root = pathlib.Path(tmpdir) / ".build"
+        stale = dest_root / "paths/v1-users/get/_index.yml"
+        stale.parent.mkdir(parents=True)
+        stale.write_text("summary: ''\n")
+        spec = OASSpec(dest_root)
+        build(dest_root, spec)
+        spec.flush()
+
+        assert not stale.exists()
+        assert len(load_tree(dest_root)) == len(spec)